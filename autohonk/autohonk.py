@@ -4,43 +4,45 @@ Elite Dangerous AutoHonk - Sandboxie Multi-Instance Support
 Monitors Elite Dangerous journal files and auto-presses Primary Fire
 when jumping to a new system. Holds until FSSDiscoveryScan event.
 
-Supports running one instance per sandbox by passing --sandbox <BoxName>.
+Supports running one instance per sandbox by passing --sandbox <BoxName>,
+or a whole wing from one process with --wing <Box> <Box> ... [--primary].
 When running outside a sandbox, monitors the default journal folder.
 
 Requirements: pip install -r requirements.txt
 """
 
 import argparse
-import json
 import logging
 import os
 import sys
 import threading
 import time
-import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional, Sequence
 
-import win32api
-import win32con
-import win32gui
-import win32process
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
-logger = logging.getLogger("autohonk")
+# Shared helpers live in the repo root's edwing package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from edwing.bindings import Binding, load_bindings, resolve_bindings_folder  # noqa: E402
+from edwing.delivery import PostMessageDelivery, make_delivery  # noqa: E402
+from edwing.focus import FocusLock, NamedFocusLock  # noqa: E402
+from edwing.journal import parse_timestamp, scan_backwards  # noqa: E402
+from edwing.keyplan import ELITE_KEY_MAP, key_code  # noqa: E402
+from edwing.metrics import REGISTRY, start_exporters  # noqa: E402
+from edwing.output import LOG_BACKUPS, LOG_MAX_BYTES, configure as configure_output  # noqa: E402
+from edwing.output import shutdown as shutdown_output  # noqa: E402
+from edwing.paths import data_dir  # noqa: E402
+from edwing.scheduler import Scheduler, Timer  # noqa: E402
+from edwing.status import HONKING, IDLE, JUMPING, StatusSlot  # noqa: E402
+from edwing.stats import LatencySamples, format_summary  # noqa: E402
+from edwing.timing import enable_high_resolution_timer  # noqa: E402
+from edwing.tuning import HonkTuner  # noqa: E402
+from edwing.windows import Win32WindowBackend, WindowIndex  # noqa: E402
+from edwing.wingjournal import WingJournal  # noqa: E402
 
-# Key name mapping from Elite Dangerous bindings XML to Windows VK names
-ELITE_KEY_MAP = {
-    "Numpad_Add": win32con.VK_ADD,
-    "Numpad_Subtract": win32con.VK_SUBTRACT,
-    "Numpad_Multiply": win32con.VK_MULTIPLY,
-    "Numpad_Divide": win32con.VK_DIVIDE,
-    "Space": win32con.VK_SPACE,
-    "Enter": win32con.VK_RETURN,
-    "Tab": win32con.VK_TAB,
-    **{f"F{n}": getattr(win32con, f"VK_F{n}") for n in range(1, 13)},
-}
+logger = logging.getLogger("autohonk")
 
 
 def resolve_journal_folder(sandbox: Optional[str] = None) -> Path:
@@ -66,65 +68,40 @@ def resolve_journal_folder(sandbox: Optional[str] = None) -> Path:
     return default
 
 
-def resolve_bindings_folder(sandbox: Optional[str] = None) -> Optional[Path]:
-    """Return the Elite key bindings folder."""
-    local_app_data = os.environ.get("LOCALAPPDATA", "")
-    default = Path(local_app_data) / "Frontier Developments" / "Elite Dangerous" / "Options" / "Bindings"
-
-    if not sandbox:
-        return default if default.exists() else None
-
-    username = os.environ.get("USERNAME", "")
-    candidates = [
-        Path(f"C:/Sandbox/{username}/{sandbox}/user/current/AppData/Local/Frontier Developments/Elite Dangerous/Options/Bindings"),
-        default,  # bindings are often shared, not virtualised
-    ]
-    for candidate in candidates:
-        if candidate.exists():
-            return candidate
-    return None
-
-
-def detect_primary_fire_key(bindings_dir: Optional[Path]) -> Optional[int]:
-    """Read the Primary Fire key from the most recent .binds file. Returns VK code."""
-    if not bindings_dir or not bindings_dir.exists():
-        return None
-
-    binds_files = list(bindings_dir.glob("*.binds"))
-    if not binds_files:
-        return None
-
-    latest = max(binds_files, key=lambda p: p.stat().st_mtime)
-    logger.info("Reading bindings from %s", latest)
-
-    try:
-        tree = ET.parse(latest)
-        primary_fire = tree.getroot().find(".//PrimaryFire")
-        if primary_fire is None:
-            return None
-        primary = primary_fire.find("Primary")
-        if primary is None or primary.get("Device") != "Keyboard":
-            return None
-
-        key_name = primary.get("Key", "")
-        if key_name.startswith("Key_"):
-            key_name = key_name[4:]
-
-        if key_name in ELITE_KEY_MAP:
-            return ELITE_KEY_MAP[key_name]
-        if len(key_name) == 1:
-            return ord(key_name.upper())
-    except Exception:
-        logger.exception("Failed to parse bindings file")
-
-    return None
+def detect_fire_binding(bindings_dir: Optional[Path]) -> Optional[Binding]:
+    """Primary Fire keyboard binding (VK plus modifiers) from the active .binds file."""
+    bindings = load_bindings(bindings_dir)
+    return bindings.lookup("PrimaryFire") if bindings else None
 
 
 class AutoHonk:
+    # Journal events process_entry acts on; everything else is skipped unparsed
+    EVENTS = frozenset({"StartJump", "FSDJump", "FSSDiscoveryScan", "Location", "LoadGame", "StartUp"})
+    # Events that settle whether a jump is still waiting for its scan when we start up
+    RECOVERY_EVENTS = EVENTS | {"Shutdown"}
+
+    # Seconds between focusing the Elite window and pressing the key
+    focus_settle = 0.2
+    # Seconds between attempts to take the focus lock while another client honks
+    focus_retry = 0.02
+    # Seconds a jump waits for the focus lock before giving up its honk (a wing honks one at a time)
+    focus_wait_limit = 60.0
+    # Seconds a StartJump may hold the focus lock without an FSDJump before giving it back
+    arm_timeout = 60.0
+    # Posted honks in a row that timed out without a scan before delivery="post" gives up
+    post_misses_allowed = 2
+
     def __init__(self, sandbox: Optional[str], window_filter: Optional[str],
-                 delay: float, max_duration: float, manual_vk: Optional[int]):
+                 delay: float, max_duration: float, manual_vk: Optional[int],
+                 window_index: Optional[WindowIndex] = None, window_excludes: Sequence[str] = (),
+                 scheduler: Optional[Scheduler] = None, tuner: Optional[HonkTuner] = None,
+                 focus_lock: Optional[FocusLock] = None, delivery: str = "focus",
+                 repeat_interval: float = 0.0, status: Optional[StatusSlot] = None,
+                 focus_input: str = "keybd"):
         self.sandbox = sandbox
         self.window_filter = window_filter  # substring to match in window title
+        self.window_excludes = [e.lower() for e in window_excludes]  # titles containing these are skipped
+        self.logger = logger.getChild(sandbox) if sandbox else logger
         self.delay_after_jump = delay
         self.max_honk_duration = max_duration
         self.manual_vk = manual_vk
@@ -132,173 +109,577 @@ class AutoHonk:
         self.current_system: Optional[str] = None
         self.running = True
         self.honking_active = False
-        self.honk_thread: Optional[threading.Thread] = None
         self.honk_lock = threading.Lock()
 
-        # Detect primary fire key
-        bindings_dir = resolve_bindings_folder(sandbox)
-        self.fire_vk = manual_vk or detect_primary_fire_key(bindings_dir)
-        if not self.fire_vk:
-            logger.warning("Could not detect Primary Fire key; defaulting to '1'")
-            self.fire_vk = ord("1")
+        # Shared across a wing by the supervisor; standalone instances get their own
+        if window_index is None:
+            window_index = new_window_index()
+        self.window_index = window_index
+        self.backend = window_index.backend
+        self.scheduler = scheduler or Scheduler("autohonk")
+        self.tuner = tuner  # learns delay and timeout from past honks when set
+        self.focus_lock = focus_lock  # one honk at a time owns focus + keyboard when set
+        self.status = status  # this commander's record on the shared wing status board
+        self._holds_focus = False
+        self._honk_hwnd: Optional[int] = None
+        # "focus": focus the window and type into it; "post": WM_KEYDOWN/WM_KEYUP straight to the
+        # window, no focus, no settle, no lock; falls back to "focus" if Elite ignores it
+        self.delivery = delivery
+        self._post_keys = PostMessageDelivery(self.backend)
+        # How focused honks type: "keybd" (keybd_event) or "sendinput" (modifiers and key in one SendInput)
+        self._focus_keys = make_delivery(focus_input, self.backend)
+        if not self._focus_keys.needs_focus:
+            raise ValueError(f"focus_input must type into the focused window, not {focus_input!r}")
+        self.repeat_interval = repeat_interval  # seconds between auto-repeat WM_KEYDOWNs while posting
+        self._posting = False
+        self._post_misses = 0
+        self._focus_this_jump = False
+        self._retried_this_jump = False  # a honk the learned timing missed was already retried
+        self._repeat_timer: Optional[Timer] = None
+        if tuner:
+            self._apply_tuning()
+
+        # Honk state machine: jump -> (delay) -> focus -> (settle) -> key down -> scan/timeout -> key up.
+        # A StartJump into hyperspace focuses the window during witchspace instead, leaving
+        # jump -> (delay) -> key down; posted delivery never focuses and is always that short.
+        self._honk_timer: Optional[Timer] = None  # next pending step, cancelled by stop_honking
+        self._generation = 0  # bumped by stop_honking so an already-running step can tell it is stale
+        self._armed_hwnd: Optional[int] = None  # focused on StartJump, checked again on FSDJump
+        self._arm_timer: Optional[Timer] = None  # gives back focus taken on StartJump if no FSDJump follows
+        self._window_hwnd: Optional[int] = None  # last window found for us, reused while it exists
+        self._key_down_at: Optional[float] = None
+        self._key_due: Optional[float] = None  # when the key should go down for the current jump
+        self._lock_wait_since: Optional[float] = None  # first refusal of the focus lock for this jump
+        self.latency = {
+            "jump_to_keydown": LatencySamples(),  # key down after its due time (jump + delay [+ settle])
+            "scan_to_keyup": LatencySamples(),    # FSSDiscoveryScan handled -> key up
+        }
+
+        # Detect primary fire key; modifiers are held for the whole honk
+        binding = Binding(manual_vk) if manual_vk else detect_fire_binding(resolve_bindings_folder(sandbox))
+        if binding is None:
+            self.logger.warning("Could not detect Primary Fire key; defaulting to '1'")
+            binding = Binding(ord("1"))
+        self.fire_vk = binding.vk
+        self.fire_modifiers = binding.modifiers
+
+    def _publish(self, **changes):
+        """Update our wing status board record, if we have one."""
+        if self.status is not None:
+            self.status.publish(**changes)
 
     def find_elite_hwnd(self) -> Optional[int]:
         """Find the Elite Dangerous window matching our filter."""
-        results = []
+        window_filter = self.window_filter.lower() if self.window_filter else None
+        with REGISTRY.span("window_discovery"):
+            for info in self.window_index.elite_windows():
+                title = info.title.lower()
+                if window_filter and window_filter not in title:
+                    continue
+                if any(exclude in title for exclude in self.window_excludes):
+                    continue
+                return info.hwnd
+        return None
 
-        def callback(hwnd, _):
+    def _elite_hwnd(self) -> Optional[int]:
+        """Our Elite window: the one found last time if it still exists, else a fresh lookup."""
+        hwnd = self._window_hwnd
+        try:
+            if hwnd and self.backend.is_window(hwnd):
+                return hwnd
+        except Exception:
+            pass
+        self._window_hwnd = self.find_elite_hwnd()
+        return self._window_hwnd
+
+    def start_honking(self, generation: Optional[int] = None):
+        """Focus the Elite window and press the fire key once it has settled."""
+        hwnd = self._elite_hwnd()
+        if not hwnd:
+            self.logger.warning("Elite window not found - skipping honk")
+            with self.honk_lock:
+                current = generation is None or generation == self._generation
+                if current and not self.honking_active and self._armed_hwnd is None:
+                    self._release_focus()  # taken on StartJump for a window that has since closed
+            self._publish(state=IDLE)
+            return
+
+        with self.honk_lock:
+            if self.honking_active or not self.running:
+                return
+            if generation is not None and generation != self._generation:
+                return  # stopped while we were looking up the window
+            if self._use_post():
+                self._honk_hwnd = hwnd
+                self.honking_active = True
+                self._posting = True
+                self._press()
+                return
+            if self.focus_lock is not None:
+                if not self.focus_lock.try_acquire(self):
+                    now = self.scheduler.now()
+                    if self._lock_wait_since is None:
+                        self._lock_wait_since = now
+                    elif now - self._lock_wait_since >= self.focus_wait_limit:
+                        self.logger.warning("Focus lock busy for %.0fs - skipping honk", now - self._lock_wait_since)
+                        self._lock_wait_since = None
+                        self._publish(state=IDLE)
+                        return
+                    # Another client is honking; keep the jump's place and try again shortly
+                    self._honk_timer = self.scheduler.call_later(
+                        self.focus_retry, self.start_honking, self._generation)
+                    return
+                self._holds_focus = True
+                self._lock_wait_since = None
             try:
-                if not win32gui.IsWindowVisible(hwnd):
-                    return True
-                title = win32gui.GetWindowText(hwnd)
-                if "Elite - Dangerous" not in title:
-                    return True
-                if self.window_filter and self.window_filter.lower() not in title.lower():
-                    return True
-                _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                handle = win32api.OpenProcess(
-                    win32con.PROCESS_QUERY_INFORMATION | win32con.PROCESS_VM_READ, False, pid
-                )
-                try:
-                    exe = win32process.GetModuleFileNameEx(handle, 0).lower()
-                finally:
-                    win32api.CloseHandle(handle)
-                if "elitedangerous64" in exe:
-                    results.append(hwnd)
+                with REGISTRY.span("focus"):
+                    self.backend.set_foreground(hwnd)
             except Exception:
-                pass
-            return True
+                self.logger.warning("Could not focus Elite window")
+                self._release_focus()
+                self._publish(state=IDLE)
+                return
+            self._honk_hwnd = hwnd
+            self.honking_active = True
+            self._honk_timer = self.scheduler.call_later(self.focus_settle, self._key_down)
 
-        win32gui.EnumWindows(callback, None)
-        return results[0] if results else None
+    def _release_focus(self):
+        """Hand the focus lock back. Caller holds honk_lock.
 
-    def _do_honk(self):
-        """Hold the fire key until stopped or timeout."""
-        hwnd = self.find_elite_hwnd()
-        if not hwnd:
-            logger.warning("Elite window not found - skipping honk")
-            return
+        The release runs on the scheduler thread, where it was acquired (named mutexes are per thread).
+        """
+        if self._holds_focus:
+            self._holds_focus = False
+            self.scheduler.call_soon(self.focus_lock.release, self)
 
-        try:
-            win32gui.SetForegroundWindow(hwnd)
-        except Exception:
-            logger.warning("Could not focus Elite window")
+    def _use_post(self) -> bool:
+        return (self.delivery == "post" and not self._focus_this_jump
+                and self._post_misses < self.post_misses_allowed)
+
+    def _key_down(self, refocused: bool = False):
+        with self.honk_lock:
+            if not self.honking_active:
+                return
+            hwnd = self._honk_hwnd
+            if hwnd is not None and self.backend.foreground() != hwnd:
+                # Focus moved during the settle; the key would land in another window
+                if refocused:
+                    self.logger.warning("Elite window keeps losing focus - skipping honk")
+                    self.honking_active = False
+                    self._release_focus()
+                    self._publish(state=IDLE)
+                    return
+                try:
+                    with REGISTRY.span("focus"):
+                        self.backend.set_foreground(hwnd)
+                except Exception:
+                    pass
+                self._honk_timer = self.scheduler.call_later(self.focus_settle, self._key_down, True)
+                return
+            self._press()
+
+    def _press(self):
+        """Put the fire key (and its modifiers) down and start the timeout. Caller holds honk_lock."""
+        edges = tuple((vk, True) for vk in self.fire_modifiers + (self.fire_vk,))
+        if self._posting:
+            try:
+                self._post_keys.send(self._honk_hwnd, edges)
+            except Exception:
+                self.logger.warning("Could not post the honk to the Elite window - using focus instead")
+                self._posting = False
+                self.honking_active = False
+                self._focus_this_jump = True
+                self._honk_timer = self.scheduler.call_soon(self.start_honking, self._generation)
+                return
+            if self.repeat_interval > 0:
+                self._repeat_timer = self.scheduler.call_later(self.repeat_interval, self._repeat_key)
+        else:
+            try:
+                self._focus_keys.send(self._honk_hwnd, edges)
+            except Exception:
+                self.logger.exception("Could not press the fire key")
+                try:
+                    # A partly delivered chord would leave modifiers held down
+                    self._focus_keys.send(self._honk_hwnd, tuple((vk, False) for vk, _ in reversed(edges)))
+                except Exception:
+                    pass
+                self.honking_active = False
+                self._key_due = None
+                self._release_focus()
+                self._publish(state=IDLE)
+                return
+        self._key_down_at = self.scheduler.now()
+        if self.status is not None:
+            self.status.publish(state=HONKING, honks=self.status.honks + 1)
+        if self._key_due is not None:
+            self.latency["jump_to_keydown"].add(self._key_down_at - self._key_due)
+            self._key_due = None
+        self._honk_timer = self.scheduler.call_later(self.max_honk_duration, self._honk_timeout)
+
+    def _repeat_key(self):
+        """Auto-repeat WM_KEYDOWN, as Windows sends for a physically held key."""
+        with self.honk_lock:
+            if not self._posting or self._key_down_at is None:
+                return
+            try:
+                self._post_keys.send(self._honk_hwnd, ((self.fire_vk, True),), repeat=True)
+            except Exception:
+                return
+            self._repeat_timer = self.scheduler.call_later(self.repeat_interval, self._repeat_key)
+
+    def _honk_timeout(self):
+        self.logger.info("Honk timeout (%.1fs)", self.max_honk_duration)
+        if not self._posting:
+            self.stop_honking(timed_out=True)
             return
+        # No scan from a posted honk: Elite may be reading the keyboard, not window messages.
+        # Not held against the learned timing; this jump is retried through focus.
+        self.stop_honking()
+        with self.honk_lock:
+            self._post_misses += 1
+            if self._post_misses >= self.post_misses_allowed:
+                self.logger.warning("Posted honks are not producing scans - switching to focused input")
+            self._focus_this_jump = True
+            self._honk_timer = self.scheduler.call_soon(self.start_honking, self._generation)
+
+    def _apply_tuning(self):
+        delay, timeout = round(self.tuner.delay, 2), round(self.tuner.timeout, 2)
+        if (delay, timeout) != (self.delay_after_jump, self.max_honk_duration):
+            self.logger.info("Honk timing: delay %.2fs, timeout %.2fs", delay, timeout)
+        self.delay_after_jump = delay
+        self.max_honk_duration = timeout
 
-        time.sleep(0.2)
-        vk = self.fire_vk
-        win32api.keybd_event(vk, 0, 0, 0)
-        start = time.time()
+    def stop_honking(self, requested_at: Optional[float] = None, timed_out: bool = False):
+        """Cancel any pending honk step and release the key if it is held.
 
-        try:
-            while self.honking_active and self.running:
-                if time.time() - start >= self.max_honk_duration:
-                    logger.info("Honk timeout (%.1fs)", self.max_honk_duration)
-                    break
-                time.sleep(0.05)
-        finally:
-            win32api.keybd_event(vk, 0, win32con.KEYEVENTF_KEYUP, 0)
-            logger.info("Honk finished after %.1fs", time.time() - start)
-
-    def start_honking(self):
+        requested_at is when the FSSDiscoveryScan arrived; timed_out marks a honk that never got one.
+        """
         with self.honk_lock:
-            if self.honking_active:
+            self._generation += 1
+            for timer in (self._honk_timer, self._repeat_timer):
+                if timer:
+                    timer.cancel()
+            self._honk_timer = self._repeat_timer = None
+            self._lock_wait_since = None
+            self.honking_active = False
+            posting, self._posting = self._posting, False
+            if self._key_down_at is None:
+                # Focus taken on StartJump is kept for the arrival that follows
+                if self._armed_hwnd is None or not self.running:
+                    self._release_focus()
+                if requested_at is not None and self.status is not None and self.status.state in (JUMPING, HONKING):
+                    # Scanned before our key went down (during the delay, waiting for the lock, or by hand)
+                    self.status.publish(state=IDLE, scans=self.status.scans + 1)
                 return
-            self.honking_active = True
-            self.honk_thread = threading.Thread(target=self._do_honk, daemon=True)
-            self.honk_thread.start()
+            edges = tuple((vk, False) for vk in (self.fire_vk,) + self.fire_modifiers[::-1])
+            if posting:
+                try:
+                    self._post_keys.send(self._honk_hwnd, edges)
+                except Exception:
+                    self.logger.warning("Could not post key up to the Elite window")
+                if requested_at is not None:
+                    self._post_misses = 0
+            else:
+                try:
+                    self._focus_keys.send(self._honk_hwnd, edges)
+                except Exception:
+                    self.logger.warning("Could not release the fire key")
+            self._release_focus()
+            if self.status is not None:
+                self.status.publish(state=IDLE, scans=self.status.scans + (requested_at is not None),
+                                    timeouts=self.status.timeouts + timed_out)
+            released = self.scheduler.now()
+            if requested_at is not None:
+                self.latency["scan_to_keyup"].add(released - requested_at)
+            self.logger.info("Honk finished after %.1fs", released - self._key_down_at)
+            if self.tuner and (requested_at is not None or timed_out):
+                ended = requested_at if requested_at is not None else released
+                retry = self.tuner.record(ended - self._key_down_at, scanned=not timed_out)
+                self._apply_tuning()
+                if retry and timed_out and self.running and not self._retried_this_jump:
+                    # The learned timing may have cost this scan; the scanner is surely ready by now
+                    self.logger.info("Honk missed with learned timing - honking again")
+                    self._retried_this_jump = True
+                    self._honk_timer = self.scheduler.call_soon(self.start_honking, self._generation)
+            self._key_down_at = None
+
+    def pre_arm(self):
+        """Find and focus the Elite window while the ship is still in witchspace.
+
+        With a focus lock, the lock is taken now (on the scheduler thread, where it is released)
+        and held through the jump; if another client has it, only the window lookup is done early.
+        """
+        if self._use_post():
+            return  # posted honks need no focus
+        hwnd = self._elite_hwnd()
+        if not hwnd:
+            return
+        if self.focus_lock is not None:
+            self.scheduler.call_soon(self._arm, hwnd)
+        else:
+            self._arm(hwnd)
 
-    def stop_honking(self):
+    def _arm(self, hwnd: int):
         with self.honk_lock:
-            if not self.honking_active:
+            if not self.running or self.honking_active:
                 return
-            self.honking_active = False
-            if self.honk_thread and self.honk_thread.is_alive():
-                self.honk_thread.join(timeout=2.0)
+            if self.focus_lock is not None:
+                if not self.focus_lock.try_acquire(self):
+                    return  # another client is honking; this jump goes through the lock at honk time
+                self._holds_focus = True
+            try:
+                if self.backend.foreground() != hwnd:
+                    with REGISTRY.span("focus"):
+                        self.backend.set_foreground(hwnd)
+            except Exception:
+                self.logger.warning("Could not focus Elite window ahead of the jump")
+                self._release_focus()
+                return
+            self._armed_hwnd = hwnd
+            if self._holds_focus:
+                self._arm_timer = self.scheduler.call_later(self.arm_timeout, self._disarm)
+        self.logger.debug("Armed for hyperspace jump (window %#x)", hwnd)
+
+    def _disarm(self):
+        """No FSDJump followed the StartJump: give the focus lock back."""
+        with self.honk_lock:
+            self._arm_timer = None
+            if self._armed_hwnd is None or self.honking_active:
+                return
+            self.logger.info("No jump %.0fs after StartJump - releasing focus", self.arm_timeout)
+            self._armed_hwnd = None
+            self._release_focus()
+
+    def _take_armed_hwnd(self) -> Optional[int]:
+        """Consume the StartJump arming; its window if that still has focus. Caller holds honk_lock."""
+        hwnd, self._armed_hwnd = self._armed_hwnd, None
+        if self._arm_timer:
+            self._arm_timer.cancel()
+            self._arm_timer = None
+        if hwnd is None:
+            return None
+        try:
+            return hwnd if self.backend.foreground() == hwnd and self.backend.is_window(hwnd) else None
+        except Exception:
+            return None
 
-    def process_entry(self, entry: dict):
+    def process_entry(self, entry):
+        """Handle a journal entry (dict or JournalEvent)."""
         event = entry.get("event")
 
-        if event == "FSDJump":
+        if event == "StartJump":
+            if entry.get("JumpType") == "Hyperspace":
+                self.pre_arm()
+
+        elif event == "FSDJump":
             system = entry.get("StarSystem")
             if system and system != self.current_system:
-                logger.info("FSD Jump: %s -> %s", self.current_system or "?", system)
+                self.logger.info("FSD Jump: %s -> %s", self.current_system or "?", system)
                 self.current_system = system
                 self.stop_honking()
-
-                def delayed():
-                    time.sleep(self.delay_after_jump)
-                    self.start_honking()
-
-                threading.Thread(target=delayed, daemon=True).start()
+                jumped = time.time()
+                self._publish(state=JUMPING, system=system, last_jump=jumped, last_event=jumped)
+                with self.honk_lock:
+                    now = self.scheduler.now()
+                    self._focus_this_jump = False
+                    self._retried_this_jump = False
+                    armed = self._take_armed_hwnd()
+                    if armed and self.running:
+                        # Window found and focused during witchspace: only the key press is left
+                        self._honk_hwnd = armed
+                        self.honking_active = True
+                        self._key_due = now + self.delay_after_jump
+                        self._honk_timer = self.scheduler.call_at(self._key_due, self._key_down)
+                    else:
+                        settle = 0.0 if self._use_post() else self.focus_settle
+                        self._key_due = now + self.delay_after_jump + settle
+                        self._honk_timer = self.scheduler.call_later(
+                            self.delay_after_jump, self.start_honking, self._generation)
+                if self.tuner:
+                    self.tuner.save()  # previous cycle's honk, off the timer thread
 
         elif event == "FSSDiscoveryScan":
+            received = self.scheduler.now()
             bodies = entry.get("BodyCount", "?")
-            logger.info("FSS scan complete: %s bodies", bodies)
-            self.stop_honking()
+            self.logger.info("FSS scan complete: %s bodies", bodies)
+            self.stop_honking(requested_at=received)
 
         elif event in ("Location", "LoadGame", "StartUp"):
             system = entry.get("StarSystem")
             if system:
                 self.current_system = system
-                logger.info("Current system: %s", system)
+                self.logger.info("Current system: %s", system)
+                self._publish(system=system, last_event=time.time())
+
+    def recover(self, newest_first: Iterable):
+        """Restore state from journal events read backwards: current system and a honk still due.
+
+        Only the newest event decides whether a jump is pending; older ones are read just
+        until a StarSystem turns up.
+        """
+        pending_jump = None
+        for i, entry in enumerate(newest_first):
+            if i == 0 and entry.get("event") == "FSDJump":
+                pending_jump = entry
+            system = entry.get("StarSystem")
+            if system:
+                self.current_system = system
+                self.logger.info("Recovered current system: %s", system)
+                self._publish(system=system)
+                break
+
+        if pending_jump is None:
+            return
+        jumped_at = parse_timestamp(pending_jump.get("timestamp"))
+        if jumped_at is None:
+            return
+        elapsed = time.time() - jumped_at
+        if elapsed >= self.delay_after_jump + self.max_honk_duration:
+            return  # that honk would have finished already
+        self.logger.info("Jump %.1fs ago has not been scanned yet - honking", elapsed)
+        with self.honk_lock:
+            self._key_due = None
+            self._honk_timer = self.scheduler.call_later(
+                max(0.0, self.delay_after_jump - elapsed), self.start_honking, self._generation)
 
 
 class JournalWatcher(FileSystemEventHandler):
-    def __init__(self, honker: AutoHonk):
-        self.honker = honker
-        self.current_file: Optional[Path] = None
-        self.file_position = 0
-        self._find_latest()
-
-    def _find_latest(self):
-        journal_dir = resolve_journal_folder(self.honker.sandbox)
-        journals = sorted(journal_dir.glob("Journal.*.log"), key=lambda p: p.stat().st_mtime)
-        if journals:
-            self.current_file = journals[-1]
-            self.file_position = self.current_file.stat().st_size
-            logger.info("Tailing %s", self.current_file.name)
+    """Forwards watchdog changes in any commander's journal folder to the wing's merged journal."""
+
+    def __init__(self, journal: WingJournal):
+        self.journal = journal
 
     def on_modified(self, event):
-        if event.is_directory:
-            return
-        path = Path(event.src_path)
-        if path.name.startswith("Journal.") and path.name.endswith(".log") and path == self.current_file:
-            self._read_new(path)
+        if not event.is_directory:
+            self.journal.notify(event.src_path)
 
     def on_created(self, event):
-        if event.is_directory:
-            return
-        path = Path(event.src_path)
-        if path.name.startswith("Journal.") and path.name.endswith(".log"):
-            logger.info("New journal: %s", path.name)
-            self.current_file = path
-            self.file_position = 0
+        if not event.is_directory:
+            self.journal.notify(event.src_path)
+
+
+def commander_name(honker: AutoHonk) -> str:
+    """Wing-wide name of a honker's commander: its sandbox, or "primary"."""
+    return honker.sandbox or "primary"
 
-    def _read_new(self, path: Path):
+
+def open_wing_journal(honkers: Sequence[AutoHonk], folders: Sequence[Path]) -> WingJournal:
+    """One merged journal stream for the wing, feeding each event to its commander's AutoHonk.
+
+    Every honker first recovers its state from what its journal held before the tail started.
+    """
+    by_commander = {commander_name(honker): honker for honker in honkers}
+    journal = WingJournal(dict(zip(by_commander, folders)), AutoHonk.EVENTS)
+    for commander, honker in by_commander.items():
+        tail = journal.tail(commander)
+        if tail is None:
+            continue
+        honker.logger.info("Tailing %s", tail.path.name)
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                f.seek(self.file_position)
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            self.honker.process_entry(json.loads(line))
-                        except json.JSONDecodeError:
-                            pass
-                self.file_position = f.tell()
-        except Exception:
-            logger.exception("Error reading journal")
+            # Everything before the tail position; anything newer arrives through the stream
+            honker.recover(scan_backwards(tail.path, AutoHonk.RECOVERY_EVENTS, end=tail.position))
+        except OSError:
+            honker.logger.exception("Could not recover state from %s", tail.path.name)
+
+    def dispatch(event):
+        with REGISTRY.span("dispatch"):
+            by_commander[event.commander].process_entry(event.event)
+
+    journal.subscribe(dispatch)
+    return journal
+
+
+def new_window_index() -> WindowIndex:
+    """Elite client index shared by every AutoHonk in this process."""
+    index = WindowIndex(Win32WindowBackend(), title_contains="Elite - Dangerous", process_name="elitedangerous64")
+    index.start_watching()
+    return index
+
+
+def wing_boxes(args) -> List[Optional[str]]:
+    """Sandbox name per commander to honk for; None is the unsandboxed client."""
+    if not args.wing:
+        return [args.sandbox]
+    return list(args.wing) + ([None] if args.primary else [])
+
+
+def open_status(commander: str, path: Optional[Path]) -> Optional[StatusSlot]:
+    """This commander's slot on the wing status board; None (with a warning) if it cannot be had."""
+    try:
+        return StatusSlot(commander, path)
+    except (OSError, RuntimeError, ValueError) as e:
+        logger.warning("Wing status board unavailable for %s: %s", commander, e)
+        return None
+
+
+def build_wing(args, boxes: List[Optional[str]], manual_vk: Optional[int]) -> List[AutoHonk]:
+    """One AutoHonk per commander, all sharing a single window index, timer thread and focus lock."""
+    window_index = new_window_index()
+    scheduler = Scheduler("autohonk")
+    # Also coordinates with AutoHonk processes started separately per sandbox
+    focus_lock = NamedFocusLock()
+    sandboxes = [box for box in boxes if box]
+
+    honkers = []
+    for box in boxes:
+        window_filter = box if args.wing else (args.window_filter or box)
+        honkers.append(AutoHonk(
+            sandbox=box,
+            window_filter=window_filter,
+            delay=args.delay,
+            max_duration=args.max_duration,
+            manual_vk=manual_vk,
+            window_index=window_index,
+            # The unsandboxed client is the Elite window no sandbox claims
+            window_excludes=sandboxes if box is None and args.wing else (),
+            scheduler=scheduler,
+            tuner=HonkTuner(box or "primary", args.delay, args.max_duration, path=args.history)
+            if args.adaptive else None,
+            focus_lock=focus_lock,
+            delivery=args.delivery,
+            focus_input=args.input,
+            repeat_interval=args.repeat_interval,
+            status=None if args.no_status else open_status(box or "primary", args.status_board),
+        ))
+    return honkers
 
 
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(description="Elite Dangerous AutoHonk")
-    p.add_argument("--sandbox", "-s", help="Sandboxie box name (e.g. CMDRBistronaut)")
+    boxes = p.add_mutually_exclusive_group()
+    boxes.add_argument("--sandbox", "-s", help="Sandboxie box name (e.g. CMDRBistronaut)")
+    boxes.add_argument("--wing", nargs="+", metavar="BOX",
+                   help="Honk for several sandboxes from one process (e.g. --wing CMDRBistronaut CMDRTristronaut)")
+    p.add_argument("--primary", action="store_true",
+                   help="With --wing, also honk for the unsandboxed commander")
     p.add_argument("--window-filter", "-w",
                     help="Substring to match in Elite window title (default: sandbox name or 'Elite - Dangerous')")
     p.add_argument("--delay", type=float, default=2.0, help="Seconds after jump before honking (default: 2)")
     p.add_argument("--max-duration", type=float, default=7.0, help="Max honk duration in seconds (default: 7)")
     p.add_argument("--key", help="Manual key override (e.g. '1', 'space', 'numpad_add')")
+    p.add_argument("--delivery", choices=("focus", "post"), default="focus",
+                   help="focus: focus the window and press the key (default); "
+                        "post: send key messages to the window without focusing it, falling back to focus")
+    p.add_argument("--input", choices=("keybd", "sendinput"), default="keybd",
+                   help="How focused honks press the key: keybd (keybd_event, default) or "
+                        "sendinput (modifiers and key in one SendInput call)")
+    p.add_argument("--repeat-interval", type=float, default=0.033,
+                   help="With --delivery post, seconds between auto-repeat key messages; 0 disables (default: 0.033)")
+    p.add_argument("--adaptive", action="store_true",
+                   help="Learn delay and timeout from past honks (never above --delay / --max-duration)")
+    p.add_argument("--history", type=Path, help="Honk history file for --adaptive (default: %%LOCALAPPDATA%%\\EDWing\\honk-history.json)")
+    p.add_argument("--status-board", type=Path,
+                   help="Wing status board file (default: %%LOCALAPPDATA%%\\EDWing\\wing-status.bin)")
+    p.add_argument("--no-status", action="store_true", help="Do not publish to the wing status board")
+    p.add_argument("--metrics-port", type=int, help="Serve stage timings as Prometheus text on 127.0.0.1:PORT")
+    p.add_argument("--metrics-interval", type=float, default=60.0,
+                   help="Seconds between writes of %%LOCALAPPDATA%%\\EDWing\\autohonk-metrics.json; 0 disables (default: 60)")
+    p.add_argument("--log-file", type=Path, help="Also log to this file, rotated at --log-max-bytes")
+    p.add_argument("--log-max-bytes", type=int, default=LOG_MAX_BYTES,
+                   help=f"Log file size before it rotates (default: {LOG_MAX_BYTES})")
+    p.add_argument("--log-backups", type=int, default=LOG_BACKUPS,
+                   help=f"Rotated log files kept (default: {LOG_BACKUPS})")
+    p.add_argument("--quiet", "-q", action="store_true", help="Only warnings and errors on the console")
     p.add_argument("--verbose", "-v", action="store_true")
     return p
 
@@ -306,61 +687,90 @@ def build_parser() -> argparse.ArgumentParser:
 def main():
     args = build_parser().parse_args()
 
-    logging.basicConfig(
+    # Log records are written by a background thread, so a slow console never delays a honk
+    configure_output(
         level=logging.DEBUG if args.verbose else logging.INFO,
-        format="%(asctime)s %(levelname)s %(message)s",
-        handlers=[logging.StreamHandler()],
+        fmt="%(asctime)s %(levelname)s [%(name)s] %(message)s" if args.wing else "%(asctime)s %(levelname)s %(message)s",
+        log_file=args.log_file,
+        quiet=args.quiet,
+        max_bytes=args.log_max_bytes,
+        backups=args.log_backups,
     )
+    try:
+        run(args)
+    finally:
+        shutdown_output()
+
 
+def run(args):
+    """Start honking for every configured commander and watch their journals until Ctrl+C."""
     # Resolve manual key override
     manual_vk = None
     if args.key:
-        key_upper = args.key.strip().replace(" ", "_").title()
-        if key_upper in ELITE_KEY_MAP:
-            manual_vk = ELITE_KEY_MAP[key_upper]
-        elif len(args.key) == 1:
-            manual_vk = ord(args.key.upper())
-        else:
-            logger.error("Unknown key: %s", args.key)
+        manual_vk = key_code(args.key.strip())
+        if manual_vk is None:
+            logger.error("Unknown key: %s (known names: %s)", args.key, ", ".join(ELITE_KEY_MAP))
             sys.exit(1)
 
-    window_filter = args.window_filter or args.sandbox
-    journal_folder = resolve_journal_folder(args.sandbox)
+    enable_high_resolution_timer()
 
-    if not journal_folder.exists():
-        logger.error("Journal folder not found: %s", journal_folder)
-        logger.error("Make sure Elite Dangerous has been run at least once%s.",
-                      f" in sandbox '{args.sandbox}'" if args.sandbox else "")
+    boxes = wing_boxes(args)
+    folders = []
+    for box in boxes:
+        journal_folder = resolve_journal_folder(box)
+        if not journal_folder.exists():
+            logger.error("Journal folder not found: %s", journal_folder)
+            logger.error("Make sure Elite Dangerous has been run at least once%s.",
+                          f" in sandbox '{box}'" if box else "")
+            sys.exit(1)
+        folders.append(journal_folder)
+
+    if len(set(folders)) != len(folders):
+        logger.error("Several commanders resolve to the same journal folder; check sandbox names")
         sys.exit(1)
 
-    honker = AutoHonk(
-        sandbox=args.sandbox,
-        window_filter=window_filter,
-        delay=args.delay,
-        max_duration=args.max_duration,
-        manual_vk=manual_vk,
-    )
+    honkers = build_wing(args, boxes, manual_vk)
+    exporters = start_exporters(args.metrics_port, data_dir() / "autohonk-metrics.json", args.metrics_interval)
 
-    watcher = JournalWatcher(honker)
+    # One observer thread for every journal folder, one read loop merging them into a single stream
+    journal = open_wing_journal(honkers, folders)
+    watcher = JournalWatcher(journal)
     observer = Observer()
-    observer.schedule(watcher, str(journal_folder), recursive=False)
+    for honker, journal_folder in zip(honkers, folders):
+        observer.schedule(watcher, str(journal_folder), recursive=False)
+        label = f" (sandbox: {honker.sandbox})" if honker.sandbox else ""
+        honker.logger.info("AutoHonk running%s - monitoring %s", label, journal_folder)
+        honker.logger.info("Primary fire VK code: 0x%02X%s", honker.fire_vk,
+                           "".join(f" +0x{vk:02X}" for vk in honker.fire_modifiers))
+    journal.start()
     observer.start()
-
-    label = f" (sandbox: {args.sandbox})" if args.sandbox else ""
-    logger.info("AutoHonk running%s - monitoring %s", label, journal_folder)
-    logger.info("Primary fire VK code: 0x%02X", honker.fire_vk)
     logger.info("Press Ctrl+C to stop")
 
     try:
-        while honker.running:
+        while all(honker.running for honker in honkers):
             time.sleep(1)
+            for honker in honkers:
+                if honker.status:
+                    honker.status.heartbeat()
     except KeyboardInterrupt:
         logger.info("Shutting down...")
-        honker.running = False
-        honker.stop_honking()
+        for honker in honkers:
+            honker.running = False
+            honker.stop_honking()
+            if honker.tuner:
+                honker.tuner.save()
+            for name, samples in honker.latency.items():
+                if len(samples):
+                    honker.logger.info(format_summary(name, samples.summary()))
         observer.stop()
 
     observer.join()
+    journal.stop()
+    for honker in honkers:
+        if honker.status:
+            honker.status.close()
+    for exporter in exporters:
+        exporter.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+"""
+Benchmark sequential vs concurrent key broadcast against a fake desktop.
+
+Reports total broadcast time and the skew between the first and last window
+receiving each key.
+
+    python benchmarks/bench_broadcast.py --windows 4 --command 1qq2
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edwing.broadcast import WM_KEYDOWN, WM_KEYUP, key_skew, play_plan  # noqa: E402
+from edwing.delivery import PostMessageDelivery  # noqa: E402
+from edwing.keyplan import compile_plan  # noqa: E402
+from edwing.windows import FakeWindowBackend  # noqa: E402
+
+
+def sequential(backend, hwnds, plan, window_delay):
+    """The original send_command_to_all_windows loop."""
+    for hwnd in hwnds:
+        for vk, down, delay in plan.events:
+            backend.post_message(hwnd, WM_KEYDOWN if down else WM_KEYUP, vk, 0)
+            time.sleep(delay)
+        time.sleep(window_delay)
+
+
+def run(mode, windows, command, press, key_delay, window_delay):
+    backend = FakeWindowBackend()
+    hwnds = [backend.add_elite_window(f"[#] [CMDR{i}] Elite - Dangerous (CLIENT) [#]") for i in range(windows)]
+    plan = compile_plan(command, press, key_delay)
+
+    start = time.perf_counter()
+    if mode == "sequential":
+        sequential(backend, hwnds, plan, window_delay)
+    else:
+        play_plan(hwnds, plan, PostMessageDelivery(backend))
+    total = time.perf_counter() - start
+
+    skew = key_skew(backend.messages)
+    return {
+        "total_s": total,
+        "skew_mean_ms": statistics.mean(skew) * 1000,
+        "skew_max_ms": max(skew) * 1000,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--windows", type=int, default=4)
+    p.add_argument("--command", default="1qq2")
+    p.add_argument("--press", type=float, default=0.1, help="key_press_duration (default: 0.1)")
+    p.add_argument("--key-delay", type=float, default=0.05, help="key_send_delay (default: 0.05)")
+    p.add_argument("--window-delay", type=float, default=0.2, help="window_delay (default: 0.2)")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    results = {
+        mode: run(mode, args.windows, args.command, args.press, args.key_delay, args.window_delay)
+        for mode in ("sequential", "concurrent")
+    }
+
+    if args.json:
+        print(json.dumps({"windows": args.windows, "command": args.command, "results": results}, indent=2))
+        return
+
+    print(f"'{args.command}' to {args.windows} windows")
+    print(f"{'mode':<12} {'total s':>8} {'skew mean ms':>13} {'skew max ms':>12}")
+    for mode, r in results.items():
+        print(f"{mode:<12} {r['total_s']:>8.3f} {r['skew_mean_ms']:>13.3f} {r['skew_max_ms']:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
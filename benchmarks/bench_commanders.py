@@ -0,0 +1,98 @@
+"""
+Window -> commander matching for large wings.
+
+For 4, 16 and 64 Elite windows (plus unrelated desktop noise) compares
+  legacy   lowercase the title and search for every commander name in turn
+  matcher  one precompiled CommanderMatcher regex per title
+on classifying every window, then times a full WindowIndex rebuild and a
+cached lookup of every window versus one commander group (a quarter of
+the wing).
+
+    python benchmarks/bench_commanders.py --sizes 4 16 64
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edwing.commanders import CommanderMatcher  # noqa: E402
+from edwing.windows import FakeWindowBackend, WindowIndex  # noqa: E402
+
+TITLE = "Elite - Dangerous (CLIENT)"
+PROCESS = "elitedangerous64"
+
+
+def legacy_match(title, commanders, primary):
+    lowered = title.lower()
+    for commander in commanders:
+        if commander.lower() in lowered:
+            return commander
+    return primary
+
+
+def per_call_us(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def run(size, noise, rounds):
+    commanders = [f"Wingmate{i:02d}" for i in range(1, size)]
+    primary = "Primary"
+    titles = [f"[#] [CMDR{name}] {TITLE} [#]" for name in commanders] + [TITLE]
+    groups = {"scouts": commanders[: max(1, size // 4)]}
+    matcher = CommanderMatcher(commanders, primary, groups)
+
+    legacy = [legacy_match(t, commanders, primary) for t in titles]
+    assert legacy == [matcher.match(t) for t in titles]
+
+    backend = FakeWindowBackend()
+    for i in range(noise):
+        backend.add_window(f"Browser tab {i}", image="c:\\tools\\browser.exe")
+    for title in titles:
+        backend.add_elite_window(title)
+    index = WindowIndex(backend, TITLE, PROCESS, commanders, primary, groups)
+    index.start_watching()
+    index.commander_windows()
+
+    def rebuild():
+        index.invalidate()
+        index.commander_windows()
+
+    return {
+        "windows": size,
+        "legacy_classify_us": per_call_us(lambda: [legacy_match(t, commanders, primary) for t in titles], rounds),
+        "matcher_classify_us": per_call_us(lambda: [matcher.match(t) for t in titles], rounds),
+        "rebuild_us": per_call_us(rebuild, rounds),
+        "cached_all_us": per_call_us(index.commander_windows, rounds),
+        "cached_group_us": per_call_us(lambda: index.commander_windows("scouts"), rounds),
+        "group_windows": len(index.commander_windows("scouts")),
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--sizes", type=int, nargs="+", default=[4, 16, 64])
+    p.add_argument("--noise", type=int, default=150, help="Other visible windows (default: 150)")
+    p.add_argument("--rounds", type=int, default=2000)
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    results = [run(size, args.noise, args.rounds) for size in args.sizes]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'windows':>7} {'legacy us':>10} {'matcher us':>11} {'rebuild us':>11} {'all us':>7} {'group us':>9}")
+    for r in results:
+        print(f"{r['windows']:>7} {r['legacy_classify_us']:>10.1f} {r['matcher_classify_us']:>11.1f} "
+              f"{r['rebuild_us']:>11.1f} {r['cached_all_us']:>7.1f} {r['cached_group_us']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
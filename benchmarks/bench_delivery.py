@@ -0,0 +1,64 @@
+"""
+Key delivery throughput per strategy against a fake desktop.
+
+Sends the batches of one relay command (chords of modifier + key, so a
+batch can hold several edges) through each edwing.delivery strategy, with
+every PostMessage / keybd_event / SendInput call costing --input-cost
+seconds. The waits between batches are skipped, so the numbers are pure
+delivery cost. Reported per strategy: Win32 calls made, edges delivered and
+microseconds per edge.
+
+    python benchmarks/bench_delivery.py --command "{ctrl+1}{shift+q}2" --rounds 200
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edwing.delivery import STRATEGIES, make_delivery  # noqa: E402
+from edwing.keyplan import compile_plan, plan_batches  # noqa: E402
+from edwing.metrics import Metrics  # noqa: E402
+from edwing.windows import FakeWindowBackend  # noqa: E402
+
+
+def run(name, command, rounds, input_cost):
+    backend = FakeWindowBackend(input_cost=input_cost)
+    hwnd = backend.add_elite_window("Elite - Dangerous (CLIENT)")
+    backend.set_foreground(hwnd)
+    delivery = make_delivery(name, backend, Metrics())
+    plan = compile_plan(command, 0.1, 0.05)
+    batches = [edges for edges, _ in plan_batches(plan)]
+    for _ in range(rounds):
+        for edges in batches:
+            delivery.send(hwnd, edges)
+    stats = delivery.stats()
+    assert len(backend.messages) == stats["edges"] == rounds * len(plan.events)
+    assert backend.input_calls == stats["calls"]
+    return {"strategy": name, **stats}
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--command", default="{ctrl+1}{shift+q}2",
+                   help="Relay command to send (default: {ctrl+1}{shift+q}2)")
+    p.add_argument("--rounds", type=int, default=200)
+    p.add_argument("--input-cost", type=float, default=0.00002,
+                   help="Seconds per simulated Win32 input call (default: 0.00002)")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    results = [run(name, args.command, args.rounds, args.input_cost) for name in STRATEGIES]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'strategy':<10} {'calls':>7} {'edges':>7} {'us/edge':>8}")
+    for r in results:
+        print(f"{r['strategy']:<10} {r['calls']:>7} {r['edges']:>7} {r['us_per_edge']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
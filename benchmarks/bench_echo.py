@@ -0,0 +1,86 @@
+"""
+Measure echo-mode keystroke-to-PostMessage latency against a fake desktop.
+
+A scripted typist presses keys at a fixed rate; one window can be made slow
+to show queue backpressure.
+
+    python benchmarks/bench_echo.py --windows 4 --keys 60 --rate 12
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edwing.delivery import PostMessageDelivery  # noqa: E402
+from edwing.echo import EchoBroadcaster  # noqa: E402
+from edwing.keyplan import compile_plan  # noqa: E402
+from edwing.stats import format_summary  # noqa: E402
+from edwing.windows import FakeWindowBackend  # noqa: E402
+
+
+class SlowWindowBackend:
+    """The fake desktop, with every PostMessage to one window taking extra seconds."""
+
+    def __init__(self, backend, slow, delay):
+        self._backend = backend
+        self.slow = slow
+        self.delay = delay
+
+    def post_message(self, hwnd, msg, wparam, lparam):
+        if hwnd == self.slow and self.delay:
+            time.sleep(self.delay)
+        self._backend.post_message(hwnd, msg, wparam, lparam)
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--windows", type=int, default=4)
+    p.add_argument("--keys", type=int, default=60, help="Keys to type (default: 60)")
+    p.add_argument("--rate", type=float, default=12.0, help="Typing rate in keys/s (default: 12)")
+    p.add_argument("--press", type=float, default=0.05, help="key_press_duration (default: 0.05)")
+    p.add_argument("--queue-size", type=int, default=8)
+    p.add_argument("--slow-window-delay", type=float, default=0.0,
+                   help="Extra seconds per PostMessage for the last window (default: 0)")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    backend = FakeWindowBackend()
+    windows = []
+    for i in range(args.windows):
+        hwnd = backend.add_elite_window(f"[#] [CMDR{i}] Elite - Dangerous (CLIENT) [#]")
+        windows.append((hwnd, backend.window_text(hwnd), f"CMDR{i}"))
+    slow = windows[-1][0]
+
+    echo = EchoBroadcaster(PostMessageDelivery(SlowWindowBackend(backend, slow, args.slow_window_delay)),
+                           queue_size=args.queue_size)
+    echo.set_targets(windows)
+
+    interval = 1.0 / args.rate
+    start = time.perf_counter()
+    for i in range(args.keys):
+        target = start + i * interval
+        delay = target - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        echo.send(compile_plan(chr(ord("a") + i % 26), args.press, 0.0))
+    typing_s = time.perf_counter() - start
+    echo.close(timeout=30)
+
+    summary = echo.latency.summary()
+    if args.json:
+        print(json.dumps({"windows": args.windows, "keys": args.keys, "rate": args.rate,
+                          "typing_s": typing_s, "backpressure_s": echo.backpressure_wait,
+                          "latency": summary}, indent=2))
+        return
+
+    print(f"{args.keys} keys at {args.rate:g}/s to {args.windows} windows, queue size {args.queue_size}")
+    print(format_summary("keystroke->PostMessage", summary))
+    print(f"typing took {typing_s:.2f}s, blocked {echo.backpressure_wait:.2f}s on full queues")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Wing honk with N clients jumping at once: focus delivery without and with a
+focus lock (keybd_event, and SendInput under the lock), and posted
+(focus-free) delivery.
+
+Every client is an AutoHonk with its own timer thread, as if each ran in
+its own process, all typing through one fake desktop. A model scanner fires
+FSSDiscoveryScan for a window once the fire key has been held in it for
+--charge seconds. Keyboard input needs focus, and losing focus releases the
+key, as in Elite; posted key messages reach the window regardless, unless
+the "post-ignored" run has the model drop them (to exercise the fallback).
+Reported: time from the jump until the last client scanned, missed scans,
+focus switches, and key events delivered to a window other than the
+sender's (mis-deliveries).
+
+The "vanished" run pre-arms the first client on StartJump, so it takes the
+focus lock, then closes its window before the FSDJump: the lock must be
+handed on and every other client still scan (missed counts only them).
+
+    python benchmarks/bench_focus.py --clients 4
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from autohonk.autohonk import AutoHonk  # noqa: E402
+from edwing.focus import FocusLock  # noqa: E402
+from edwing.scheduler import Scheduler  # noqa: E402
+from edwing.windows import FakeWindowBackend, WindowIndex  # noqa: E402
+
+WM_KEYDOWN = 0x0100
+WM_KEYUP = 0x0101
+FIRE_VK = ord("1")
+
+
+class SenderBackend:
+    """Per-client view of the shared desktop that notes where each key event really lands."""
+
+    def __init__(self, backend, target, deliveries):
+        self._backend = backend
+        self.target = target
+        self.deliveries = deliveries
+
+    def key_event(self, vk, up=False):
+        self.deliveries.append((self.target, self._backend.foreground()))
+        self._backend.key_event(vk, up)
+
+    def send_input(self, edges):
+        self.deliveries.extend((self.target, self._backend.foreground()) for _ in edges)
+        self._backend.send_input(edges)
+
+    def post_message(self, hwnd, msg, wparam, lparam):
+        self.deliveries.append((self.target, hwnd))
+        self._backend.post_message(hwnd, msg, wparam, lparam)
+
+    def __getattr__(self, name):
+        return getattr(self._backend, name)
+
+
+class ScannerModel(threading.Thread):
+    """Fires FSSDiscoveryScan for a window once the fire key was held in it for charge seconds."""
+
+    def __init__(self, backend, honkers, charge, ignore_posted=False):
+        super().__init__(name="scanner", daemon=True)
+        self.backend = backend
+        self.honkers = honkers  # hwnd -> AutoHonk
+        self.charge = charge
+        self.ignore_posted = ignore_posted
+        self.scanned = {}  # hwnd -> perf_counter of the scan
+        self.running = True
+
+    def run(self):
+        seen = 0
+        held = {}
+        focused = self.backend.foreground()
+        while self.running:
+            foreground = self.backend.foreground()
+            if foreground != focused:
+                held.pop(focused, None)  # Elite drops held keys when it loses focus
+                focused = foreground
+            messages = self.backend.messages
+            while seen < len(messages):
+                _, hwnd, msg, vk, lparam = messages[seen]
+                seen += 1
+                posted = lparam != 0  # key_event input is logged with lParam 0
+                if vk != FIRE_VK or (posted and self.ignore_posted):
+                    continue
+                if msg == WM_KEYDOWN and (posted or hwnd == foreground):
+                    held.setdefault(hwnd, time.perf_counter())
+                elif msg == WM_KEYUP:
+                    held.pop(hwnd, None)
+            now = time.perf_counter()
+            for hwnd, since in list(held.items()):
+                if now - since >= self.charge and hwnd not in self.scanned:
+                    self.scanned[hwnd] = now
+                    held.pop(hwnd)
+                    self.honkers[hwnd].process_entry({"event": "FSSDiscoveryScan", "BodyCount": 1})
+            time.sleep(0.001)
+
+
+MODES = {
+    # name: (focus lock, delivery, focused input, scanner ignores posted keys, first window closes)
+    "focus": (False, "focus", "keybd", False, False),
+    "focus+lock": (True, "focus", "keybd", False, False),
+    "sendinput+lock": (True, "focus", "sendinput", False, False),
+    "post": (True, "post", "keybd", False, False),
+    "post-ignored": (True, "post", "keybd", True, False),
+    "vanished": (True, "focus", "keybd", False, True),
+}
+
+
+def run(clients, delay, settle, charge, timeout, mode):
+    use_lock, delivery, focus_input, ignore_posted, vanish = MODES[mode]
+    backend = FakeWindowBackend()
+    console = backend.add_window("Windows PowerShell", image="powershell.exe")
+    backend.set_foreground(console)
+    focus_lock = FocusLock() if use_lock else None
+    deliveries = []
+    honkers = {}
+    for i in range(clients):
+        name = f"Cmdr{i:02d}"
+        hwnd = backend.add_elite_window(f"Elite - Dangerous (CLIENT) {name}")
+        index = WindowIndex(SenderBackend(backend, hwnd, deliveries), "Elite - Dangerous", "elitedangerous64")
+        index.start_watching()
+        honker = AutoHonk(sandbox=None, window_filter=name, delay=delay, max_duration=timeout,
+                          manual_vk=FIRE_VK, window_index=index, scheduler=Scheduler(name),
+                          focus_lock=focus_lock, delivery=delivery, repeat_interval=0.03,
+                          focus_input=focus_input)
+        honker.focus_settle = settle
+        honkers[hwnd] = honker
+
+    scanner = ScannerModel(backend, honkers, charge, ignore_posted)
+    scanner.start()
+    closed = None
+    if vanish:
+        closed, first = next(iter(honkers.items()))
+        first.process_entry({"event": "StartJump", "JumpType": "Hyperspace"})
+        time.sleep(settle)
+        backend.remove_window(closed)  # game crashed in witchspace, still holding the lock
+        backend.set_foreground(console)
+    expected = clients - (closed is not None)
+    switches_before = backend.focus_switches
+    jumped = time.perf_counter()
+    for i, honker in enumerate(honkers.values()):
+        honker.process_entry({"event": "FSDJump", "StarSystem": f"Wing target {i}"})
+
+    deadline = jumped + delay + timeout + clients * (2 * settle + timeout) + 1.0
+    while len(scanner.scanned) < expected and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    finished = max(scanner.scanned.values(), default=time.perf_counter())
+    time.sleep(settle + 0.05)
+    scanner.running = False
+    for honker in honkers.values():
+        honker.running = False
+        honker.stop_honking()
+        honker.scheduler.stop()
+
+    misdelivered = sum(1 for target, landed in deliveries if landed != target)
+    return {
+        "clients": clients,
+        "mode": mode,
+        "wing_seconds": finished - jumped,
+        "scanned": len(scanner.scanned),
+        "missed": expected - len(scanner.scanned),
+        "focus_switches": backend.focus_switches - switches_before,
+        "key_events": len(deliveries),
+        "misdelivered": misdelivered,
+        "misdelivery_rate": misdelivered / len(deliveries) if deliveries else 0.0,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--clients", type=int, nargs="+", default=[2, 4, 8])
+    p.add_argument("--delay", type=float, default=0.05, help="delay_after_jump (default: 0.05)")
+    p.add_argument("--settle", type=float, default=0.05, help="focus settle (default: 0.05)")
+    p.add_argument("--charge", type=float, default=0.2, help="Hold the scanner needs (default: 0.2)")
+    p.add_argument("--timeout", type=float, default=0.6, help="max_honk_duration (default: 0.6)")
+    p.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    results = [run(n, args.delay, args.settle, args.charge, args.timeout, mode)
+               for n in args.clients for mode in args.modes]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"delay {args.delay}s, settle {args.settle}s, scanner charge {args.charge}s, timeout {args.timeout}s")
+    print(f"{'clients':>7} {'mode':>14} {'wing s':>7} {'missed':>6} {'switches':>8} {'misdelivered':>13}")
+    for r in results:
+        print(f"{r['clients']:>7} {r['mode']:>14} {r['wing_seconds']:>7.2f} "
+              f"{r['missed']:>6} {r['focus_switches']:>8} "
+              f"{r['misdelivered']:>4}/{r['key_events']:<4} ({r['misdelivery_rate']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+AutoHonk timer latency against a fake desktop.
+
+Feeds FSDJump / FSSDiscoveryScan pairs straight into AutoHonk.process_entry
+and reports how late the key goes down after jump + delay + focus settle,
+how quickly it comes up after the scan, and whether a scan that arrives
+before the delay has elapsed still lets a stale honk start.
+
+It then replays the same jump script as bare FSDJumps, with the StartJump
+(Hyperspace) the journal writes a few seconds earlier, and with StartJump
+plus a focus lock (as the CLI always runs), and reports end-to-end FSDJump ->
+key down for each: the pre-armed runs skip the window lookup and focus
+settle at arrival.
+
+    python benchmarks/bench_honk_latency.py --cycles 20
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from autohonk.autohonk import AutoHonk  # noqa: E402
+from edwing.focus import FocusLock  # noqa: E402
+from edwing.stats import LatencySamples, format_summary  # noqa: E402
+from edwing.windows import FakeWindowBackend, WindowIndex  # noqa: E402
+
+WM_KEYDOWN = 0x0100
+
+
+def make_honker(delay, max_duration, settle, focus_lock=None):
+    backend = FakeWindowBackend()
+    backend.add_elite_window("Elite - Dangerous (CLIENT)")
+    index = WindowIndex(backend, "Elite - Dangerous", "elitedangerous64")
+    index.start_watching()
+    honker = AutoHonk(sandbox=None, window_filter=None, delay=delay, max_duration=max_duration,
+                      manual_vk=ord("1"), window_index=index, focus_lock=focus_lock)
+    honker.focus_settle = settle
+    return honker, backend
+
+
+def replay(script, delay, settle, focus_lock=None):
+    """Play [(offset, entry)] against a fresh honker in real time; FSDJump -> key down summary."""
+    honker, backend = make_honker(delay, 5.0, settle, focus_lock)
+    console = backend.add_window("Windows PowerShell", image="powershell.exe")
+    backend.set_foreground(console)  # the console has focus, as when launched by hand
+    jumps = []
+    start = time.perf_counter()
+    for offset, entry in script:
+        time.sleep(max(0.0, start + offset - time.perf_counter()))
+        if entry["event"] == "FSDJump":
+            jumps.append(time.perf_counter())
+        honker.process_entry(entry)
+        if entry["event"] == "FSSDiscoveryScan":
+            backend.set_foreground(console)  # commander alt-tabs away between jumps
+    time.sleep(0.05)
+    downs = [m[0] for m in backend.messages if m[2] == WM_KEYDOWN]
+    samples = LatencySamples()
+    for jumped, down in zip(jumps, downs):
+        samples.add(down - jumped)
+    honker.scheduler.stop()
+    return samples.summary()
+
+
+def jump_script(cycles, witchspace, delay, settle, hold, start_jump):
+    """Journal events for cycles jumps, as (seconds from start, entry)."""
+    script = []
+    t = 0.0
+    for i in range(cycles):
+        if start_jump:
+            script.append((t, {"event": "StartJump", "JumpType": "Hyperspace", "StarSystem": f"System {i}"}))
+        t += witchspace
+        script.append((t, {"event": "FSDJump", "StarSystem": f"System {i}"}))
+        t += delay + settle + hold
+        script.append((t, {"event": "FSSDiscoveryScan", "BodyCount": 3}))
+        t += 0.02
+    return script
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--cycles", type=int, default=20)
+    p.add_argument("--delay", type=float, default=0.05, help="delay_after_jump (default: 0.05)")
+    p.add_argument("--settle", type=float, default=0.02, help="focus settle (default: 0.02)")
+    p.add_argument("--hold", type=float, default=0.1, help="Seconds from key down to the scan (default: 0.1)")
+    p.add_argument("--witchspace", type=float, default=0.05, help="StartJump -> FSDJump in the replay (default: 0.05)")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    honker, backend = make_honker(args.delay, 5.0, args.settle)
+    threads = threading.active_count()
+    for i in range(args.cycles):
+        honker.process_entry({"event": "FSDJump", "StarSystem": f"System {i}"})
+        threads = max(threads, threading.active_count())
+        time.sleep(args.delay + args.settle + args.hold)
+        honker.process_entry({"event": "FSSDiscoveryScan", "BodyCount": 3})
+
+    # Scan lands before the jump delay elapses: no key may go down afterwards
+    stale, stale_backend = make_honker(args.delay, 5.0, args.settle)
+    for i in range(args.cycles):
+        stale.process_entry({"event": "FSDJump", "StarSystem": f"System {i}"})
+        time.sleep(args.delay / 4)
+        stale.process_entry({"event": "FSSDiscoveryScan", "BodyCount": 3})
+    time.sleep(args.delay + args.settle + 0.05)
+    stale_honks = sum(1 for m in stale_backend.messages if m[2] == WM_KEYDOWN)
+
+    replays = {}
+    for name, start_jump, lock in (("fsdjump_only", False, None), ("prearmed", True, None),
+                                   ("prearmed+lock", True, FocusLock())):
+        script = jump_script(args.cycles, args.witchspace, args.delay, args.settle, args.hold, start_jump)
+        replays[name] = replay(script, args.delay, args.settle, lock)
+
+    results = {
+        "jump_to_keydown": honker.latency["jump_to_keydown"].summary(),
+        "scan_to_keyup": honker.latency["scan_to_keyup"].summary(),
+        "stale_honks": stale_honks,
+        "max_threads": threads,
+        "replay_fsdjump_to_keydown": replays,
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.cycles} jump/scan cycles, delay {args.delay}s, settle {args.settle}s")
+    print(format_summary("jump->keydown (beyond due time)", results["jump_to_keydown"]))
+    print(format_summary("scan->keyup", results["scan_to_keyup"]))
+    print(f"stale honks after early scans: {stale_honks}/{args.cycles}")
+    print(f"threads alive: {threads}")
+    print(f"replay, delay {args.delay}s: FSDJump -> key down end to end")
+    for name, summary in replays.items():
+        print(format_summary(f"  {name}", summary))
+
+
+if __name__ == "__main__":
+    main()
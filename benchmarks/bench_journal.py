@@ -0,0 +1,125 @@
+"""
+Journal read throughput: the old reopen-and-decode-everything reader versus
+edwing.journal.JournalTail.
+
+A synthetic journal full of busy-session noise (Music, ReceiveText,
+ShipTargeted, Scan, ...) is appended in small batches, the way Elite writes
+it, and read after every batch.
+
+    python benchmarks/bench_journal.py --lines 50000 --batch 20
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edwing.journal import JournalTail  # noqa: E402
+
+WANTED = {"FSDJump", "FSSDiscoveryScan", "Location", "LoadGame", "StartUp"}
+
+
+def noise_line(ts, rng):
+    kind = rng.choice(["Music", "ReceiveText", "ShipTargeted", "Scan", "ReservoirReplenished", "FSSSignalDiscovered"])
+    entry = {"timestamp": ts, "event": kind}
+    if kind == "Scan":
+        entry.update({"ScanType": "AutoScan", "BodyName": f"Body {rng.randint(1, 40)}",
+                      "Rings": [{"Name": f"Ring {i}", "RingClass": "eRingClass_Icy",
+                                 "MassMT": rng.random() * 1e10} for i in range(3)],
+                      "Composition": {"Ice": 0.1, "Rock": 0.6, "Metal": 0.3},
+                      "Materials": [{"Name": m, "Percent": rng.random() * 20}
+                                    for m in ("iron", "nickel", "sulphur", "carbon", "manganese")]})
+    elif kind == "ReceiveText":
+        entry.update({"From": "npc", "Message": "$Pirate_OnStartScanCargo07;" * 3, "Channel": "npc"})
+    elif kind == "ShipTargeted":
+        entry.update({"TargetLocked": True, "Ship": "anaconda", "ScanStage": 3, "PilotName": "$npc_name_decorate:#name=X;",
+                      "PilotRank": "Elite", "ShieldHealth": 100.0, "HullHealth": 100.0, "Faction": "Pirates"})
+    return json.dumps(entry, separators=(", ", ":")).replace('{"timestamp"', '{ "timestamp"', 1)
+
+
+def journal_lines(count, rng):
+    for i in range(count):
+        ts = f"2024-05-01T12:{(i // 60) % 60:02d}:{i % 60:02d}Z"
+        if i % 500 == 0:
+            yield json.dumps({"timestamp": ts, "event": "FSDJump", "StarSystem": f"Sys {i}",
+                              "SystemAddress": i, "JumpDist": 42.1})
+        elif i % 500 == 30:
+            yield json.dumps({"timestamp": ts, "event": "FSSDiscoveryScan", "Progress": 0.3, "BodyCount": 12})
+        else:
+            yield noise_line(ts, rng)
+
+
+class LegacyReader:
+    """The previous JournalWatcher._read_new: reopen in text mode, json.loads every line."""
+
+    def __init__(self, path):
+        self.path = path
+        self.position = 0
+
+    def read_new(self):
+        out = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            f.seek(self.position)
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if entry.get("event") in WANTED:
+                        out.append(entry)
+            self.position = f.tell()
+        return out
+
+
+def run(reader_factory, lines, batch):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "Journal.2024-05-01T120000.01.log"
+        path.write_bytes(b"")
+        reader = reader_factory(path)
+        found = 0
+        elapsed = 0.0
+        with open(path, "ab") as out:
+            for i in range(0, len(lines), batch):
+                out.write(b"".join(lines[i:i + batch]))
+                out.flush()
+                start = time.perf_counter()
+                found += len(reader.read_new())
+                elapsed += time.perf_counter() - start
+        if hasattr(reader, "close"):
+            reader.close()
+        return found, elapsed
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--lines", type=int, default=50000)
+    p.add_argument("--batch", type=int, default=20, help="Lines appended between reads (default: 20)")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    rng = random.Random(1)
+    lines = [(line + "\r\n").encode() for line in journal_lines(args.lines, rng)]
+    results = {}
+    for name, factory in (("legacy", LegacyReader),
+                          ("JournalTail", lambda path: JournalTail(path, WANTED, from_start=True))):
+        found, elapsed = run(factory, lines, args.batch)
+        results[name] = {"events": found, "seconds": elapsed, "lines_per_s": args.lines / elapsed}
+
+    if args.json:
+        print(json.dumps({"lines": args.lines, "batch": args.batch, "results": results}, indent=2))
+        return
+
+    print(f"{args.lines} lines appended {args.batch} at a time")
+    for name, r in results.items():
+        print(f"{name:<12} {r['events']:>5} events  {r['seconds']:.3f}s  {r['lines_per_s']:>12,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
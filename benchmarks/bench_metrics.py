@@ -0,0 +1,84 @@
+"""
+Cost of the always-on timing spans.
+
+Times an empty loop, REGISTRY-style span() and observe() calls, from one
+thread and from several at once (they share a stage, so they contend for its
+lock), then scrapes a MetricsServer on an ephemeral port to check the
+Prometheus output end to end.
+
+    python benchmarks/bench_metrics.py --iterations 200000 --threads 4
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edwing.metrics import Metrics, MetricsServer  # noqa: E402
+
+
+def per_call_ns(fn, iterations, threads):
+    workers = [threading.Thread(target=fn, args=(iterations,)) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - start) / (iterations * threads) * 1e9
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--iterations", type=int, default=200000)
+    p.add_argument("--threads", type=int, default=4)
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    metrics = Metrics()
+
+    def empty(n):
+        for _ in range(n):
+            pass
+
+    def span(n):
+        for _ in range(n):
+            with metrics.span("window_send"):
+                pass
+
+    def observe(n):
+        for _ in range(n):
+            metrics.observe("dispatch", 0.0001)
+
+    results = {}
+    for threads in sorted({1, args.threads}):
+        baseline = per_call_ns(empty, args.iterations, threads)
+        results[f"{threads}_thread"] = {
+            "span_ns": per_call_ns(span, args.iterations, threads) - baseline,
+            "observe_ns": per_call_ns(observe, args.iterations, threads) - baseline,
+        }
+
+    server = MetricsServer(metrics, port=0)
+    server.start()
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as response:
+        body = response.read().decode()
+    server.stop()
+    results["scrape_lines"] = body.count("\n")
+    results["summary"] = metrics.summary()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for key, value in results.items():
+        if key.endswith("_thread"):
+            print(f"{key.replace('_', ' ')}(s): span {value['span_ns']:.0f} ns, observe {value['observe_ns']:.0f} ns")
+    print(f"scrape: {results['scrape_lines']} lines of Prometheus text, "
+          f"{len(results['summary'])} stages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Cost of status output on the send path with a slow console.
+
+stdout is replaced by a stream that takes --write-cost seconds per write (a
+busy terminal, a console being scrolled). The sender loop of
+send_keys_to_window - a status line, the key messages, another status line
+and a log record per window - is timed once with synchronous print/logging
+and once through edwing.output's background writer.
+
+    python benchmarks/bench_output.py --windows 8 --write-cost 0.002
+"""
+
+import argparse
+import io
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edwing import output  # noqa: E402
+from edwing.stats import format_summary, summarize  # noqa: E402
+
+
+class SlowStream(io.StringIO):
+    def __init__(self, cost):
+        super().__init__()
+        self.cost = cost
+
+    def write(self, s):
+        time.sleep(self.cost)
+        return super().write(s)
+
+
+def send_loop(windows, commands, say, log):
+    """Per-window time spent around the key messages, as send_keys_to_window prints it."""
+    samples = []
+    for _ in range(commands):
+        for i in range(windows):
+            start = time.perf_counter()
+            say(f"🎯 Sending '1qq' to Cmdr{i:02d} using PostMessage...")
+            say(f"✅ Sent 3 keys to Cmdr{i:02d}")
+            log.info("Sent keys to Cmdr%02d", i)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--windows", type=int, default=8)
+    p.add_argument("--commands", type=int, default=20)
+    p.add_argument("--write-cost", type=float, default=0.002, help="Seconds per console write (default: 0.002)")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    real_stdout, real_stderr = sys.stdout, sys.stderr
+    sys.stdout = sys.stderr = SlowStream(args.write_cost)
+    log = logging.getLogger("bench")
+    try:
+        root = logging.getLogger()
+        handler = logging.StreamHandler()
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+        sync = send_loop(args.windows, args.commands, print, log)
+        root.removeHandler(handler)
+
+        output.configure()
+        queued = send_loop(args.windows, args.commands, output.echo, log)
+        drain = time.perf_counter()
+        output.shutdown()
+        drain = time.perf_counter() - drain
+    finally:
+        sys.stdout, sys.stderr = real_stdout, real_stderr
+
+    results = {"synchronous": summarize(sync), "queued": summarize(queued), "queued_drain_seconds": drain}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.windows} windows x {args.commands} commands, {args.write_cost * 1000:.1f}ms per console write")
+    print(format_summary("synchronous print/logging per window", results["synchronous"]))
+    print(format_summary("queued echo/logging per window", results["queued"]))
+    print(f"background writer caught up {drain:.2f}s after the last send")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+End-to-end CommandRelay benchmark against a fake desktop.
+
+Runs the real relay threads (input monitor, timer, broadcast worker) with a
+scripted key source in place of msvcrt and N fake Elite windows whose
+message queues add --queue-delay (+ --jitter) and drop --failure-rate of
+PostMessage calls. Each command is typed, then sent with the terminator key.
+Measured per wing size:
+
+  keystroke->delivery  terminator key to the first key down processed by each window
+  skew                 first key down in the last window minus in the first
+  discovery            find_all_elite_windows, cold (first call) and warm
+  broadcast            send_command_to_all_windows wall time
+  reached              windows that got every key of a command (the relay's own count)
+
+Results go to stdout as JSON with --json, or to a file with --out.
+
+    python benchmarks/bench_relay.py --sizes 1 2 4 8 16 --json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import input_broadcast  # noqa: E402
+from edwing.broadcast import WM_KEYDOWN  # noqa: E402
+from edwing.stats import format_summary, summarize  # noqa: E402
+from edwing.windows import FakeWindowBackend  # noqa: E402
+
+
+class TimedRelay(input_broadcast.CommandRelay):
+    """CommandRelay that records discovery and broadcast times."""
+
+    def __init__(self, *args, **kwargs):
+        self.discovery = []
+        self.broadcasts = []
+        self.reached = []  # windows every post of the command went to, per broadcast
+        self.broadcast_done = threading.Event()
+        super().__init__(*args, **kwargs)
+
+    def find_all_elite_windows(self, group=None):
+        start = time.perf_counter()
+        windows = super().find_all_elite_windows(group)
+        self.discovery.append(time.perf_counter() - start)
+        return windows
+
+    def send_command_to_all_windows(self, command, group=None):
+        start = time.perf_counter()
+        reached = 0
+        try:
+            reached, windows = super().send_command_to_all_windows(command, group)
+            return reached, windows
+        finally:
+            self.reached.append(reached)
+            self.broadcasts.append(time.perf_counter() - start)
+            self.broadcast_done.set()
+
+
+def run_size(size, args):
+    names = [f"Cmdr{i:02d}" for i in range(size)]
+    input_broadcast.CONFIG.update({
+        "commanders": names[1:],
+        "primary_commander": names[0],
+        "known_commands": [],
+        "typing_timeout": 60.0,  # commands are sent with the terminator key
+        "terminator_key": "`",
+        "relay_mode": "buffered",
+        "broadcast_mode": args.mode,
+        "key_press_duration": args.press,
+        "key_send_delay": args.gap,
+        "metrics_interval": 0,  # no summary file from benchmark runs
+    })
+    backend = FakeWindowBackend(query_cost=args.query_cost, post_delay=args.queue_delay,
+                                post_jitter=args.jitter, failure_rate=args.failure_rate, seed=size)
+    hwnds = {backend.add_elite_window(f"Elite - Dangerous (CLIENT) {name}"): name for name in names}
+
+    keys: "queue.Queue[str]" = queue.Queue()
+    with contextlib.redirect_stdout(io.StringIO()):
+        relay = TimedRelay(window_backend=backend, key_source=keys.get)
+        runner = threading.Thread(target=relay.run, daemon=True)
+        runner.start()
+
+        first_key, skew, expected = [], [], 0
+        for _ in range(args.commands):
+            for char in args.command:
+                keys.put(char)
+                time.sleep(args.typing)
+            relay.broadcast_done.clear()
+            seen = len(backend.messages)
+            sent_at = time.perf_counter()
+            keys.put("`")
+            relay.broadcast_done.wait(30)
+            time.sleep(args.queue_delay + args.jitter)  # let queued messages "arrive"
+
+            firsts = {}
+            for t, hwnd, msg, _, _ in backend.messages[seen:]:
+                if msg == WM_KEYDOWN and hwnd not in firsts:
+                    firsts[hwnd] = t
+            expected += len(hwnds)
+            first_key.extend(t - sent_at for t in firsts.values())
+            if len(firsts) > 1:
+                skew.append(max(firsts.values()) - min(firsts.values()))
+
+        keys.put("\x03")  # Ctrl+C
+        runner.join(5)
+        delivered = sum(relay.reached)
+
+    return {
+        "windows": size,
+        "commands": args.commands,
+        "keystroke_to_delivery": summarize(first_key),
+        "skew": summarize(skew),
+        "discovery_cold_ms": relay.discovery[0] * 1000 if relay.discovery else None,
+        "discovery_warm": summarize(relay.discovery[1:]),
+        "broadcast": summarize(relay.broadcasts),
+        "windows_reached": delivered,
+        "windows_expected": expected,
+        "failed_posts": backend.failed_posts,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    p.add_argument("--commands", type=int, default=5, help="Commands per wing size (default: 5)")
+    p.add_argument("--command", default="1qq", help="Command typed each time (default: 1qq)")
+    p.add_argument("--mode", choices=("concurrent", "sequential"), default="concurrent")
+    p.add_argument("--press", type=float, default=0.02, help="key_press_duration (default: 0.02)")
+    p.add_argument("--gap", type=float, default=0.01, help="key_send_delay (default: 0.01)")
+    p.add_argument("--typing", type=float, default=0.005, help="Seconds between scripted keystrokes (default: 0.005)")
+    p.add_argument("--queue-delay", type=float, default=0.001, help="Fake message queue delay (default: 0.001)")
+    p.add_argument("--jitter", type=float, default=0.002, help="Extra random queue delay (default: 0.002)")
+    p.add_argument("--failure-rate", type=float, default=0.001, help="Fraction of failed PostMessage calls (default: 0.001)")
+    p.add_argument("--query-cost", type=float, default=0.002, help="Fake OpenProcess cost in seconds (default: 0.002)")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    p.add_argument("--out", type=Path, help="Also write the JSON results to this file")
+    args = p.parse_args()
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {k: v for k, v in vars(args).items() if k not in ("json", "out")},
+        "runs": [run_size(size, args) for size in args.sizes],
+    }
+    if args.out:
+        args.out.write_text(json.dumps(results, indent=2))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.mode} broadcast of {args.command!r}, queue delay {args.queue_delay}s (+{args.jitter}s), "
+          f"failure rate {args.failure_rate}")
+    for run in results["runs"]:
+        print(f"{run['windows']} window(s): reached {run['windows_reached']}/{run['windows_expected']}, "
+              f"{run['failed_posts']} failed posts, discovery cold {run['discovery_cold_ms']:.2f}ms")
+        print(format_summary("  keystroke->delivery", run["keystroke_to_delivery"]))
+        print(format_summary("  skew", run["skew"]))
+        print(format_summary("  discovery (warm)", run["discovery_warm"]))
+        print(format_summary("  broadcast", run["broadcast"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Relay daemon API throughput against a fake desktop.
+
+Starts a CommandRelay in daemon mode with N fake Elite windows and no key
+delays, then sends --commands commands three ways:
+
+  process    one `python -m edwing.relayd send` per command, as a script
+             starting an interpreter per action would
+  roundtrip  one connection, each request waiting for its reply
+  pipelined  one connection, every request written before reading replies
+
+Reported per way: total seconds and commands per second.
+
+    python benchmarks/bench_relayd.py --windows 4 --commands 200
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import input_broadcast  # noqa: E402
+from edwing.relayd import RelayClient, default_info_path  # noqa: E402
+from edwing.windows import FakeWindowBackend  # noqa: E402
+
+
+def timed(fn, count):
+    start = time.perf_counter()
+    fn()
+    total = time.perf_counter() - start
+    return {"total_s": total, "per_s": count / total}
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--windows", type=int, default=4)
+    p.add_argument("--commands", type=int, default=200, help="Commands per way (default: 200)")
+    p.add_argument("--process-commands", type=int, default=10,
+                   help="Commands for the process-per-command way, which is slow (default: 10)")
+    p.add_argument("--command", default="1qq2")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    # Keep the daemon info file (and anything else) out of the real data folder
+    os.environ["LOCALAPPDATA"] = tempfile.mkdtemp(prefix="edwing-bench-")
+    names = [f"Cmdr{i:02d}" for i in range(args.windows)]
+    input_broadcast.CONFIG.update({
+        "commanders": names[1:],
+        "primary_commander": names[0],
+        "key_press_duration": 0.0,
+        "key_send_delay": 0.0,
+        "metrics_interval": 0,
+        "api_port": None,
+    })
+    backend = FakeWindowBackend()
+    for name in names:
+        backend.add_elite_window(f"Elite - Dangerous (CLIENT) {name}")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        relay = input_broadcast.CommandRelay(window_backend=backend, daemon=True)
+        runner = threading.Thread(target=relay.run, daemon=True)
+        runner.start()
+        deadline = time.monotonic() + 5
+        while not default_info_path().exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        request = {"op": "send", "command": args.command}
+        with RelayClient() as client:
+            def roundtrip():
+                for _ in range(args.commands):
+                    client.request(**request)
+
+            def pipelined():
+                replies = client.pipeline([request] * args.commands)
+                assert all(r["ok"] and r["sent"] == args.windows for r in replies), replies[:3]
+
+            def process():
+                for _ in range(args.process_commands):
+                    subprocess.run([sys.executable, "-m", "edwing.relayd", "send", args.command],
+                                   cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+
+            results = {
+                "process": timed(process, args.process_commands),
+                "roundtrip": timed(roundtrip, args.commands),
+                "pipelined": timed(pipelined, args.commands),
+            }
+            client.request("shutdown")
+        runner.join(10)
+
+    if args.json:
+        print(json.dumps({"windows": args.windows, "command": args.command, **results}, indent=2))
+        return
+    print(f"'{args.command}' to {args.windows} windows")
+    print(f"{'way':<10} {'total s':>8} {'commands/s':>11}")
+    for way, r in results.items():
+        print(f"{way:<10} {r['total_s']:>8.3f} {r['per_s']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+AutoHonk startup: picking the latest journal and recovering state.
+
+Builds a journal folder with years of history (old YYMMDDHHMMSS names and
+ISO names mixed) and a large current journal that ends mid-jump, then
+times the old glob + stat + sort pick against edwing.journal.latest_journal
+plus a backwards scan, and checks that the recovered state is right.
+
+    python benchmarks/bench_startup.py --files 5000 --lines 50000
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_journal import journal_lines  # noqa: E402
+from edwing.journal import latest_journal, scan_backwards  # noqa: E402
+
+RECOVERY_EVENTS = {"FSDJump", "FSSDiscoveryScan", "Location", "LoadGame", "StartUp", "Shutdown"}
+
+
+def build_folder(folder, files, lines):
+    start = datetime(2017, 1, 1)
+    for i in range(files):
+        stamp = start + timedelta(hours=6 * i)
+        if stamp.year < 2021:
+            name = f"Journal.{stamp:%y%m%d%H%M%S}.01.log"
+        else:
+            name = f"Journal.{stamp:%Y-%m-%dT%H%M%S}.01.log"
+        (folder / name).write_text('{ "timestamp":"2017-01-01T00:00:00Z", "event":"Fileheader" }\n')
+
+    latest = folder / f"Journal.{start + timedelta(hours=6 * files):%Y-%m-%dT%H%M%S}.01.log"
+    rng = random.Random(1)
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    with open(latest, "w", encoding="utf-8") as f:
+        for line in journal_lines(lines, rng):
+            f.write(line + "\r\n")
+        f.write(json.dumps({"timestamp": now, "event": "FSDJump", "StarSystem": "Recovered", "JumpDist": 9.9}) + "\r\n")
+        f.write('{ "timestamp":"%s", "event":"Music", "MusicTrack":"Exploration" }\r\n' % now)
+    return latest
+
+
+def legacy_pick(folder):
+    journals = sorted(folder.glob("Journal.*.log"), key=lambda p: p.stat().st_mtime)
+    return journals[-1] if journals else None
+
+
+def recover(path):
+    pending = None
+    for i, entry in enumerate(scan_backwards(path, RECOVERY_EVENTS)):
+        if i == 0 and entry.get("event") == "FSDJump":
+            pending = entry
+        if entry.get("StarSystem"):
+            return entry.get("StarSystem"), pending is not None
+    return None, False
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--files", type=int, default=5000, help="Old journals in the folder (default: 5000)")
+    p.add_argument("--lines", type=int, default=50000, help="Lines in the current journal (default: 50000)")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        latest = build_folder(folder, args.files, args.lines)
+
+        t = time.perf_counter()
+        legacy = legacy_pick(folder)
+        legacy_s = time.perf_counter() - t
+
+        t = time.perf_counter()
+        picked = latest_journal(folder)
+        pick_s = time.perf_counter() - t
+
+        t = time.perf_counter()
+        system, pending = recover(picked)
+        recover_s = time.perf_counter() - t
+
+        results = {
+            "files": args.files,
+            "lines": args.lines,
+            "legacy_pick_ms": legacy_s * 1000,
+            "pick_ms": pick_s * 1000,
+            "recover_ms": recover_s * 1000,
+            "picked_latest": picked == latest,
+            "legacy_picked_latest": legacy == latest,
+            "system": system,
+            "pending_jump": pending,
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.files} journals, current one {args.lines} lines")
+    print(f"legacy glob+stat+sort   {results['legacy_pick_ms']:8.2f} ms  latest={results['legacy_picked_latest']}")
+    print(f"latest_journal          {results['pick_ms']:8.2f} ms  latest={results['picked_latest']}")
+    print(f"backwards state scan    {results['recover_ms']:8.2f} ms  system={system!r} pending_jump={pending}")
+
+
+if __name__ == "__main__":
+    main()
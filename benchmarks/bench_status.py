@@ -0,0 +1,86 @@
+"""
+Wing status board costs.
+
+For each wing size: the time one AutoHonk takes to publish a state change,
+the time to read every commander's record, and how long after the last
+commander publishes its arrival a WingBoard.wait(wing_arrived) caller
+returns (a writer thread per commander, polling at --interval).
+
+    python benchmarks/bench_status.py --sizes 4 16 64
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edwing.stats import format_summary, summarize  # noqa: E402
+from edwing.status import IDLE, JUMPING, StatusSlot, WingBoard, wing_arrived  # noqa: E402
+
+
+def run(size, rounds, interval, folder):
+    path = Path(folder) / f"board-{size}.bin"
+    slots = [StatusSlot(f"Cmdr{i:02d}", path, slots=max(64, size)) for i in range(size)]
+    board = WingBoard(path)
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        slots[0].publish(system=f"System {i % 7}", last_event=time.time())
+    publish = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds // 10 or 1):
+        records = board.records()
+    read = (time.perf_counter() - start) / (rounds // 10 or 1)
+    assert len(records) == size
+
+    arrivals = []
+    for jump in range(5):
+        system = f"Arrival {jump}"
+        for slot in slots:
+            slot.publish(state=JUMPING, system=f"Witchspace {jump}")
+        arrived_at = []
+
+        def arrive():
+            for slot in slots:
+                slot.publish(state=IDLE, system=system)
+            arrived_at.append(time.perf_counter())
+
+        threading.Timer(0.05, arrive).start()
+        board.wait(wing_arrived, timeout=5.0, interval=interval)
+        seen = time.perf_counter()
+        arrivals.append(seen - arrived_at[0] if arrived_at else 5.0)
+
+    for slot in slots:
+        slot.close()
+    board.close()
+    return {"commanders": size, "publish_us": publish * 1e6, "read_board_us": read * 1e6,
+            "arrival_seen": summarize(arrivals)}
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--sizes", type=int, nargs="+", default=[4, 16, 64])
+    p.add_argument("--rounds", type=int, default=5000)
+    p.add_argument("--interval", type=float, default=0.005, help="WingBoard.wait poll interval (default: 0.005)")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        results = [run(size, args.rounds, args.interval, folder) for size in args.sizes]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(f"{r['commanders']:>3} commanders: publish {r['publish_us']:.1f} us, "
+              f"read board {r['read_board_us']:.1f} us")
+        print(format_summary("    last arrival -> wait() returns", r["arrival_seen"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Key-timing jitter: time.sleep vs edwing.timing.
+
+For each hold duration, measures how late each sleep wakes up, and how far a
+whole key sequence drifts when built from relative sleeps versus absolute
+Timeline deadlines. Also reports CPU time, since the precise path spins.
+
+    python benchmarks/bench_timing.py --samples 200
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edwing.stats import summarize  # noqa: E402
+from edwing.timing import Timeline, enable_high_resolution_timer, precise_sleep  # noqa: E402
+
+
+def overshoot(sleep, seconds, samples):
+    errors = []
+    cpu = time.process_time()
+    for _ in range(samples):
+        start = time.perf_counter()
+        sleep(seconds)
+        errors.append(time.perf_counter() - start - seconds)
+    return summarize(errors), time.process_time() - cpu
+
+
+def sequence_drift(use_timeline, keys, press, gap, rounds):
+    """Error at the final key-up of a keys-long plan, relative to the ideal schedule."""
+    ideal = keys * (press + gap)
+    errors = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        if use_timeline:
+            timeline = Timeline(start)
+            for _ in range(keys):
+                timeline.advance(press)
+                timeline.advance(gap)
+        else:
+            for _ in range(keys):
+                time.sleep(press)
+                time.sleep(gap)
+        errors.append(time.perf_counter() - start - ideal)
+    return summarize(errors)
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--durations", default="0.001,0.005,0.02,0.05,0.1",
+                   help="Comma-separated hold durations in seconds")
+    p.add_argument("--samples", type=int, default=100)
+    p.add_argument("--keys", type=int, default=20, help="Keys in the drift sequence (default: 20)")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    hires = enable_high_resolution_timer()
+    results = {"high_resolution_timer": hires, "overshoot": [], "drift": {}}
+
+    for seconds in (float(d) for d in args.durations.split(",")):
+        samples = max(5, min(args.samples, int(2.0 / seconds)))
+        for name, fn in (("time.sleep", time.sleep), ("precise_sleep", precise_sleep)):
+            summary, cpu = overshoot(fn, seconds, samples)
+            results["overshoot"].append({"sleep": name, "seconds": seconds, "cpu_s": cpu, **summary})
+
+    for name, use_timeline in (("relative time.sleep", False), ("Timeline", True)):
+        results["drift"][name] = sequence_drift(use_timeline, args.keys, 0.01, 0.005, 10)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"platform={sys.platform} high-resolution timer={'on' if hires else 'n/a'}")
+    print(f"{'sleep':<14} {'target ms':>9} {'n':>5} {'p50 late':>9} {'p99 late':>9} {'max late':>9} {'cpu s':>7}")
+    for r in results["overshoot"]:
+        print(f"{r['sleep']:<14} {r['seconds'] * 1000:>9.1f} {r['count']:>5} {r['p50_ms']:>9.3f} "
+              f"{r['p99_ms']:>9.3f} {r['max_ms']:>9.3f} {r['cpu_s']:>7.3f}")
+    print(f"\nDrift at the end of a {args.keys}-key sequence (10 ms hold, 5 ms gap):")
+    for name, r in results["drift"].items():
+        print(f"  {name:<20} p50={r['p50_ms']:.3f}ms max={r['max_ms']:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Adaptive honk timing (edwing.tuning.HonkTuner) against a model scanner.
+
+Each jump, the discovery scanner only fires if the key goes down at least
+--ready seconds after arrival and stays down for --charge seconds (with a
+little jitter). Static timing uses --delay / --max-duration every jump;
+adaptive timing lets HonkTuner learn both, and honks again at once (as
+AutoHonk does) when record() blames a miss on the learned timing. Reported:
+seconds from arrival to the end of the honk, summed over the run, retried
+honks and the number of missed scans.
+
+    python benchmarks/bench_tuning.py --jumps 200
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edwing.tuning import HonkTuner  # noqa: E402
+
+
+def honk(delay, timeout, ready, charge):
+    """(seconds from arrival until the key is released, scanned)."""
+    if delay >= ready and timeout >= charge:
+        return delay + charge, True
+    return delay + timeout, False
+
+
+def run(jumps, delay, timeout, ready, charge, jitter, tuner=None, seed=1):
+    rng = random.Random(seed)
+    total = 0.0
+    missed = 0
+    retried = 0
+    for _ in range(jumps):
+        if tuner:
+            delay, timeout = tuner.delay, tuner.timeout
+        this_charge = charge + rng.uniform(0, jitter)
+        took, scanned = honk(delay, timeout, ready, this_charge)
+        if tuner and tuner.record(this_charge if scanned else timeout, scanned):
+            # Retry straight away: the scanner is ready by now, and the timeout is back at its maximum
+            retried += 1
+            took, scanned = honk(took, tuner.timeout, ready, this_charge)
+            tuner.record(this_charge if scanned else tuner.timeout, scanned)
+        total += took
+        missed += not scanned
+    return {"seconds": total, "missed": missed, "retried": retried, "final_delay": delay, "final_timeout": timeout}
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--jumps", type=int, default=200)
+    p.add_argument("--delay", type=float, default=2.0, help="Configured --delay (default: 2)")
+    p.add_argument("--max-duration", type=float, default=7.0, help="Configured --max-duration (default: 7)")
+    p.add_argument("--ready", type=float, default=1.2, help="Seconds after arrival the scanner works (default: 1.2)")
+    p.add_argument("--charge", type=float, default=4.5, help="Hold needed for a scan (default: 4.5)")
+    p.add_argument("--jitter", type=float, default=0.3, help="Extra random hold needed (default: 0.3)")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tuner = HonkTuner("bench", args.delay, args.max_duration, path=Path(tmp) / "history.json")
+        results = {
+            "static": run(args.jumps, args.delay, args.max_duration, args.ready, args.charge, args.jitter),
+            "adaptive": run(args.jumps, args.delay, args.max_duration, args.ready, args.charge, args.jitter, tuner),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.jumps} jumps, scanner ready after {args.ready}s, needs {args.charge}-{args.charge + args.jitter}s")
+    for name, r in results.items():
+        print(f"{name:<9} {r['seconds']:8.1f}s honking  {r['retried']:>3} retried  {r['missed']:>3} missed scans  "
+              f"delay {r['final_delay']:.2f}s  timeout {r['final_timeout']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
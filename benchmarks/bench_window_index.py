@@ -0,0 +1,123 @@
+"""
+Benchmark Elite window discovery against a fake desktop.
+
+Compares the old per-commander EnumWindows scan (N+1 passes, OpenProcess for
+every visible window) with a single-pass WindowIndex rebuild and a warm,
+cached index lookup.
+
+    python benchmarks/bench_window_index.py --clients 4 --noise 150
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edwing.windows import FakeWindowBackend, WindowIndex  # noqa: E402
+
+TITLE = "Elite - Dangerous (CLIENT)"
+PROCESS = "elitedangerous64"
+
+
+def build_desktop(clients: int, noise: int, query_cost: float):
+    backend = FakeWindowBackend(query_cost=query_cost)
+    commanders = [f"Commander{i}" for i in range(1, clients)]
+    primary = "Primary"
+    for i in range(noise // 2):
+        backend.add_window(f"Document {i} - Editor", image="c:\\tools\\editor.exe")
+    for name in commanders:
+        backend.add_elite_window(f"[#] [CMDR{name}] {TITLE} [#]")
+    backend.add_elite_window(TITLE)
+    for i in range(noise - noise // 2):
+        backend.add_window(f"Browser tab {i}", image="c:\\tools\\browser.exe")
+    return backend, commanders, primary
+
+
+def legacy_find_all(backend, commanders, primary):
+    """The pre-index algorithm: one full scan per commander plus one for the primary."""
+    def find(target):
+        for info in backend.list_windows():
+            try:
+                exe = backend.process_image(info.pid)
+            except Exception:
+                continue
+            title = info.title.lower()
+            if PROCESS in exe and TITLE.lower() in title:
+                if target in commanders:
+                    if target.lower() in title:
+                        return info.hwnd
+                elif not any(c.lower() in title for c in commanders):
+                    return info.hwnd
+        return None
+
+    found = []
+    for commander in commanders + [primary]:
+        hwnd = find(commander)
+        if hwnd:
+            found.append((hwnd, backend.window_text(hwnd), commander))
+    return found
+
+
+def measure(fn, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+    return (time.perf_counter() - start) / rounds, result
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--clients", type=int, default=4, help="Elite windows on the desktop (default: 4)")
+    p.add_argument("--noise", type=int, default=150, help="Other visible windows (default: 150)")
+    p.add_argument("--query-cost", type=float, default=0.0002,
+                   help="Simulated OpenProcess+GetModuleFileNameEx cost in seconds (default: 0.0002)")
+    p.add_argument("--rounds", type=int, default=20)
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    backend, commanders, primary = build_desktop(args.clients, args.noise, args.query_cost)
+    results = {}
+
+    backend.enum_calls = backend.process_queries = 0
+    secs, found = measure(lambda: legacy_find_all(backend, commanders, primary), args.rounds)
+    results["legacy"] = {"ms": secs * 1000, "windows": len(found),
+                         "enum_calls": backend.enum_calls / args.rounds,
+                         "process_queries": backend.process_queries / args.rounds}
+
+    index = WindowIndex(backend, TITLE, PROCESS, commanders, primary)
+
+    def cold():
+        index._exe_cache.clear()
+        index.invalidate()
+        return index.commander_windows()
+
+    backend.enum_calls = backend.process_queries = 0
+    secs, found = measure(cold, args.rounds)
+    results["single_pass"] = {"ms": secs * 1000, "windows": len(found),
+                              "enum_calls": backend.enum_calls / args.rounds,
+                              "process_queries": backend.process_queries / args.rounds}
+
+    index.start_watching()
+    index.commander_windows()
+    backend.enum_calls = backend.process_queries = 0
+    secs, found = measure(index.commander_windows, args.rounds)
+    results["cached"] = {"ms": secs * 1000, "windows": len(found),
+                         "enum_calls": backend.enum_calls / args.rounds,
+                         "process_queries": backend.process_queries / args.rounds}
+
+    if args.json:
+        print(json.dumps({"clients": args.clients, "noise": args.noise, "results": results}, indent=2))
+        return
+
+    print(f"{args.clients} Elite windows, {args.noise} other windows, "
+          f"{args.query_cost * 1e6:.0f} us per process query")
+    print(f"{'mode':<12} {'ms/lookup':>10} {'found':>6} {'enums':>6} {'queries':>8}")
+    for mode, r in results.items():
+        print(f"{mode:<12} {r['ms']:>10.3f} {r['windows']:>6} {r['enum_calls']:>6.1f} {r['process_queries']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
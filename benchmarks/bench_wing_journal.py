@@ -0,0 +1,123 @@
+"""
+Merged wing journal stream: ordering and notify-to-delivery latency.
+
+Every commander gets a journal folder. Each round, every commander (in a
+random order) appends a few lines stamped with that round's second to its
+journal: an FSDJump or FSSDiscoveryScan now and then, busy-session noise
+otherwise. After each append, WingJournal.notify is called as a watchdog
+handler would. One read-loop thread merges the journals and feeds a
+subscriber. Reported per wing size:
+  - events delivered, and lines per second over the run (paced by --interval)
+  - timestamp inversions in the merged stream (there should be none; they
+    can only come from a round split across passes)
+  - latency from a round's first append to its first delivered event
+  - thread count
+
+    python benchmarks/bench_wing_journal.py --sizes 4 16 --rounds 300
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_journal import noise_line  # noqa: E402
+from edwing.stats import format_summary, summarize  # noqa: E402
+from edwing.wingjournal import WingJournal  # noqa: E402
+
+WANTED = {"FSDJump", "FSSDiscoveryScan", "StartJump"}
+
+
+def run(size, rounds, interval, seed):
+    rng = random.Random(seed)
+    start = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+    with tempfile.TemporaryDirectory() as tmp:
+        folders = {}
+        files = {}
+        for i in range(size):
+            commander = f"Cmdr{i:02d}"
+            folder = Path(tmp) / commander
+            folder.mkdir()
+            path = folder / "Journal.2024-05-01T120000.01.log"
+            path.write_bytes(b"")
+            folders[commander] = folder
+            files[commander] = open(path, "ab")
+
+        journal = WingJournal(folders, WANTED)
+        delivered = []  # (perf_counter, commander, timestamp)
+        journal.subscribe(lambda e: delivered.append((time.perf_counter(), e.commander, e.timestamp)))
+        journal.start()
+        threads = threading.active_count()
+
+        written = {}  # round timestamp -> first append
+        lines = 0
+        loop_start = time.perf_counter()
+        for r in range(rounds):
+            ts = (start + timedelta(seconds=r)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            commanders = list(folders)
+            rng.shuffle(commanders)
+            for commander in commanders:
+                batch = [noise_line(ts, rng) for _ in range(rng.randint(1, 4))]
+                event = "FSDJump" if rng.random() < 0.5 else "FSSDiscoveryScan"
+                batch.insert(rng.randrange(len(batch) + 1),
+                             json.dumps({"timestamp": ts, "event": event, "StarSystem": f"Sys {r}"}))
+                f = files[commander]
+                f.write(("\n".join(batch) + "\n").encode())
+                f.flush()
+                written.setdefault(ts, time.perf_counter())
+                journal.notify(f.name)
+                lines += len(batch)
+            time.sleep(interval)
+        deadline = time.perf_counter() + 5
+        while len(delivered) < rounds * size and time.perf_counter() < deadline:
+            time.sleep(0.001)
+        elapsed = time.perf_counter() - loop_start
+        journal.stop()
+        for f in files.values():
+            f.close()
+
+    inversions = sum(1 for a, b in zip(delivered, delivered[1:]) if b[2] < a[2])
+    first = {}
+    for at, _, ts in delivered:
+        first.setdefault(ts, at)
+    latency = [first[ts] - at for ts, at in written.items() if ts in first]
+    return {
+        "commanders": size,
+        "lines": lines,
+        "delivered": len(delivered),
+        "expected": rounds * size,
+        "inversions": inversions,
+        "lines_per_s": lines / elapsed,
+        "threads": threads,
+        "append_to_delivery": summarize(latency),
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--sizes", type=int, nargs="+", default=[4, 16])
+    p.add_argument("--rounds", type=int, default=300)
+    p.add_argument("--interval", type=float, default=0.002, help="Seconds between rounds (default: 0.002)")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    results = [run(size, args.rounds, args.interval, args.seed) for size in args.sizes]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(f"{r['commanders']} commanders: {r['delivered']}/{r['expected']} events from {r['lines']} lines, "
+              f"{r['lines_per_s']:,.0f} lines/s, {r['inversions']} inversions, {r['threads']} threads")
+        print(format_summary("  append->delivery", r["append_to_delivery"]))
+
+
+if __name__ == "__main__":
+    main()
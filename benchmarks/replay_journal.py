@@ -0,0 +1,195 @@
+"""
+Replay recorded Elite journals through AutoHonk, off Windows.
+
+Journal.*.log files are copied line by line into a scratch folder and fed to
+JournalWatcher the way watchdog would (on_created / on_modified). Each change
+is followed by one pass of the wing's merged journal (WingJournal.poll) on
+this thread, with a fake desktop standing in for win32gui/win32api and one
+Elite window to honk into.
+
+  --speed 0   unlimited (default): a virtual clock (ManualScheduler) jumps
+              from one journal timestamp to the next, so the run is
+              deterministic and as fast as the CPU allows
+  --speed 1   real time; --speed 10 is ten times faster, with the honk
+              delay, timeout and focus settle scaled by the same factor
+
+Reports journal lines/s through the watcher, jump->key down and scan->key up
+latency percentiles, honks and timeouts, and the peak thread count.
+
+    python benchmarks/replay_journal.py ~/Saved\\ Games/Frontier\\ Developments/Elite\\ Dangerous/Journal.*.log
+    python benchmarks/replay_journal.py --synthetic 200 --speed 50 --json
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from watchdog.events import FileCreatedEvent, FileModifiedEvent  # noqa: E402
+
+from autohonk.autohonk import AutoHonk, JournalWatcher, open_wing_journal  # noqa: E402
+from bench_journal import noise_line  # noqa: E402
+from edwing.focus import FocusLock  # noqa: E402
+from edwing.journal import parse_timestamp  # noqa: E402
+from edwing.scheduler import ManualScheduler, Scheduler  # noqa: E402
+from edwing.stats import format_summary  # noqa: E402
+from edwing.windows import FakeWindowBackend, WindowIndex  # noqa: E402
+
+WM_KEYDOWN = 0x0100
+FIRE_VK = ord("1")
+
+_TIMESTAMP_RE = re.compile(rb'"timestamp"\s*:\s*"([^"]+)"')
+
+
+def read_journal(path):
+    """[(epoch seconds, raw line)] for one journal; untimed lines take the previous timestamp."""
+    lines = []
+    last = None
+    with open(path, "rb") as f:
+        for raw in f:
+            match = _TIMESTAMP_RE.search(raw, 0, 64)
+            ts = parse_timestamp(match.group(1).decode()) if match else None
+            last = ts if ts is not None else last
+            if last is not None:
+                lines.append((last, raw))
+    return lines
+
+
+def synthetic_journal(jumps, delay, settle, seed=1):
+    """One session of jumps with StartJump, FSDJump, busy noise and a scan a few seconds after the honk."""
+    rng = random.Random(seed)
+    t = datetime(2024, 5, 1, 12, 0, 0, tzinfo=timezone.utc)
+    lines = []
+
+    def add(entry, advance=0.0):
+        nonlocal t
+        entry = {"timestamp": t.strftime("%Y-%m-%dT%H:%M:%SZ"), **entry}
+        lines.append((t.timestamp(), (json.dumps(entry) + "\r\n").encode()))
+        t += timedelta(seconds=advance)
+
+    add({"event": "Fileheader", "part": 1})
+    add({"event": "LoadGame", "Commander": "Replay"})
+    add({"event": "Location", "StarSystem": "Sol"}, 5)
+    for i in range(jumps):
+        add({"event": "StartJump", "JumpType": "Hyperspace", "StarSystem": f"Replay {i}"}, rng.randint(5, 8))
+        add({"event": "FSDJump", "StarSystem": f"Replay {i}", "SystemAddress": i, "JumpDist": 20.5})
+        for _ in range(rng.randint(2, 6)):
+            ts = t.strftime("%Y-%m-%dT%H:%M:%SZ")
+            lines.append((t.timestamp(), (noise_line(ts, rng) + "\r\n").encode()))
+        t += timedelta(seconds=delay + settle + rng.uniform(4.5, 5.5))
+        add({"event": "FSSDiscoveryScan", "Progress": 0.2, "BodyCount": rng.randint(1, 40)}, rng.randint(8, 20))
+    return [lines]
+
+
+def replay(journals, speed, delay, max_duration, settle):
+    virtual = speed <= 0
+    scale = 1.0 if virtual else 1.0 / speed
+    scheduler = ManualScheduler() if virtual else Scheduler("replay")
+    backend = FakeWindowBackend(clock=scheduler.now)
+    backend.add_elite_window("Elite - Dangerous (CLIENT)")
+    index = WindowIndex(backend, "Elite - Dangerous", "elitedangerous64")
+    index.start_watching()
+    honker = AutoHonk(sandbox=None, window_filter=None, delay=delay * scale, max_duration=max_duration * scale,
+                      manual_vk=FIRE_VK, window_index=index, scheduler=scheduler,
+                      focus_lock=FocusLock())  # as the CLI always runs
+    honker.focus_settle = settle * scale
+
+    lines_fed = 0
+    in_watcher = 0.0
+    threads = threading.active_count()
+    wall_start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = open_wing_journal([honker], [Path(tmp)])
+        watcher = JournalWatcher(journal)
+        t0 = journals[0][0][0] if journals and journals[0] else 0.0
+        for n, lines in enumerate(journals):
+            path = Path(tmp) / f"Journal.2024-05-01T{n:06d}.01.log"
+            with open(path, "ab") as out:
+                watcher.on_created(FileCreatedEvent(str(path)))
+                journal.poll()
+                for ts, batch in groupby(lines, key=lambda line: line[0]):
+                    at = (ts - t0) * scale
+                    if virtual:
+                        scheduler.advance_to(at)
+                    else:
+                        time.sleep(max(0.0, wall_start + at - time.perf_counter()))
+                    batch = [raw for _, raw in batch]
+                    out.write(b"".join(batch))
+                    out.flush()
+                    started = time.perf_counter()
+                    watcher.on_modified(FileModifiedEvent(str(path)))
+                    journal.poll()
+                    in_watcher += time.perf_counter() - started
+                    lines_fed += len(batch)
+                    threads = max(threads, threading.active_count())
+        # Let the last honk finish
+        tail = (delay + settle + max_duration + 1.0) * scale
+        if virtual:
+            scheduler.advance_to(scheduler.now() + tail)
+        else:
+            time.sleep(tail)
+        journal.stop()
+    wall = time.perf_counter() - wall_start
+    honker.running = False
+    honker.stop_honking()
+    scheduler.stop()
+
+    honks = sum(1 for m in backend.messages if m[2] == WM_KEYDOWN and m[3] == FIRE_VK)
+    scanned = len(honker.latency["scan_to_keyup"])
+    return {
+        "mode": "virtual" if virtual else f"x{speed:g}",
+        "lines": lines_fed,
+        "lines_per_s": lines_fed / in_watcher if in_watcher else 0.0,
+        "wall_seconds": wall,
+        "honks": honks,
+        "scanned": scanned,
+        "timeouts": honks - scanned,
+        "jump_to_keydown": honker.latency["jump_to_keydown"].summary(),
+        "scan_to_keyup": honker.latency["scan_to_keyup"].summary(),
+        "max_threads": threads,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("journals", nargs="*", type=Path, help="Journal.*.log files, replayed in name order")
+    p.add_argument("--synthetic", type=int, metavar="JUMPS", help="Replay a generated session with this many jumps")
+    p.add_argument("--speed", type=float, default=0.0, help="0 = unlimited on a virtual clock (default), 1 = real time")
+    p.add_argument("--delay", type=float, default=2.0, help="AutoHonk --delay (default: 2)")
+    p.add_argument("--max-duration", type=float, default=7.0, help="AutoHonk --max-duration (default: 7)")
+    p.add_argument("--settle", type=float, default=AutoHonk.focus_settle,
+                   help=f"Focus settle (default: {AutoHonk.focus_settle})")
+    p.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = p.parse_args()
+
+    if args.synthetic:
+        journals = synthetic_journal(args.synthetic, args.delay, args.settle)
+    elif args.journals:
+        journals = [read_journal(path) for path in sorted(args.journals, key=lambda p: p.name)]
+    else:
+        p.error("give journal files or --synthetic JUMPS")
+
+    results = replay(journals, args.speed, args.delay, args.max_duration, args.settle)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{results['mode']}: {results['lines']} lines in {results['wall_seconds']:.2f}s wall, "
+          f"{results['lines_per_s']:,.0f} lines/s through the watcher")
+    print(f"honks {results['honks']}, scanned {results['scanned']}, timed out {results['timeouts']}")
+    print(format_summary("jump->keydown (beyond due time)", results["jump_to_keydown"]))
+    print(format_summary("scan->keyup", results["scan_to_keyup"]))
+    print(f"peak threads: {results['max_threads']}")
+
+
+if __name__ == "__main__":
+    main()
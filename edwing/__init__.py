@@ -0,0 +1,6 @@
+"""
+Shared helpers for the EDWing Python tools (input_broadcast.py, autohonk).
+
+Win32 access lives behind small backend classes so the same code can be
+driven by in-memory fakes for benchmarking off Windows.
+"""
@@ -0,0 +1,209 @@
+"""
+Elite key bindings index.
+
+A .binds file is stream-parsed once with iterparse into action -> (VK,
+modifier VKs) for every action that has a keyboard binding (Primary first,
+then Secondary). The result is stored in a small JSON cache keyed by file
+path, mtime and size, so later starts skip XML parsing entirely until the
+bindings change. Within one process, indexes are memoised as well, so a
+wing sharing a bindings folder parses it at most once, and a folder's active
+file is only looked up again after RECHECK_INTERVAL seconds, so resolving
+bindings per command costs a dictionary lookup. A cache entry that does not
+have the expected shape is ignored and the .binds file parsed again.
+"""
+
+import json
+import logging
+import os
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from edwing.keyplan import key_code
+from edwing.paths import data_dir, write_json
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+_SLOTS = ("Primary", "Secondary", "Binding")
+
+RECHECK_INTERVAL = 5.0  # seconds before a folder is searched again for a newer .binds file
+
+_memo: Dict[Tuple[str, int, int], "BindingsIndex"] = {}
+_recent: Dict[Tuple[str, str], Tuple[float, Optional["BindingsIndex"]]] = {}  # (folder, cache) -> (checked, index)
+
+
+class Binding(NamedTuple):
+    vk: int
+    modifiers: Tuple[int, ...] = ()
+
+
+class BindingsIndex:
+    """Keyboard binding per Elite action name (e.g. 'PrimaryFire', 'HyperSuperCombination')."""
+
+    def __init__(self, path: Path, actions: Dict[str, Binding]):
+        self.path = Path(path)
+        self.actions = actions
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def __contains__(self, action: str) -> bool:
+        return action in self.actions
+
+    def lookup(self, action: str) -> Optional[Binding]:
+        return self.actions.get(action)
+
+    @classmethod
+    def parse(cls, path: Path) -> "BindingsIndex":
+        """Stream-parse a .binds file."""
+        actions: Dict[str, Binding] = {}
+        depth = 0
+        action = None
+        current = None  # [vk, [modifier vks]] for the slot being read
+        root = None
+
+        for event, elem in ET.iterparse(str(path), events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if depth == 1:
+                    root = elem
+                elif depth == 2:
+                    action = elem.tag
+                elif depth == 3 and elem.tag in _SLOTS and elem.get("Device") == "Keyboard":
+                    vk = key_code(elem.get("Key", ""))
+                    current = [vk, []] if vk is not None else None
+                elif depth == 4 and current is not None and elem.tag == "Modifier":
+                    mod = key_code(elem.get("Key", "")) if elem.get("Device") == "Keyboard" else None
+                    if mod is None:
+                        current = None  # modifier we cannot press; binding unusable
+                    else:
+                        current[1].append(mod)
+                continue
+
+            if depth == 3 and current is not None:
+                actions.setdefault(action, Binding(current[0], tuple(current[1])))
+                current = None
+            elif depth == 2 and root is not None:
+                root.clear()  # keep memory flat on large files
+            depth -= 1
+
+        return cls(path, actions)
+
+    def to_cache(self) -> Dict[str, list]:
+        return {name: [b.vk, list(b.modifiers)] for name, b in self.actions.items()}
+
+    @classmethod
+    def from_cache(cls, path: Path, data: Dict[str, list]) -> "BindingsIndex":
+        """Index from to_cache() output; raises ValueError if data is not shaped like it."""
+        actions = {}
+        try:
+            for name, (vk, mods) in data.items():
+                binding = Binding(vk, tuple(mods))
+                if not all(isinstance(code, int) for code in (binding.vk,) + binding.modifiers):
+                    raise ValueError(name)
+                actions[name] = binding
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"Malformed cached bindings: {e}") from None
+        return cls(path, actions)
+
+
+def resolve_bindings_folder(sandbox: Optional[str] = None) -> Optional[Path]:
+    """Return the Elite key bindings folder."""
+    local_app_data = os.environ.get("LOCALAPPDATA", "")
+    default = Path(local_app_data) / "Frontier Developments" / "Elite Dangerous" / "Options" / "Bindings"
+
+    if not sandbox:
+        return default if default.exists() else None
+
+    username = os.environ.get("USERNAME", "")
+    candidates = [
+        Path(f"C:/Sandbox/{username}/{sandbox}/user/current/AppData/Local/Frontier Developments/Elite Dangerous/Options/Bindings"),
+        default,  # bindings are often shared, not virtualised
+    ]
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def default_cache_path() -> Path:
+    return data_dir() / "bindings-cache.json"
+
+
+def latest_binds_file(bindings_dir: Optional[Path]) -> Optional[Path]:
+    """The most recently saved .binds file, which is the active preset."""
+    if not bindings_dir or not bindings_dir.exists():
+        return None
+    binds_files = list(bindings_dir.glob("*.binds"))
+    if not binds_files:
+        return None
+    return max(binds_files, key=lambda p: p.stat().st_mtime)
+
+
+def _read_cache(cache_path: Path) -> dict:
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION and isinstance(data.get("files"), dict):
+            return data
+    except (OSError, ValueError):
+        pass
+    return {"version": CACHE_VERSION, "files": {}}
+
+
+def _write_cache(cache_path: Path, data: dict):
+    try:
+        write_json(cache_path, data)
+    except OSError:
+        logger.warning("Could not write bindings cache %s", cache_path)
+
+
+def load_bindings(bindings_dir: Optional[Path], cache_path: Optional[Path] = None) -> Optional[BindingsIndex]:
+    """Bindings index for the active .binds file, from memory, disk cache or a fresh parse.
+
+    The folder is searched at most once per RECHECK_INTERVAL; in between, the last answer is returned.
+    """
+    recent_key = (str(bindings_dir), str(cache_path))
+    now = time.monotonic()
+    recent = _recent.get(recent_key)
+    if recent is not None and now - recent[0] < RECHECK_INTERVAL:
+        return recent[1]
+    index = _load_bindings(bindings_dir, cache_path)
+    _recent[recent_key] = (now, index)
+    return index
+
+
+def _load_bindings(bindings_dir: Optional[Path], cache_path: Optional[Path]) -> Optional[BindingsIndex]:
+    binds = latest_binds_file(bindings_dir)
+    if binds is None:
+        return None
+
+    st = binds.stat()
+    key = (str(binds), st.st_mtime_ns, st.st_size)
+    if key in _memo:
+        return _memo[key]
+
+    cache_path = cache_path or default_cache_path()
+    cache = _read_cache(cache_path)
+    entry = cache["files"].get(key[0])
+    index = None
+    if isinstance(entry, dict) and entry.get("mtime_ns") == key[1] and entry.get("size") == key[2]:
+        try:
+            index = BindingsIndex.from_cache(binds, entry.get("actions"))
+            logger.debug("Bindings for %s loaded from cache", binds.name)
+        except ValueError:
+            logger.warning("Ignoring unreadable cached bindings for %s", binds.name)
+    if index is None:
+        logger.info("Reading bindings from %s", binds)
+        try:
+            index = BindingsIndex.parse(binds)
+        except (ET.ParseError, OSError):
+            logger.exception("Failed to parse bindings file")
+            return None
+        cache["files"][key[0]] = {"mtime_ns": key[1], "size": key[2], "actions": index.to_cache()}
+        _write_cache(cache_path, cache)
+
+    _memo[key] = index
+    return index
@@ -0,0 +1,77 @@
+"""
+Concurrent key broadcast.
+
+Instead of playing a command into one window after another, every window
+shares one timeline: each key goes down in all windows, is held once, and
+comes up in all windows. PostMessage only queues the message, so a single
+thread reaches N windows within microseconds and total latency is one
+window's key sequence regardless of wing size.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from edwing.keyplan import KeyPlan, plan_batches
+from edwing.timing import Timeline
+
+WM_KEYDOWN = 0x0100
+WM_KEYUP = 0x0101
+
+
+def key_lparam(down: bool, repeat: bool = False) -> int:
+    """
+    WM_KEYDOWN/WM_KEYUP lParam: repeat count 1, bit 30 set when the key was
+    already down (auto-repeat and key up), bit 31 set for key up.
+    """
+    if not down:
+        return 0xC0000001
+    return 0x40000001 if repeat else 0x00000001
+
+
+def play_plan(hwnds: Sequence[int], plan: KeyPlan, delivery) -> Dict[int, Optional[Exception]]:
+    """
+    Play a key plan into every window on a shared timeline through a
+    focus-free edwing.delivery strategy (PostMessageDelivery).
+
+    Returns hwnd -> None on success, or the exception that stopped delivery to
+    that window. A failed window is dropped from the rest of the plan, the
+    same way send_keys_to_window aborts on the first error.
+    """
+    errors: Dict[int, Optional[Exception]] = {hwnd: None for hwnd in hwnds}
+    live: List[int] = list(hwnds)
+    timeline = Timeline()
+
+    for edges, delay in plan_batches(plan):
+        if not live:
+            break
+        failed = False
+        for hwnd in live:
+            try:
+                delivery.send(hwnd, edges)
+            except Exception as e:
+                errors[hwnd] = e
+                failed = True
+        if failed:
+            live = [hwnd for hwnd in live if errors[hwnd] is None]
+        timeline.advance(delay)
+
+    return errors
+
+
+def key_skew(messages: List[Tuple[float, int, int, int, int]], msg: int = WM_KEYDOWN) -> List[float]:
+    """
+    Seconds between the first and last window receiving each key edge.
+
+    Takes FakeWindowBackend.messages; the n-th `msg` to each window is
+    treated as the same key.
+    """
+    per_window: Dict[int, List[float]] = {}
+    for stamp, hwnd, m, _, _ in messages:
+        if m == msg:
+            per_window.setdefault(hwnd, []).append(stamp)
+    if not per_window:
+        return []
+    keys = min(len(stamps) for stamps in per_window.values())
+    return [
+        max(s[i] for s in per_window.values()) - min(s[i] for s in per_window.values())
+        for i in range(keys)
+    ]
@@ -0,0 +1,58 @@
+"""
+Window title -> commander matching.
+
+CommanderMatcher compiles every configured commander name into one
+case-insensitive regex, so a title is classified in a single scan however
+big the wing is, instead of lowercasing and searching for each name in turn.
+Longer names are tried first at any position, so "Cmdr10" is never taken for
+"Cmdr1". A title naming no commander belongs to the primary commander.
+
+Named groups ({"scouts": ["Bistronaut", "Tristronaut"]}) select a subset of
+the wing for a broadcast; the primary commander can be listed by name too.
+"""
+
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+class CommanderMatcher:
+    """Precompiled commander lookup plus named commander groups."""
+
+    def __init__(self, commanders: Iterable[str], primary: Optional[str] = None,
+                 groups: Optional[Mapping[str, Iterable[str]]] = None):
+        self.commanders = [c for c in commanders if c]
+        self.primary = primary
+        # Config order, primary last: the order windows are reported and keys sent in
+        self.order: List[str] = self.commanders + ([primary] if primary else [])
+
+        self._by_name: Dict[str, str] = {}
+        for commander in self.commanders:
+            self._by_name.setdefault(commander.lower(), commander)
+        names = sorted(self._by_name, key=len, reverse=True)
+        self._pattern = re.compile("|".join(map(re.escape, names)), re.IGNORECASE) if names else None
+
+        self.groups: Dict[str, Tuple[str, ...]] = {}
+        known = set(self.order)
+        for name, members in (groups or {}).items():
+            members = set(members)
+            unknown = members - known
+            if unknown:
+                raise ValueError(f"Commander group {name!r} names unknown commanders: {', '.join(sorted(unknown))}")
+            self.groups[name] = tuple(c for c in self.order if c in members)
+
+    def match(self, title: str) -> Optional[str]:
+        """Commander whose name appears in title, else the primary commander."""
+        if self._pattern is not None:
+            found = self._pattern.search(title)
+            if found:
+                return self._by_name[found.group().lower()]
+        return self.primary
+
+    def members(self, group: Optional[str] = None) -> Tuple[str, ...]:
+        """Commanders in group (every commander for None), in config order."""
+        if group is None:
+            return tuple(self.order)
+        try:
+            return self.groups[group]
+        except KeyError:
+            raise KeyError(f"Unknown commander group {group!r}") from None
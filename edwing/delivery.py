@@ -0,0 +1,121 @@
+"""
+Key delivery strategies.
+
+Every sender (relay commands, echo, AutoHonk) hands key edges to a Delivery
+instead of calling Win32 directly:
+
+  post       PostMessage WM_KEYDOWN/WM_KEYUP into one window's queue, one call
+             per edge; works without focus, so many windows can be fed at once
+  sendinput  SendInput with all simultaneous edges (a chord, a modifier and
+             its key) in one call, injected atomically; lands in the
+             foreground window
+  keybd      keybd_event, one call per edge; lands in the foreground window
+
+A KeyPlan is played as batches: consecutive events with no wait between
+them go out in one send(). Each strategy counts its calls, edges, errors
+and time spent inside Win32, and feeds a send_<name> histogram in the
+metrics registry.
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+from edwing.broadcast import WM_KEYDOWN, WM_KEYUP, key_lparam
+from edwing.keyplan import KeyEdge, KeyPlan, plan_batches
+from edwing.metrics import REGISTRY, Metrics
+from edwing.timing import Timeline
+
+
+class Delivery:
+    """Base strategy: timing counters around _send()."""
+
+    name = ""
+    needs_focus = False  # input goes to the foreground window, not to hwnd
+
+    def __init__(self, backend, metrics: Metrics = REGISTRY):
+        self.backend = backend
+        self.calls = 0    # Win32 calls made
+        self.edges = 0    # key edges delivered
+        self.errors = 0
+        self.seconds = 0.0  # time spent inside those calls
+        self._histogram = metrics.histogram(f"send_{self.name}")
+        self._lock = threading.Lock()
+
+    def send(self, hwnd: Optional[int], edges: Sequence[KeyEdge], repeat: bool = False):
+        """Deliver edges at once. repeat marks auto-repeat key downs of a held key."""
+        start = time.perf_counter()
+        try:
+            calls = self._send(hwnd, edges, repeat)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        elapsed = time.perf_counter() - start
+        self._histogram.observe(elapsed)
+        with self._lock:
+            self.calls += calls
+            self.edges += len(edges)
+            self.seconds += elapsed
+
+    def _send(self, hwnd: Optional[int], edges: Sequence[KeyEdge], repeat: bool) -> int:
+        """Deliver edges; returns the number of Win32 calls it took."""
+        raise NotImplementedError
+
+    def play(self, hwnd: Optional[int], plan: KeyPlan, timeline: Optional[Timeline] = None):
+        """Walk a whole plan into one window on its own timeline."""
+        timeline = timeline or Timeline()
+        for edges, delay in plan_batches(plan):
+            self.send(hwnd, edges)
+            timeline.advance(delay)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "edges": self.edges,
+                "errors": self.errors,
+                "seconds": self.seconds,
+                "us_per_edge": self.seconds / self.edges * 1e6 if self.edges else 0.0,
+            }
+
+
+class PostMessageDelivery(Delivery):
+    name = "post"
+
+    def _send(self, hwnd, edges, repeat):
+        post = self.backend.post_message
+        for vk, down in edges:
+            post(hwnd, WM_KEYDOWN if down else WM_KEYUP, vk, key_lparam(down, repeat and down))
+        return len(edges)
+
+
+class SendInputDelivery(Delivery):
+    name = "sendinput"
+    needs_focus = True
+
+    def _send(self, hwnd, edges, repeat):
+        self.backend.send_input(edges)
+        return 1
+
+
+class KeybdEventDelivery(Delivery):
+    name = "keybd"
+    needs_focus = True
+
+    def _send(self, hwnd, edges, repeat):
+        key_event = self.backend.key_event
+        for vk, down in edges:
+            key_event(vk, up=not down)
+        return len(edges)
+
+
+STRATEGIES = {cls.name: cls for cls in (PostMessageDelivery, SendInputDelivery, KeybdEventDelivery)}
+
+
+def make_delivery(name: str, backend, metrics: Metrics = REGISTRY) -> Delivery:
+    """Delivery strategy by name ("post", "sendinput" or "keybd")."""
+    try:
+        return STRATEGIES[name](backend, metrics)
+    except KeyError:
+        raise ValueError(f"Unknown delivery strategy {name!r} (choose from {', '.join(STRATEGIES)})") from None
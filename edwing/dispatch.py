@@ -0,0 +1,52 @@
+"""
+Instant dispatch for known commands.
+
+CommandTrie holds the configured command set. After every keypress the relay
+asks whether the buffer is a complete command that nothing longer could still
+become; only then is it sent immediately. Prefixes and ambiguous matches keep
+waiting for the typing timeout.
+"""
+
+from typing import Dict, Iterable
+
+# CommandTrie.match results
+NO_MATCH = "none"        # not a prefix of any known command
+PREFIX = "prefix"        # prefix of one or more commands, not complete yet
+AMBIGUOUS = "ambiguous"  # complete command that is also a prefix of a longer one
+COMPLETE = "complete"    # complete command with no longer continuation
+
+_END = None  # node key marking the end of a command
+
+
+class CommandTrie:
+    """Prefix trie over a set of command strings."""
+
+    def __init__(self, commands: Iterable[str] = ()):
+        self._root: Dict = {}
+        self._size = 0
+        for command in commands:
+            self.add(command)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, command: str):
+        if not command:
+            return
+        node = self._root
+        for char in command:
+            node = node.setdefault(char, {})
+        if _END not in node:
+            node[_END] = True
+            self._size += 1
+
+    def match(self, text: str) -> str:
+        """Classify text against the command set."""
+        node = self._root
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                return NO_MATCH
+        if _END not in node:
+            return PREFIX if node else NO_MATCH
+        return AMBIGUOUS if len(node) > 1 else COMPLETE
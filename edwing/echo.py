@@ -0,0 +1,111 @@
+"""
+Streaming "echo" broadcast.
+
+Every captured key is handed straight to one worker per window, each with a
+small bounded queue. Workers press keys independently, so typing continues
+while earlier keys are still being held, and a window that falls behind
+fills its queue and makes send() block (backpressure) instead of letting an
+unbounded backlog build up.
+
+Keys go out through a focus-free edwing.delivery strategy. Latency from
+keystroke capture to the first key down is recorded for every key and
+window.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from edwing.keyplan import KeyPlan, plan_batches
+from edwing.timing import Timeline
+from edwing.stats import LatencySamples
+
+logger = logging.getLogger(__name__)
+
+
+class _WindowWorker:
+    def __init__(self, hwnd: int, commander: str, echo: "EchoBroadcaster"):
+        self.hwnd = hwnd
+        self.commander = commander
+        self.error: Optional[Exception] = None
+        self.sent = 0
+        self.queue: "queue.Queue[Optional[Tuple[KeyPlan, float]]]" = queue.Queue(maxsize=echo.queue_size)
+        self._echo = echo
+        self.thread = threading.Thread(target=self._run, name=f"echo-{commander}", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        echo = self._echo
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            if self.error is not None:
+                continue  # keep draining so send() never blocks on a dead window
+            plan, captured_at = item
+            try:
+                timeline = Timeline()
+                for i, (edges, delay) in enumerate(plan_batches(plan)):
+                    echo.delivery.send(self.hwnd, edges)
+                    if i == 0:
+                        echo.latency.add(time.perf_counter() - captured_at)
+                    timeline.advance(delay)
+                self.sent += plan.keys
+            except Exception as e:
+                self.error = e
+                logger.error("Echo to %s stopped: %s", self.commander, e)
+                if echo.on_error:
+                    echo.on_error(self.commander, e)
+
+
+class EchoBroadcaster:
+    """Forwards single keys to every target window as they are typed."""
+
+    def __init__(self, delivery, queue_size: int = 8,
+                 on_error: Optional[Callable[[str, Exception], None]] = None):
+        self.delivery = delivery  # e.g. PostMessageDelivery; must not need focus
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self.latency = LatencySamples()
+        # Total seconds send() spent blocked on full queues
+        self.backpressure_wait = 0.0
+        self._workers: Dict[int, _WindowWorker] = {}
+
+    def set_targets(self, windows: Iterable[Tuple[int, str, str]]):
+        """Start workers for new (hwnd, title, commander) targets and retire vanished ones."""
+        wanted = {hwnd: commander for hwnd, _, commander in windows}
+        for hwnd in list(self._workers):
+            if hwnd not in wanted:
+                self._workers.pop(hwnd).queue.put(None)
+        for hwnd, commander in wanted.items():
+            if hwnd not in self._workers:
+                self._workers[hwnd] = _WindowWorker(hwnd, commander, self)
+
+    def send(self, plan: KeyPlan, captured_at: Optional[float] = None):
+        """Queue a (usually single-key) plan for every window. Blocks while any window's queue is full."""
+        if captured_at is None:
+            captured_at = time.perf_counter()
+        item = (plan, captured_at)
+        for worker in list(self._workers.values()):
+            try:
+                worker.queue.put_nowait(item)
+            except queue.Full:
+                start = time.perf_counter()
+                worker.queue.put(item)
+                self.backpressure_wait += time.perf_counter() - start
+
+    def status(self) -> List[Tuple[str, int, Optional[Exception]]]:
+        """(commander, keys sent, error) per window."""
+        return [(w.commander, w.sent, w.error) for w in self._workers.values()]
+
+    def close(self, timeout: float = 2.0):
+        """Let queued keys finish, then stop every worker."""
+        workers = list(self._workers.values())
+        self._workers.clear()
+        for worker in workers:
+            worker.queue.put(None)
+        deadline = time.monotonic() + timeout
+        for worker in workers:
+            worker.thread.join(max(0.0, deadline - time.monotonic()))
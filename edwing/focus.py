@@ -0,0 +1,112 @@
+"""
+Keyboard focus arbitration.
+
+keybd_event input lands in whichever window has focus, so when a wing jumps
+together only one honk at a time can own focus and the keyboard; otherwise
+clients steal focus from each other and a held key is released in, or sent
+to, the wrong one. A focus lock hands that ownership out one honk at a time:
+try_acquire() never blocks, so a caller that loses just retries on its own
+timer, and each honk costs exactly one focus switch.
+
+- FocusLock: threads of one process (a --wing supervisor, benchmarks)
+- NamedFocusLock: every process on the machine, through a Win32 named mutex;
+  falls back to FocusLock behaviour off Windows
+"""
+
+import logging
+import sys
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FocusLock:
+    """Non-blocking, owner-checked focus lock for one process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.owner: Optional[object] = None
+        self.acquisitions = 0
+        self.refusals = 0
+
+    def try_acquire(self, owner: object) -> bool:
+        """Take the lock for owner if it is free (or already owner's)."""
+        if self.owner is owner:
+            return True
+        if not self._lock.acquire(blocking=False):
+            self.refusals += 1
+            return False
+        self.owner = owner
+        self.acquisitions += 1
+        return True
+
+    def release(self, owner: object):
+        """Give the lock back; a no-op unless owner holds it."""
+        if self.owner is not owner:
+            return
+        self.owner = None
+        self._lock.release()
+
+
+class NamedFocusLock(FocusLock):
+    """
+    Focus lock shared by every EDWing process on the machine.
+
+    Win32 mutexes belong to the thread that acquired them, so try_acquire and
+    release must be called from the same thread (AutoHonk uses its scheduler
+    thread for both). A mutex left behind by a crashed process is reported as
+    abandoned and taken over.
+    """
+
+    NAME = "Local\\EDWingFocus"
+    WAIT_OBJECT_0 = 0x00000000
+    WAIT_ABANDONED = 0x00000080
+
+    def __init__(self, name: str = NAME):
+        super().__init__()
+        self._handle = None
+        self._kernel32 = None
+        if sys.platform != "win32":
+            return
+        try:
+            import ctypes
+            from ctypes import wintypes
+            kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+            kernel32.CreateMutexW.restype = wintypes.HANDLE
+            kernel32.CreateMutexW.argtypes = [ctypes.c_void_p, wintypes.BOOL, wintypes.LPCWSTR]
+            kernel32.WaitForSingleObject.restype = wintypes.DWORD
+            kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+            kernel32.ReleaseMutex.argtypes = [wintypes.HANDLE]
+            handle = kernel32.CreateMutexW(None, False, name)
+        except Exception:
+            logger.exception("Could not create focus mutex; focus is only arbitrated within this process")
+            return
+        if handle:
+            self._kernel32 = kernel32
+            self._handle = handle
+
+    def try_acquire(self, owner: object) -> bool:
+        if self.owner is owner:
+            return True
+        # The in-process lock comes first: the mutex would let the same thread in twice
+        if not super().try_acquire(owner):
+            return False
+        if self._handle is None:
+            return True
+        result = self._kernel32.WaitForSingleObject(self._handle, 0)
+        if result == self.WAIT_ABANDONED:
+            logger.warning("Focus mutex was abandoned by another process; taking it over")
+        if result in (self.WAIT_OBJECT_0, self.WAIT_ABANDONED):
+            return True
+        super().release(owner)
+        self.acquisitions -= 1
+        self.refusals += 1
+        return False
+
+    def release(self, owner: object):
+        if self.owner is not owner:
+            return
+        if self._handle is not None:
+            self._kernel32.ReleaseMutex(self._handle)
+        super().release(owner)
@@ -0,0 +1,207 @@
+"""
+Elite journal tailing.
+
+JournalTail keeps one binary handle open per journal, reads whatever has
+been appended in a single bulk read and holds back an incomplete trailing
+line until the rest arrives. The "event" name is pulled from the start of
+each line with a byte regex, so lines for events nobody asked for are
+dropped before json.loads; matching lines become small JournalEvent records.
+
+For startup, latest_journal picks the newest journal from filenames alone
+(no per-file stat), and scan_backwards reads it from the end in chunks so
+the current state can be recovered without touching the rest of the file.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from edwing.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# "event" is the second key on every journal line, right after "timestamp"
+_EVENT_RE = re.compile(rb'"event"\s*:\s*"([^"]*)"')
+_EVENT_SEARCH_LIMIT = 256
+
+# Journal.240501120000.01.log (before Odyssey) and Journal.2024-05-01T120000.01.log
+_JOURNAL_NAME_RE = re.compile(r"^Journal\.(?:(\d{12})|(\d{4})-(\d{2})-(\d{2})T(\d{6}))\.(\d+)\.log$")
+
+SCAN_CHUNK = 64 * 1024
+
+
+def event_name(line: bytes) -> Optional[bytes]:
+    """Event name of a raw journal line without decoding the JSON."""
+    match = _EVENT_RE.search(line, 0, _EVENT_SEARCH_LIMIT) or _EVENT_RE.search(line)
+    return match.group(1) if match else None
+
+
+def journal_sort_key(name: str) -> Optional[Tuple[str, int]]:
+    """('YYYYMMDDHHMMSS', part) for a journal filename, None if it is not one."""
+    match = _JOURNAL_NAME_RE.match(name)
+    if not match:
+        return None
+    short, year, month, day, clock, part = match.groups()
+    stamp = "20" + short if short else year + month + day + clock
+    return stamp, int(part)
+
+
+def latest_journal(folder: Path) -> Optional[Path]:
+    """Newest journal in folder, judged by the timestamp in its name."""
+    best = None
+    best_key = None
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                key = journal_sort_key(entry.name)
+                if key is not None and (best_key is None or key > best_key):
+                    best, best_key = entry.name, key
+    except OSError:
+        logger.exception("Could not list journal folder %s", folder)
+        return None
+    return Path(folder) / best if best else None
+
+
+def parse_timestamp(timestamp: Optional[str]) -> Optional[float]:
+    """Epoch seconds for a journal timestamp ('2024-05-01T12:00:00Z')."""
+    if not timestamp:
+        return None
+    try:
+        return datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+
+class JournalEvent:
+    """The handful of journal fields the tools act on. Supports dict-style get()."""
+
+    __slots__ = ("event", "timestamp", "star_system", "system_address", "body_count", "jump_type")
+
+    # journal key -> attribute
+    FIELDS = {
+        "event": "event",
+        "timestamp": "timestamp",
+        "StarSystem": "star_system",
+        "SystemAddress": "system_address",
+        "BodyCount": "body_count",
+        "JumpType": "jump_type",
+    }
+
+    def __init__(self, event: str, timestamp: Optional[str] = None, star_system: Optional[str] = None,
+                 system_address: Optional[int] = None, body_count: Optional[int] = None,
+                 jump_type: Optional[str] = None):
+        self.event = event
+        self.timestamp = timestamp
+        self.star_system = star_system
+        self.system_address = system_address
+        self.body_count = body_count
+        self.jump_type = jump_type
+
+    @classmethod
+    def from_dict(cls, entry: dict) -> "JournalEvent":
+        return cls(
+            entry.get("event"),
+            entry.get("timestamp"),
+            entry.get("StarSystem"),
+            entry.get("SystemAddress"),
+            entry.get("BodyCount"),
+            entry.get("JumpType"),
+        )
+
+    def get(self, key: str, default=None):
+        attr = self.FIELDS.get(key)
+        value = getattr(self, attr) if attr else None
+        return default if value is None else value
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{a}={getattr(self, a)!r}" for a in self.__slots__ if getattr(self, a) is not None)
+        return f"JournalEvent({fields})"
+
+
+class JournalTail:
+    """Incremental reader for one journal file."""
+
+    def __init__(self, path: Path, events: Optional[Iterable[str]] = None, from_start: bool = False):
+        self.path = Path(path)
+        self.wanted = frozenset(e.encode() for e in events) if events is not None else None
+        self.lines_read = 0
+        self.lines_decoded = 0
+        self._partial = b""
+        self._file = open(self.path, "rb")
+        if not from_start:
+            self._file.seek(0, os.SEEK_END)
+
+    @property
+    def position(self) -> int:
+        """Offset of the first byte not yet turned into an event."""
+        return self._file.tell() - len(self._partial)
+
+    def read_new(self) -> List[JournalEvent]:
+        """Events from every complete line appended since the last call."""
+        if os.fstat(self._file.fileno()).st_size < self._file.tell():
+            logger.info("Journal %s was truncated; reading from the start", self.path.name)
+            self._file.seek(0)
+            self._partial = b""
+
+        with REGISTRY.span("journal_read"):
+            data = self._file.read()
+        if not data:
+            return []
+        parse_started = time.perf_counter()
+        if self._partial:
+            data = self._partial + data
+        lines = data.split(b"\n")
+        self._partial = lines.pop()
+
+        events = []
+        wanted = self.wanted
+        for line in lines:
+            if not line.strip():
+                continue
+            self.lines_read += 1
+            if wanted is not None and event_name(line) not in wanted:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            self.lines_decoded += 1
+            events.append(JournalEvent.from_dict(entry))
+        REGISTRY.observe("journal_parse", time.perf_counter() - parse_started)
+        return events
+
+    def close(self):
+        self._file.close()
+
+
+def scan_backwards(path: Path, events: Optional[Iterable[str]] = None, end: Optional[int] = None,
+                   chunk_size: int = SCAN_CHUNK) -> Iterator[JournalEvent]:
+    """Events from path, newest first, reading chunk_size bytes at a time from end (default EOF).
+
+    Stop iterating as soon as you have what you need; only the chunks consumed are read.
+    """
+    wanted = frozenset(e.encode() for e in events) if events is not None else None
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END) if end is None else end
+        tail = b""  # end of a line that began before the chunk just read
+        while pos > 0:
+            size = min(chunk_size, pos)
+            pos -= size
+            f.seek(pos)
+            lines = (f.read(size) + tail).split(b"\n")
+            tail = lines[0] if pos > 0 else b""
+            for line in reversed(lines if pos == 0 else lines[1:]):
+                if not line.strip():
+                    continue
+                if wanted is not None and event_name(line) not in wanted:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                yield JournalEvent.from_dict(entry)
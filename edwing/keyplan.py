@@ -0,0 +1,297 @@
+"""
+Keystroke plans.
+
+A command string is compiled once into an immutable KeyPlan: a flat tuple of
+(vk, down, delay) events that a sender just walks. Plans are LRU-cached by
+command string and timing, so repeated commands cost nothing to prepare.
+
+Command syntax:
+    1qq               plain characters, one tap each
+    {F1}              named key (any ELITE_KEY_MAP name, case-insensitive)
+    {Shift+F1}        chord: modifiers held around the key
+    {Ctrl+Alt+x}      several modifiers
+    {Numpad_Add*3}    repeat count
+    {@LandingGearToggle}  whatever key the action is bound to (needs a bindings index)
+    {{ }}             literal braces (Shift+[ and Shift+])
+
+VK codes are defined here rather than taken from win32con so plans can be
+built and benchmarked without pywin32.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+VK_BACK = 0x08
+VK_TAB = 0x09
+VK_RETURN = 0x0D
+VK_SHIFT = 0x10
+VK_CONTROL = 0x11
+VK_MENU = 0x12
+VK_PAUSE = 0x13
+VK_CAPITAL = 0x14
+VK_ESCAPE = 0x1B
+VK_SPACE = 0x20
+VK_PRIOR = 0x21
+VK_NEXT = 0x22
+VK_END = 0x23
+VK_HOME = 0x24
+VK_LEFT = 0x25
+VK_UP = 0x26
+VK_RIGHT = 0x27
+VK_DOWN = 0x28
+VK_INSERT = 0x2D
+VK_DELETE = 0x2E
+VK_NUMPAD0 = 0x60
+VK_MULTIPLY = 0x6A
+VK_ADD = 0x6B
+VK_SUBTRACT = 0x6D
+VK_DECIMAL = 0x6E
+VK_DIVIDE = 0x6F
+VK_F1 = 0x70
+VK_LSHIFT = 0xA0
+VK_RSHIFT = 0xA1
+VK_LCONTROL = 0xA2
+VK_RCONTROL = 0xA3
+VK_LMENU = 0xA4
+VK_RMENU = 0xA5
+
+# Key name mapping from Elite Dangerous bindings XML (without the "Key_" prefix) to VK codes
+ELITE_KEY_MAP = {
+    "Numpad_Add": VK_ADD,
+    "Numpad_Subtract": VK_SUBTRACT,
+    "Numpad_Multiply": VK_MULTIPLY,
+    "Numpad_Divide": VK_DIVIDE,
+    "Numpad_Decimal": VK_DECIMAL,
+    "Numpad_Enter": VK_RETURN,
+    **{f"Numpad_{n}": VK_NUMPAD0 + n for n in range(10)},
+    "Space": VK_SPACE,
+    "Enter": VK_RETURN,
+    "Tab": VK_TAB,
+    "Backspace": VK_BACK,
+    "Escape": VK_ESCAPE,
+    "CapsLock": VK_CAPITAL,
+    "Pause": VK_PAUSE,
+    "Insert": VK_INSERT,
+    "Delete": VK_DELETE,
+    "Home": VK_HOME,
+    "End": VK_END,
+    "PageUp": VK_PRIOR,
+    "PageDown": VK_NEXT,
+    "UpArrow": VK_UP,
+    "DownArrow": VK_DOWN,
+    "LeftArrow": VK_LEFT,
+    "RightArrow": VK_RIGHT,
+    "LeftShift": VK_LSHIFT,
+    "RightShift": VK_RSHIFT,
+    "LeftControl": VK_LCONTROL,
+    "RightControl": VK_RCONTROL,
+    "LeftAlt": VK_LMENU,
+    "RightAlt": VK_RMENU,
+    "Minus": 0xBD,
+    "Equals": 0xBB,
+    "LeftBracket": 0xDB,
+    "RightBracket": 0xDD,
+    "SemiColon": 0xBA,
+    "Apostrophe": 0xDE,
+    "Comma": 0xBC,
+    "Period": 0xBE,
+    "Slash": 0xBF,
+    "BackSlash": 0xDC,
+    "Grave": 0xC0,
+    **{f"F{n}": VK_F1 + n - 1 for n in range(1, 13)},
+}
+
+# Plain characters that do not map to their own ordinal
+CHAR_KEYS = {
+    " ": VK_SPACE,
+    "\n": VK_RETURN,
+    "\r": VK_RETURN,
+    "\t": VK_TAB,
+    "\b": VK_BACK,
+    ";": 0xBA,
+    "=": 0xBB,
+    ",": 0xBC,
+    "-": 0xBD,
+    ".": 0xBE,
+    "/": 0xBF,
+    "`": 0xC0,
+    "[": 0xDB,
+    "\\": 0xDC,
+    "]": 0xDD,
+    "'": 0xDE,
+}
+
+# Characters typed with Shift held (US layout), as the {{ and }} escapes need
+SHIFTED_CHAR_KEYS = {
+    "{": 0xDB,
+    "}": 0xDD,
+}
+
+MODIFIER_KEYS = {
+    "shift": VK_SHIFT,
+    "ctrl": VK_CONTROL,
+    "control": VK_CONTROL,
+    "alt": VK_MENU,
+    "leftshift": VK_LSHIFT,
+    "rightshift": VK_RSHIFT,
+    "leftcontrol": VK_LCONTROL,
+    "rightcontrol": VK_RCONTROL,
+    "leftalt": VK_LMENU,
+    "rightalt": VK_RMENU,
+}
+
+_NAMED_KEYS: Dict[str, int] = {name.lower(): vk for name, vk in ELITE_KEY_MAP.items()}
+_NAMED_KEYS.update({"return": VK_RETURN, "esc": VK_ESCAPE, "up": VK_UP, "down": VK_DOWN,
+                    "left": VK_LEFT, "right": VK_RIGHT, "pgup": VK_PRIOR, "pgdn": VK_NEXT})
+_NAMED_KEYS.update(MODIFIER_KEYS)
+
+
+def char_key_code(char: str) -> Optional[int]:
+    """VK code for a single typed character."""
+    if char in CHAR_KEYS:
+        return CHAR_KEYS[char]
+    if len(char) == 1 and char.isascii() and char.isalnum():
+        return ord(char.upper())
+    return None
+
+
+def key_code(name: str) -> Optional[int]:
+    """VK code for a key name ('F1', 'Key_Numpad_Add', 'space', 'x')."""
+    if name.startswith("Key_"):
+        name = name[4:]
+    if len(name) == 1:
+        return char_key_code(name)
+    return _NAMED_KEYS.get(name.replace(" ", "_").lower())
+
+
+class KeyEvent(NamedTuple):
+    vk: int
+    down: bool
+    delay: float  # seconds to wait after this event
+
+
+class KeyPlan(NamedTuple):
+    command: str
+    events: Tuple[KeyEvent, ...]
+    keys: int                  # number of key taps (chords count once)
+    skipped: Tuple[str, ...]   # characters or {tokens} that could not be resolved
+
+
+KeyEdge = Tuple[int, bool]  # (vk, down)
+Batch = Tuple[Tuple[KeyEdge, ...], float]  # edges sent together, seconds to wait afterwards
+
+
+@lru_cache(maxsize=256)
+def plan_batches(plan: KeyPlan) -> Tuple[Batch, ...]:
+    """The plan's events grouped into edges that go out together, each group with the wait after it."""
+    batches = []
+    edges = []
+    for vk, down, delay in plan.events:
+        edges.append((vk, down))
+        if delay:
+            batches.append((tuple(edges), delay))
+            edges = []
+    if edges:
+        batches.append((tuple(edges), 0.0))
+    return tuple(batches)
+
+
+def _parse_token(token: str, bindings=None) -> Optional[Tuple[List[int], int, int]]:
+    """'Shift+F1*3' -> ([VK_SHIFT], VK_F1, 3); '@Action' resolves through bindings."""
+    count = 1
+    if "*" in token:
+        token, _, repeat = token.rpartition("*")
+        if not repeat.strip().isdigit():
+            return None
+        count = int(repeat)
+    if token.startswith("@"):
+        binding = bindings.lookup(token[1:].strip()) if bindings is not None else None
+        if binding is None:
+            return None
+        return list(binding.modifiers), binding.vk, count
+    *mod_names, key_name = [part.strip() for part in token.split("+")]
+    modifiers = []
+    for name in mod_names:
+        vk = MODIFIER_KEYS.get(name.lower())
+        if vk is None:
+            return None
+        modifiers.append(vk)
+    vk = key_code(key_name)
+    if vk is None:
+        return None
+    return modifiers, vk, count
+
+
+def _tap(events: List[KeyEvent], vk: int, modifiers: List[int], press_duration: float, key_delay: float):
+    for mod in modifiers:
+        events.append(KeyEvent(mod, True, 0.0))
+    events.append(KeyEvent(vk, True, press_duration))
+    if modifiers:
+        events.append(KeyEvent(vk, False, 0.0))
+        for mod in reversed(modifiers[1:]):
+            events.append(KeyEvent(mod, False, 0.0))
+        events.append(KeyEvent(modifiers[0], False, key_delay))
+    else:
+        events.append(KeyEvent(vk, False, key_delay))
+
+
+@lru_cache(maxsize=256)
+def compile_plan(command: str, press_duration: float, key_delay: float, bindings=None) -> KeyPlan:
+    """Compile a command string into a KeyPlan. Cached per (command, timing, bindings).
+
+    bindings is an edwing.bindings.BindingsIndex (anything with lookup(action));
+    a new index after the .binds file changes gets fresh plans.
+    """
+    events: List[KeyEvent] = []
+    skipped: List[str] = []
+    keys = 0
+    i = 0
+    while i < len(command):
+        char = command[i]
+        if char in "{}" and command[i + 1:i + 2] == char:
+            token, i = None, i + 2
+            parsed = [VK_SHIFT], SHIFTED_CHAR_KEYS[char], 1
+        elif char == "{":
+            end = command.find("}", i)
+            if end == -1:
+                skipped.append(command[i:])
+                break
+            token, i = command[i + 1:end], end + 1
+            parsed = _parse_token(token, bindings)
+        else:
+            token, i = None, i + 1
+            vk = char_key_code(char)
+            parsed = ([], vk, 1) if vk is not None else None
+
+        if parsed is None:
+            skipped.append(f"{{{token}}}" if token is not None else char)
+            continue
+        modifiers, vk, count = parsed
+        for _ in range(count):
+            _tap(events, vk, modifiers, press_duration, key_delay)
+            keys += 1
+
+    return KeyPlan(command, tuple(events), keys, tuple(skipped))
+
+
+def plan_from_events(events: Iterable[Sequence], label: str = "") -> KeyPlan:
+    """KeyPlan from raw (key, down, delay) events; key is a VK code or a key name ('F1', 'LeftShift').
+
+    Raises ValueError for an unknown key, a negative delay or a malformed event.
+    """
+    plan_events: List[KeyEvent] = []
+    for event in events:
+        try:
+            key, down, delay = event
+            delay = float(delay)
+        except (TypeError, ValueError):
+            raise ValueError(f"Key event must be [key, down, delay], not {event!r}") from None
+        vk = key if isinstance(key, int) and not isinstance(key, bool) else key_code(str(key))
+        if vk is None or not 0 < vk < 256:
+            raise ValueError(f"Unknown key {key!r}")
+        if delay < 0:
+            raise ValueError(f"Negative delay {delay} after {key!r}")
+        plan_events.append(KeyEvent(vk, bool(down), delay))
+    modifiers = set(MODIFIER_KEYS.values())
+    keys = sum(1 for event in plan_events if event.down and event.vk not in modifiers)  # chords count once
+    return KeyPlan(label or f"<{len(plan_events)} key events>", tuple(plan_events), keys, ())
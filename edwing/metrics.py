@@ -0,0 +1,242 @@
+"""
+Always-on timing spans for the hot paths.
+
+Every stage (window discovery, key-plan build, per-window send, focus,
+journal read, parse, dispatch) is timed with perf_counter and folded into a
+fixed-bucket histogram: one bisect and a few adds under a lock, about a
+microsecond per span, so the spans stay on in normal sessions.
+
+The histograms can be exported while the tool runs:
+
+- MetricsServer: Prometheus text format at http://127.0.0.1:<port>/metrics
+- SummaryWriter: a small JSON summary (count, mean, percentiles estimated
+  from the buckets) rewritten every few seconds
+
+    with REGISTRY.span("window_discovery"):
+        windows = index.commander_windows()
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from edwing.paths import write_json
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds: 50 µs (a PostMessage) up to 10 s (a honk)
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative-friendly bucket counts plus sum, count and max, in seconds."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        i = bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def snapshot(self):
+        """(bucket counts, count, sum, max), consistent with each other."""
+        with self._lock:
+            return list(self.counts), self.count, self.sum, self.max
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (at most the largest sample)."""
+        counts, count, _, largest = self.snapshot()
+        return _quantile(self.bounds, counts, count, largest, q)
+
+
+def _quantile(bounds, counts, count, largest, q) -> float:
+    if not count:
+        return 0.0
+    rank = q * count
+    seen = 0
+    for bound, n in zip(bounds, counts):
+        seen += n
+        if seen >= rank:
+            return min(bound, largest)
+    return largest
+
+
+class _Span:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start)
+        return False
+
+
+class Metrics:
+    """Named stage histograms. Stages are created on first use."""
+
+    def __init__(self, namespace: str = "edwing", buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, stage: str) -> Histogram:
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, Histogram(self.buckets))
+        return histogram
+
+    def observe(self, stage: str, seconds: float):
+        self.histogram(stage).observe(seconds)
+
+    def span(self, stage: str) -> _Span:
+        """Context manager timing its body into stage."""
+        return _Span(self.histogram(stage))
+
+    def stages(self) -> List[str]:
+        with self._lock:
+            return sorted(self._histograms)
+
+    def render(self) -> str:
+        """All stages in the Prometheus text exposition format."""
+        name = f"{self.namespace}_stage_seconds"
+        lines = [f"# HELP {name} Time spent in each hot-path stage.", f"# TYPE {name} histogram"]
+        for stage in self.stages():
+            histogram = self._histograms[stage]
+            counts, count, total, _ = histogram.snapshot()
+            cumulative = 0
+            for bound, n in zip(histogram.bounds, counts):
+                cumulative += n
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {total!r}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """stage -> count, mean and bucket-estimated p50/p90/p99 and max, in milliseconds."""
+        result = {}
+        for stage in self.stages():
+            histogram = self._histograms[stage]
+            counts, count, total, largest = histogram.snapshot()
+            if not count:
+                continue
+            result[stage] = {
+                "count": count,
+                "mean_ms": total / count * 1000,
+                "p50_ms": _quantile(histogram.bounds, counts, count, largest, 0.50) * 1000,
+                "p90_ms": _quantile(histogram.bounds, counts, count, largest, 0.90) * 1000,
+                "p99_ms": _quantile(histogram.bounds, counts, count, largest, 0.99) * 1000,
+                "max_ms": largest * 1000,
+            }
+        return result
+
+
+# Process-wide registry the tools and edwing helpers record into
+REGISTRY = Metrics()
+
+
+class MetricsServer:
+    """Serves a registry as Prometheus text on localhost from a daemon thread."""
+
+    def __init__(self, registry: Metrics = REGISTRY, port: int = 9464, host: str = "127.0.0.1"):
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # scrapes are not worth a log line
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class SummaryWriter:
+    """Rewrites a JSON summary of a registry every interval seconds, and once more on stop."""
+
+    def __init__(self, path: Path, registry: Metrics = REGISTRY, interval: float = 60.0):
+        self.path = Path(path)
+        self.registry = registry
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self):
+        try:
+            write_json(self.path, {"written": time.time(), "stages": self.registry.summary()})
+        except OSError:
+            logger.warning("Could not write metrics summary %s", self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="metrics-summary", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.write()
+
+
+def start_exporters(port: Optional[int], summary_path: Optional[Path], interval: float,
+                    registry: Metrics = REGISTRY) -> list:
+    """Start whichever exporters are configured; returns them for stop() at shutdown."""
+    exporters = []
+    if port:
+        try:
+            server = MetricsServer(registry, port)
+        except OSError as e:
+            logger.warning("Could not serve metrics on port %d: %s", port, e)
+        else:
+            exporters.append(server)
+            logger.info("Metrics at http://127.0.0.1:%d/metrics", server.port)
+    if summary_path and interval > 0:
+        exporters.append(SummaryWriter(summary_path, registry, interval))
+    for exporter in exporters:
+        exporter.start()
+    return exporters
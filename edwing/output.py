@@ -0,0 +1,92 @@
+"""
+Console output and logging off the send path.
+
+print() and a FileHandler write synchronously, so a slow terminal or disk
+stalls whichever thread is timing keys. After configure(), echo() and every
+logging call only append to an in-memory queue; one background thread
+writes status lines to stdout and log records to the console and a
+size-bounded rotating log file, in the order they were produced.
+
+quiet drops status lines and console logging below WARNING; the log file
+still gets everything at the configured level. Until configure() is called
+(benchmarks, imports) echo() is a plain print.
+"""
+
+import logging
+import logging.handlers
+import queue
+import sys
+from pathlib import Path
+from typing import Optional
+
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+_listener: Optional["_OutputListener"] = None
+_quiet = False
+
+
+class _OutputListener(logging.handlers.QueueListener):
+    """QueueListener that also writes the plain strings echo() queues to stdout."""
+
+    def handle(self, record):
+        if isinstance(record, str):
+            try:
+                sys.stdout.write(record)
+                sys.stdout.flush()
+            except (OSError, ValueError):
+                pass  # console gone; nothing useful to do from here
+            return
+        super().handle(record)
+
+
+def echo(*args, sep: str = " ", end: str = "\n", flush: bool = False):
+    """print() replacement that never waits for the console once configure() has run."""
+    if _quiet:
+        return
+    if _listener is None:
+        print(*args, sep=sep, end=end, flush=flush)
+        return
+    _queue.put(sep.join(str(a) for a in args) + end)
+
+
+def configure(level: int = logging.INFO, fmt: str = "%(asctime)s %(levelname)s %(message)s",
+              log_file: Optional[Path] = None, quiet: bool = False,
+              max_bytes: int = LOG_MAX_BYTES, backups: int = LOG_BACKUPS):
+    """Route the root logger and echo() through the background writer. Call once, from main()."""
+    global _listener, _quiet
+    shutdown()
+    _quiet = quiet
+
+    formatter = logging.Formatter(fmt)
+    console = logging.StreamHandler()
+    console.setFormatter(formatter)
+    if quiet:
+        console.setLevel(logging.WARNING)
+    handlers = [console]
+    if log_file:
+        rotating = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+        rotating.setFormatter(formatter)
+        handlers.append(rotating)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(_queue))
+    root.setLevel(level)
+
+    _listener = _OutputListener(_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown():
+    """Write out everything queued so far and stop the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
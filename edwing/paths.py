@@ -0,0 +1,54 @@
+"""Where the EDWing tools keep their own state (caches, history)."""
+
+import contextlib
+import errno
+import json
+import os
+from pathlib import Path
+
+LOCK_ATTEMPTS = 6  # ten-second waits for a file lock (Windows) before giving up
+
+
+def data_dir() -> Path:
+    """%LOCALAPPDATA%\\EDWing on Windows, ~/.cache/edwing elsewhere."""
+    local_app_data = os.environ.get("LOCALAPPDATA")
+    return Path(local_app_data) / "EDWing" if local_app_data else Path.home() / ".cache" / "edwing"
+
+
+def write_json(path: Path, data) -> None:
+    """Replace path with data as JSON in one step, so readers never see half a file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+@contextlib.contextmanager
+def file_lock(path: Path):
+    """Hold an exclusive lock on path's .lock file, across processes (for shared state files)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            for attempt in range(LOCK_ATTEMPTS):
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError as e:
+                    # LK_LOCK gives up with EDEADLOCK after ten seconds of contention
+                    if e.errno != errno.EDEADLOCK or attempt == LOCK_ATTEMPTS - 1:
+                        raise
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
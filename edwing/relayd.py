@@ -0,0 +1,262 @@
+"""
+Local request API for a long-running command relay.
+
+`python input_broadcast.py --daemon` keeps the relay and its warm window
+index running without a console and serves requests on 127.0.0.1. At
+startup it writes its port and a random token to
+%LOCALAPPDATA%\\EDWing\\relay-daemon.json; only clients that can read that
+file can drive it. Scripts use the client CLI in this module:
+
+    python -m edwing.relayd send 1qq2 "{@LandingGearToggle}"
+    python -m edwing.relayd send --group scouts --no-wait swsw
+    Get-Content commands.txt | python -m edwing.relayd send -
+    python -m edwing.relayd windows
+    python -m edwing.relayd stats
+
+Protocol: JSON lines over TCP. Every request is an object with an "op" and
+the token, and gets exactly one reply, in request order, with the request's
+"id" copied into it. A client may write any number of requests before
+reading the replies (pipelining); the daemon reads ahead while earlier
+commands are still being typed.
+
+    {"op": "send", "command": "1qq2", "group": "scouts", "wait": true}
+    {"op": "plan", "events": [["LeftShift", true, 0], ["F1", true, 0.1], ["F1", false, 0], ["LeftShift", false, 0]]}
+    {"op": "windows", "group": null}
+    {"op": "stats"}    {"op": "ping"}    {"op": "shutdown"}
+
+Replies are {"ok": true, ...} or {"ok": false, "error": "..."}.
+"""
+
+import argparse
+import hmac
+import json
+import logging
+import os
+import queue
+import secrets
+import socket
+import socketserver
+import sys
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from edwing.paths import data_dir, write_json
+
+logger = logging.getLogger(__name__)
+
+Reply = Dict[str, object]
+Handler = Callable[[Dict[str, object]], Union[Reply, "Future[Reply]"]]
+
+
+class RelayError(RuntimeError):
+    """The daemon answered a request with ok: false."""
+
+
+def default_info_path() -> Path:
+    return data_dir() / "relay-daemon.json"
+
+
+def _error(e: Exception) -> Reply:
+    return {"ok": False, "error": str(e) or type(e).__name__}
+
+
+class RelayServer:
+    """
+    Serves a request handler on localhost, one reader and one writer thread
+    per connection.
+
+    handler(request) returns a reply, or a Future of one for requests that
+    finish later (a command waiting its turn in the broadcast queue). The
+    reader keeps accepting requests while the writer waits on earlier
+    futures, so replies leave in request order without holding up the
+    requests behind them.
+    """
+
+    def __init__(self, handler: Handler, port: int = 0, host: str = "127.0.0.1",
+                 info_path: Optional[Path] = None):
+        self.token = secrets.token_hex(16)
+        self.info_path = Path(info_path) if info_path else default_info_path()
+        server = self
+
+        class Connection(socketserver.StreamRequestHandler):
+            def handle(self):
+                replies: "queue.SimpleQueue[Optional[tuple]]" = queue.SimpleQueue()
+                writer = threading.Thread(target=self._write, args=(replies,), name="relayd-reply", daemon=True)
+                writer.start()
+                try:
+                    for line in self.rfile:
+                        if line.strip():
+                            replies.put(server._dispatch(handler, line))
+                except OSError:
+                    pass  # client went away
+                finally:
+                    replies.put(None)
+                    writer.join()
+
+            def _write(self, replies):
+                while True:
+                    item = replies.get()
+                    if item is None:
+                        return
+                    request_id, reply = item
+                    if isinstance(reply, Future):
+                        try:
+                            reply = reply.result()
+                        except Exception as e:
+                            reply = _error(e)
+                    if request_id is not None:
+                        reply = dict(reply, id=request_id)
+                    try:
+                        self.wfile.write(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+                    except OSError:
+                        pass  # keep draining so the reader is not left waiting
+
+        self._server = socketserver.ThreadingTCPServer((host, port), Connection)
+        self._server.daemon_threads = True
+        self.host = host
+        self.port = self._server.server_address[1]
+        self._thread: Optional[threading.Thread] = None
+
+    def _dispatch(self, handler: Handler, line: bytes):
+        """(request id, reply or Future) for one request line."""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return None, _error(ValueError(f"Not JSON: {e}"))
+        if not isinstance(request, dict):
+            return None, _error(ValueError("Request must be a JSON object"))
+        request_id = request.get("id")
+        if not hmac.compare_digest(str(request.get("token", "")), self.token):
+            return request_id, _error(PermissionError("Bad token"))
+        try:
+            return request_id, handler(request)
+        except Exception as e:
+            logger.debug("Request %r failed: %s", request.get("op"), e)
+            return request_id, _error(e)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="relayd", daemon=True)
+        self._thread.start()
+        write_json(self.info_path, {"host": self.host, "port": self.port, "token": self.token, "pid": os.getpid()})
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        try:
+            self.info_path.unlink()
+        except OSError:
+            pass
+
+
+class RelayClient:
+    """Connection to a running relay daemon, found through its info file."""
+
+    def __init__(self, info_path: Optional[Path] = None, timeout: Optional[float] = None):
+        path = Path(info_path) if info_path else default_info_path()
+        try:
+            info = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            raise ConnectionError(f"No relay daemon running ({path} missing)") from None
+        self.token = info["token"]
+        self._sock = socket.create_connection((info["host"], info["port"]), timeout=timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        self._next_id = 0
+
+    def request(self, op: str, **fields) -> Reply:
+        """One request and its reply; raises RelayError if the daemon refused it."""
+        reply = self.pipeline([dict(fields, op=op)])[0]
+        if not reply.get("ok"):
+            raise RelayError(reply.get("error", "request failed"))
+        return reply
+
+    def pipeline(self, requests: Iterable[Dict[str, object]]) -> List[Reply]:
+        """Write every request, then read their replies (in the same order, ok or not)."""
+        lines = []
+        for request in requests:
+            self._next_id += 1
+            lines.append(json.dumps(dict(request, token=self.token, id=self._next_id), separators=(",", ":")))
+        if not lines:
+            return []
+        self._sock.sendall(("\n".join(lines) + "\n").encode())
+        replies = []
+        for _ in lines:
+            line = self._reader.readline()
+            if not line:
+                raise ConnectionError("Relay daemon closed the connection")
+            replies.append(json.loads(line))
+        return replies
+
+    def close(self):
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _print_reply(reply: Reply, as_json: bool):
+    if as_json:
+        print(json.dumps(reply))
+    elif not reply.get("ok"):
+        print(f"error: {reply.get('error')}", file=sys.stderr)
+    elif "sent" in reply:
+        print(f"{reply['command']}: sent to {reply['sent']}/{reply['windows']} windows")
+    elif reply.get("queued"):
+        print(f"{reply['command']}: queued")
+    elif "commanders" in reply:
+        for window in reply["commanders"]:
+            print(f"{window['commander']:<20} {window['hwnd']:#010x}  {window['title']}")
+    else:
+        rest = {k: v for k, v in reply.items() if k not in ("ok", "id")}
+        print(json.dumps(rest, indent=2) if rest else "ok")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Drive a running relay daemon (python input_broadcast.py --daemon)")
+    p.add_argument("--info", type=Path, help="Daemon info file (default: %%LOCALAPPDATA%%\\EDWing\\relay-daemon.json)")
+    p.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for a reply (default: 60)")
+    p.add_argument("--json", action="store_true", help="Print raw JSON replies")
+    ops = p.add_subparsers(dest="op", required=True)
+    send = ops.add_parser("send", help="Broadcast commands; '-' reads one command per line from stdin")
+    send.add_argument("commands", nargs="+")
+    send.add_argument("--group", help="Only this commander group")
+    send.add_argument("--no-wait", action="store_true", help="Reply once queued instead of once sent")
+    windows = ops.add_parser("windows", help="List the Elite windows the relay would send to")
+    windows.add_argument("--group")
+    for op in ("stats", "ping", "shutdown"):
+        ops.add_parser(op)
+    args = p.parse_args()
+
+    if args.op == "send":
+        commands = []
+        for command in args.commands:
+            if command == "-":
+                commands.extend(line.rstrip("\r\n") for line in sys.stdin if line.strip())
+            else:
+                commands.append(command)
+        requests = [{"op": "send", "command": c, "group": args.group, "wait": not args.no_wait} for c in commands]
+    elif args.op == "windows":
+        requests = [{"op": "windows", "group": args.group}]
+    else:
+        requests = [{"op": args.op}]
+
+    try:
+        with RelayClient(args.info, timeout=args.timeout) as client:
+            replies = client.pipeline(requests)
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(2)
+    for reply in replies:
+        _print_reply(reply, args.json)
+    if not all(reply.get("ok") for reply in replies):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Cancellable timers on a single thread.
+
+Scheduler keeps a heap of perf_counter deadlines and one thread that sleeps
+on a condition until the earliest is due, then spins the last stretch with
+edwing.timing.sleep_until so callbacks fire within a fraction of a
+millisecond. Cancelled timers never run, no matter how late the cancel comes
+relative to the thread waking up.
+
+ManualScheduler has the same interface on a virtual clock that only moves
+when advance_to() is called, so replays and benchmarks are deterministic and
+run as fast as the CPU allows. Code that wants to work with either reads the
+time from scheduler.now() rather than time.perf_counter().
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+
+from edwing import timing
+
+logger = logging.getLogger(__name__)
+
+
+class Timer:
+    """Handle for a scheduled callback."""
+
+    __slots__ = ("when", "seq", "callback", "args", "cancelled")
+
+    def __init__(self, when: float, seq: int, callback: Callable, args: tuple):
+        self.when = when
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def __lt__(self, other: "Timer") -> bool:
+        return (self.when, self.seq) < (other.when, other.seq)
+
+
+class Scheduler:
+    """Runs callbacks at perf_counter deadlines on one daemon thread."""
+
+    def __init__(self, name: str = "scheduler"):
+        self._heap: List[Timer] = []
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def call_at(self, when: float, callback: Callable, *args) -> Timer:
+        timer = Timer(when, next(self._seq), callback, args)
+        with self._cond:
+            heapq.heappush(self._heap, timer)
+            if self._heap[0] is timer:
+                self._cond.notify()
+        return timer
+
+    def call_later(self, delay: float, callback: Callable, *args) -> Timer:
+        return self.call_at(time.perf_counter() + delay, callback, *args)
+
+    def call_soon(self, callback: Callable, *args) -> Timer:
+        return self.call_at(time.perf_counter(), callback, *args)
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def stop(self, timeout: float = 1.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def _next_due(self) -> Optional[Timer]:
+        with self._cond:
+            while self._running:
+                while self._heap and self._heap[0].cancelled:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                remaining = self._heap[0].when - time.perf_counter()
+                if remaining > timing.SPIN_MARGIN:
+                    self._cond.wait(remaining - timing.SPIN_MARGIN)
+                    continue
+                return heapq.heappop(self._heap)
+        return None
+
+    def _run(self):
+        while True:
+            timer = self._next_due()
+            if timer is None:
+                return
+            timing.sleep_until(timer.when)
+            if timer.cancelled:
+                continue
+            try:
+                timer.callback(*timer.args)
+            except Exception:
+                logger.exception("Scheduled callback %r failed", timer.callback)
+
+
+class ManualScheduler:
+    """Scheduler on a virtual clock, driven by advance_to(). No thread; callbacks run in the caller."""
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self._heap: List[Timer] = []
+        self._seq = itertools.count()
+
+    def call_at(self, when: float, callback: Callable, *args) -> Timer:
+        timer = Timer(when, next(self._seq), callback, args)
+        heapq.heappush(self._heap, timer)
+        return timer
+
+    def call_later(self, delay: float, callback: Callable, *args) -> Timer:
+        return self.call_at(self._now + delay, callback, *args)
+
+    def call_soon(self, callback: Callable, *args) -> Timer:
+        return self.call_at(self._now, callback, *args)
+
+    def now(self) -> float:
+        return self._now
+
+    def stop(self, timeout: float = 1.0):
+        self._heap.clear()
+
+    def pending(self) -> int:
+        return sum(1 for timer in self._heap if not timer.cancelled)
+
+    def advance_to(self, when: float):
+        """Run every timer due up to when, in order, with the clock at each timer's deadline."""
+        while self._heap and self._heap[0].when <= when:
+            timer = heapq.heappop(self._heap)
+            if timer.cancelled:
+                continue
+            self._now = max(self._now, timer.when)
+            try:
+                timer.callback(*timer.args)
+            except Exception:
+                logger.exception("Scheduled callback %r failed", timer.callback)
+        self._now = max(self._now, when)
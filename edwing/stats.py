@@ -0,0 +1,60 @@
+"""
+Latency sample collection and percentile summaries.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Dict, Iterable, List
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, math.ceil(pct / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[rank]
+
+
+def summarize(samples: Iterable[float]) -> Dict[str, float]:
+    """count/min/p50/p90/p99/max of samples given in seconds, reported in milliseconds."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "min_ms": ordered[0] * 1000,
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p90_ms": percentile(ordered, 90) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def format_summary(name: str, summary: Dict[str, float]) -> str:
+    if not summary.get("count"):
+        return f"{name}: no samples"
+    return (f"{name}: n={summary['count']} p50={summary['p50_ms']:.2f}ms "
+            f"p90={summary['p90_ms']:.2f}ms p99={summary['p99_ms']:.2f}ms max={summary['max_ms']:.2f}ms")
+
+
+class LatencySamples:
+    """Thread-safe ring of the most recent latency samples (seconds)."""
+
+    def __init__(self, maxlen: int = 10000):
+        self._samples = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def snapshot(self) -> List[float]:
+        with self._lock:
+            return list(self._samples)
+
+    def summary(self) -> Dict[str, float]:
+        return summarize(self.snapshot())
@@ -0,0 +1,306 @@
+"""
+Wing status board shared by every EDWing process through a memory-mapped file.
+
+Each AutoHonk instance owns one fixed-size slot in
+%LOCALAPPDATA%\\EDWing\\wing-status.bin and rewrites it on every state
+change: commander, current system (name and 64-bit hash), honk state, last
+event / jump / heartbeat times and honk, scan and timeout counts. Readers map
+the same file and see the whole wing without IPC round trips or journal
+parsing.
+
+Layout (little-endian): a 64-byte header (magic, version, slot count, record
+size) followed by SLOTS records. A record's first field is a sequence
+number that is odd while the owner is writing, so readers retry torn reads
+instead of locking (a seqlock). A slot whose heartbeat is older than
+STALE_AFTER seconds belongs to a process that went away and can be reused. Slots
+are claimed under an exclusive lock on wing-status.bin.lock, so processes
+starting together never pick the same one.
+
+    python -m edwing.status            # table of the wing, once
+    python -m edwing.status --watch 1  # refreshed every second
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional
+
+from edwing.paths import data_dir, file_lock
+
+MAGIC = b"EDWS"
+VERSION = 1
+SLOTS = 64
+STALE_AFTER = 30.0  # seconds without a heartbeat before a slot counts as offline
+
+_HEADER = struct.Struct("<4sHHI")
+_HEADER_SIZE = 64
+# seq, pid, commander, system, system hash, state, (pad), last event, last jump, heartbeat, honks, scans, timeouts
+_RECORD = struct.Struct("<II32s48sQB3xdddIII")
+_SEQ = struct.Struct("<I")
+
+# Honk states
+OFFLINE = 0
+IDLE = 1
+JUMPING = 2  # jumped, waiting to honk
+HONKING = 3
+STATE_NAMES = {OFFLINE: "offline", IDLE: "idle", JUMPING: "jumping", HONKING: "honking"}
+
+
+def default_board_path() -> Path:
+    return data_dir() / "wing-status.bin"
+
+
+def system_hash(system: Optional[str]) -> int:
+    """Stable 64-bit hash of a star system name (0 for none), equal across processes."""
+    if not system:
+        return 0
+    return int.from_bytes(hashlib.blake2b(system.lower().encode(), digest_size=8).digest(), "little")
+
+
+class WingStatus(NamedTuple):
+    slot: int
+    commander: str
+    pid: int
+    system: str
+    system_hash: int
+    state: str
+    last_event: float
+    last_jump: float
+    heartbeat: float
+    honks: int
+    scans: int
+    timeouts: int
+
+
+def _text(raw: bytes) -> str:
+    return raw.rstrip(b"\0").decode("utf-8", "replace")
+
+
+def _fit(text: str, size: int) -> bytes:
+    """UTF-8 truncated to size bytes without splitting a character."""
+    return text.encode("utf-8")[:size].decode("utf-8", "ignore").encode("utf-8")
+
+
+def _open_map(path: Path, slots: int, writable: bool) -> Optional[mmap.mmap]:
+    """Map the board; writers create it or fix its header, and must hold file_lock(path)."""
+    size = _HEADER_SIZE + slots * _RECORD.size
+    if writable:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "ab"):
+            pass  # create it if missing
+        with open(path, "r+b") as f:
+            length = os.fstat(f.fileno()).st_size
+            header = f.read(_HEADER.size)
+            magic, version, count, record_size = (_HEADER.unpack(header) if len(header) == _HEADER.size
+                                                  else (None, None, None, None))
+            if magic != MAGIC or version != VERSION or record_size != _RECORD.size:
+                # Not a board, or one from another layout: start over with every slot free
+                f.seek(0)
+                f.write(_HEADER.pack(MAGIC, VERSION, slots, _RECORD.size).ljust(size, b"\0"))
+                f.flush()
+            elif count != slots or length < size:
+                # Same layout, another slot count: records stay where they are
+                if length < size:
+                    f.truncate(size)
+                f.seek(0)
+                f.write(_HEADER.pack(MAGIC, VERSION, slots, _RECORD.size))
+                f.flush()
+            return mmap.mmap(f.fileno(), size)
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER_SIZE:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+
+
+class WingBoard:
+    """Read-only view of the status board."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else default_board_path()
+        self._map: Optional[mmap.mmap] = None
+
+    def _slots(self) -> int:
+        if self._map is None:
+            self._map = _open_map(self.path, 0, writable=False)
+            if self._map is None:
+                return 0
+        magic, version, slots, record_size = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != _RECORD.size:
+            return 0
+        return min(slots, (len(self._map) - _HEADER_SIZE) // _RECORD.size)
+
+    def read_slot(self, slot: int, retries: int = 100) -> Optional[WingStatus]:
+        """One consistent record, or None if its writer kept it busy for every retry."""
+        offset = _HEADER_SIZE + slot * _RECORD.size
+        for _ in range(retries):
+            fields = _RECORD.unpack_from(self._map, offset)
+            if fields[0] & 1 or _SEQ.unpack_from(self._map, offset)[0] != fields[0]:
+                continue  # mid-write
+            seq, pid, commander, system, hashed, state, last_event, last_jump, heartbeat, honks, scans, timeouts = fields
+            if state != OFFLINE and time.time() - heartbeat > STALE_AFTER:
+                state = OFFLINE
+            return WingStatus(slot, _text(commander), pid, _text(system), hashed,
+                              STATE_NAMES.get(state, "unknown"), last_event, last_jump, heartbeat,
+                              honks, scans, timeouts)
+        return None
+
+    def records(self, include_offline: bool = False) -> List[WingStatus]:
+        """Every claimed slot (live ones only, unless include_offline)."""
+        result = []
+        for slot in range(self._slots()):
+            if not _SEQ.unpack_from(self._map, _HEADER_SIZE + slot * _RECORD.size)[0]:
+                continue  # never claimed
+            status = self.read_slot(slot)
+            if status is None or not status.commander:
+                continue
+            if include_offline or status.state != "offline":
+                result.append(status)
+        return result
+
+    def wait(self, predicate: Callable[[List[WingStatus]], bool], timeout: float, interval: float = 0.05) -> bool:
+        """Poll the board until predicate(records) holds; False if timeout passes first."""
+        deadline = time.monotonic() + timeout
+        while True:
+            if predicate(self.records()):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+def wing_arrived(records: List[WingStatus]) -> bool:
+    """True when every live commander with a known system is in the same one and none is mid-jump."""
+    return (len({r.system_hash for r in records if r.system_hash}) <= 1
+            and not any(r.state == STATE_NAMES[JUMPING] for r in records))
+
+
+class StatusSlot:
+    """One commander's record on the board, owned by this process."""
+
+    def __init__(self, commander: str, path: Optional[Path] = None, slots: int = SLOTS):
+        self.commander = commander
+        self.path = Path(path) if path else default_board_path()
+        self._lock = threading.Lock()  # the journal, timer and main threads all publish
+        self.state = IDLE
+        self.system = ""
+        self.last_event = 0.0
+        self.last_jump = 0.0
+        self.honks = 0
+        self.scans = 0
+        self.timeouts = 0
+        # Claim and first write under one lock, so two processes starting together never share a slot
+        with file_lock(self.path):
+            self._map = _open_map(self.path, slots, writable=True)
+            self._board = WingBoard(self.path)
+            self._board._map = self._map
+            self._offset = _HEADER_SIZE + self._claim() * _RECORD.size
+            self._seq = _SEQ.unpack_from(self._map, self._offset)[0] & ~1
+            self.publish()
+
+    def _claim(self) -> int:
+        """The commander's slot if it has one, else the first free or abandoned slot.
+
+        A live slot of the same commander is taken over: it belongs to a process that crashed and
+        restarted within STALE_AFTER, and a second record would leave the stale one on the board.
+        """
+        free = None
+        for slot in range(self._board._slots()):
+            status = self._board.read_slot(slot)
+            if status is None:
+                continue
+            if status.commander == self.commander:
+                return slot
+            if free is None and (not status.commander or status.state == "offline"):
+                free = slot
+        if free is None:
+            raise RuntimeError(f"Wing status board {self.path} is full")
+        return free
+
+    def publish(self, **changes):
+        """Apply attribute changes (state, system, last_event, last_jump, counts) and rewrite the record."""
+        for name, value in changes.items():
+            if not hasattr(self, name):
+                raise AttributeError(name)
+            setattr(self, name, value)
+        self._write(self.state)
+
+    def heartbeat(self):
+        """Show the slot is still owned; call at least every STALE_AFTER seconds."""
+        self._write(self.state)
+
+    def close(self):
+        """Mark the commander offline and unmap."""
+        self._write(OFFLINE)
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+    def _write(self, state: int):
+        with self._lock:
+            if self._map is None:
+                return
+            record = _RECORD.pack(0, os.getpid(), _fit(self.commander, 32), _fit(self.system or "", 48),
+                                  system_hash(self.system), state, self.last_event, self.last_jump, time.time(),
+                                  self.honks, self.scans, self.timeouts)
+            self._seq += 1
+            _SEQ.pack_into(self._map, self._offset, self._seq)  # odd: readers retry
+            self._map[self._offset + _SEQ.size:self._offset + _RECORD.size] = record[_SEQ.size:]
+            self._seq += 1
+            _SEQ.pack_into(self._map, self._offset, self._seq)
+
+
+def _format_age(now: float, stamp: float) -> str:
+    return f"{now - stamp:.0f}s ago" if stamp else "-"
+
+
+def main():
+    p = argparse.ArgumentParser(description="Show the state of every AutoHonk on this machine")
+    p.add_argument("--board", type=Path, help="Status board file (default: %%LOCALAPPDATA%%\\EDWing\\wing-status.bin)")
+    p.add_argument("--all", action="store_true", help="Include commanders that went offline")
+    p.add_argument("--watch", type=float, metavar="SECONDS", help="Redraw every SECONDS until Ctrl+C")
+    p.add_argument("--json", action="store_true", help="Print records as JSON")
+    args = p.parse_args()
+
+    board = WingBoard(args.board)
+    try:
+        while True:
+            records = board.records(include_offline=args.all)
+            if args.json:
+                print(json.dumps([r._asdict() for r in records], indent=2))
+            else:
+                if args.watch:
+                    print("\033[2J\033[H", end="")
+                now = time.time()
+                print(f"{'commander':<20} {'state':<8} {'system':<28} {'last jump':>10} {'honks':>6} {'scans':>6} {'timeouts':>8}")
+                for r in records:
+                    print(f"{r.commander:<20} {r.state:<8} {r.system:<28} {_format_age(now, r.last_jump):>10} "
+                          f"{r.honks:>6} {r.scans:>6} {r.timeouts:>8}")
+                if not records:
+                    print("(no AutoHonk running)")
+                print("wing together" if wing_arrived(records) else "wing split or still jumping")
+            if not args.watch:
+                break
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        board.close()
+
+
+if __name__ == "__main__":
+    main()
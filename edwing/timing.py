@@ -0,0 +1,76 @@
+"""
+High-precision key timing.
+
+time.sleep() on Windows wakes on the system timer tick (15.6 ms by default),
+so a 100 ms key hold really lasts anywhere up to ~116 ms and differs between
+windows. sleep_until() sleeps coarsely to just before an absolute
+perf_counter deadline and spins for the remainder. Timeline strings several
+waits together off one start time, so per-step error never accumulates.
+"""
+
+import atexit
+import sys
+import time
+
+# How early the coarse sleep stops before a deadline; the rest is spun
+SPIN_MARGIN = 0.016 if sys.platform == "win32" else 0.001
+
+_high_resolution = False
+
+
+def enable_high_resolution_timer() -> bool:
+    """
+    Raise the Windows timer resolution to 1 ms for this process.
+
+    Shrinks the spin margin (and the CPU spent spinning) accordingly. Returns
+    False, and changes nothing, off Windows or if the call fails.
+    """
+    global SPIN_MARGIN, _high_resolution
+    if _high_resolution:
+        return True
+    if sys.platform != "win32":
+        return False
+    try:
+        import ctypes
+        winmm = ctypes.windll.winmm
+        if winmm.timeBeginPeriod(1) != 0:
+            return False
+        atexit.register(winmm.timeEndPeriod, 1)
+    except Exception:
+        return False
+    _high_resolution = True
+    SPIN_MARGIN = 0.002
+    return True
+
+
+def sleep_until(deadline: float):
+    """Block until time.perf_counter() >= deadline."""
+    remaining = deadline - time.perf_counter()
+    if remaining > SPIN_MARGIN:
+        time.sleep(remaining - SPIN_MARGIN)
+    while time.perf_counter() < deadline:
+        time.sleep(0)  # yield the GIL to other senders while spinning
+
+
+def precise_sleep(seconds: float):
+    """time.sleep() replacement accurate to well under a millisecond."""
+    if seconds > 0:
+        sleep_until(time.perf_counter() + seconds)
+
+
+class Timeline:
+    """Absolute deadlines measured from a fixed start."""
+
+    def __init__(self, start: float = None):
+        self.start = time.perf_counter() if start is None else start
+        self.offset = 0.0
+
+    def at(self, offset: float):
+        """Wait until `offset` seconds after start."""
+        self.offset = offset
+        sleep_until(self.start + offset)
+
+    def advance(self, seconds: float):
+        """Wait until `seconds` after the previous deadline (not after now)."""
+        if seconds:
+            self.at(self.offset + seconds)
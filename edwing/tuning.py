@@ -0,0 +1,141 @@
+"""
+Adaptive honk timing.
+
+HonkTuner remembers the last few honks of one commander: how long the key
+was held before FSSDiscoveryScan arrived, or that the honk timed out
+without one. From that it derives
+
+  timeout  the longest recent hold plus a margin, so a honk that will not
+           produce a scan is given up on (and the next jump can start) sooner;
+  delay    stepped down after a run of successful honks and backed off after
+           a honk that ran the full timeout without a scan, or any miss once
+           it has been stepped down, which is what pressing too early looks
+           like; a floor just above the delay that failed keeps the tuner
+           from walking back into it.
+
+A missed scan that the learned timing may have caused (a delay below
+--delay, or a timeout below --max-duration) is reported back by record(),
+and AutoHonk honks again right away, so tuning costs time but never a scan.
+
+Both stay between a floor and the configured --delay / --max-duration, and
+the state of every commander is kept in one small JSON file.
+"""
+
+import json
+import logging
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+from edwing.paths import data_dir, file_lock, write_json
+
+logger = logging.getLogger(__name__)
+
+
+def default_history_path() -> Path:
+    return data_dir() / "honk-history.json"
+
+
+class HonkTuner:
+    """Learned delay and timeout for one commander."""
+
+    SAMPLES = 20          # holds remembered
+    MIN_SAMPLES = 3       # holds needed before the timeout is trusted
+    TIMEOUT_MARGIN = 1.25
+    TIMEOUT_PAD = 0.5     # seconds added on top of the margin
+    STREAK = 5            # successful honks between delay reductions
+    DELAY_STEP = 0.1
+    DELAY_BACKOFF = 0.5
+    TIMEOUT_SLACK = 0.1   # a hold this close to max_timeout counts as the full timeout
+
+    def __init__(self, commander: str, delay: float, timeout: float,
+                 min_delay: float = 0.5, min_timeout: float = 2.0, path: Optional[Path] = None):
+        self.commander = commander
+        self.path = path or default_history_path()
+        self.max_delay = delay
+        self.min_delay = min(min_delay, delay)
+        self.max_timeout = timeout
+        self.min_timeout = min(min_timeout, timeout)
+
+        self.delay = delay
+        self.floor = self.min_delay  # raised past delays that were too early
+        self.holds = deque(maxlen=self.SAMPLES)
+        self.streak = 0
+        self.failed = False  # last honk timed out; use the full timeout until one succeeds
+        self._lock = threading.Lock()  # record() runs on the timer thread, save() on the journal thread
+        self.load()
+
+    @property
+    def timeout(self) -> float:
+        with self._lock:
+            if self.failed or len(self.holds) < self.MIN_SAMPLES:
+                return self.max_timeout
+            learned = max(self.holds) * self.TIMEOUT_MARGIN + self.TIMEOUT_PAD
+        return min(self.max_timeout, max(self.min_timeout, learned))
+
+    def record(self, hold: float, scanned: bool) -> bool:
+        """One finished honk: hold seconds, and whether FSSDiscoveryScan ended it.
+
+        Returns True for a miss the learned timing may have caused; the honk should be retried now.
+        """
+        with self._lock:
+            if scanned:
+                self.holds.append(hold)
+                self.failed = False
+                self.streak += 1
+                if self.streak >= self.STREAK:
+                    self.streak = 0
+                    self.delay = max(self.floor, self.delay - self.DELAY_STEP)
+                return False
+            self.failed = True
+            self.streak = 0
+            stepped_down = self.delay < self.max_delay
+            full_hold = hold >= self.max_timeout - self.TIMEOUT_SLACK
+            if full_hold or stepped_down:
+                # No scan, held as long as allowed or after shortening the delay: the key went down too early
+                self.floor = min(self.max_delay, self.delay + self.DELAY_STEP)
+                self.delay = min(self.max_delay, self.delay + self.DELAY_BACKOFF)
+            return stepped_down or not full_hold
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f).get(self.commander)
+        except (OSError, ValueError, AttributeError):
+            return
+        if not state:
+            return
+        try:
+            self.delay = min(self.max_delay, max(self.min_delay, float(state["delay"])))
+            self.floor = min(self.max_delay, max(self.min_delay, float(state.get("floor", self.min_delay))))
+            self.holds.extend(float(h) for h in state.get("holds", ()))
+            self.streak = int(state.get("streak", 0))
+            self.failed = bool(state.get("failed", False))
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Ignoring unreadable honk history for %s", self.commander)
+
+    def save(self):
+        """Write this commander's state, keeping everyone else's (other processes share the file)."""
+        with self._lock:
+            state = {
+                "delay": round(self.delay, 3),
+                "floor": round(self.floor, 3),
+                "holds": [round(h, 3) for h in self.holds],
+                "streak": self.streak,
+                "failed": self.failed,
+            }
+        try:
+            # Read-modify-write under the file lock, so processes saving together keep each other's timing
+            with file_lock(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    if not isinstance(data, dict):
+                        data = {}
+                except (OSError, ValueError):
+                    data = {}
+                data[self.commander] = state
+                write_json(self.path, data)
+        except OSError:
+            logger.warning("Could not write honk history %s", self.path)
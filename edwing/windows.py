@@ -0,0 +1,463 @@
+"""
+Elite window discovery.
+
+WindowIndex enumerates top-level windows once, sorts the Elite clients into
+commanders and keeps the result until a window is created, destroyed, shown,
+hidden or renamed. Process image paths are cached per PID so OpenProcess is
+only paid for windows we have not seen before. Titles are matched to
+commanders by a precompiled CommanderMatcher.
+
+Backends:
+- Win32WindowBackend: pywin32 + a WinEvent hook for invalidation
+- FakeWindowBackend: in-memory desktop for benchmarks and non-Windows runs;
+  records every posted message with its perf_counter timestamp
+"""
+
+import ctypes
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from edwing.commanders import CommanderMatcher
+
+logger = logging.getLogger(__name__)
+
+# Window events reported to WindowIndex by a backend's watch() callback
+WINDOW_CREATED = "created"
+WINDOW_DESTROYED = "destroyed"
+WINDOW_SHOWN = "shown"
+WINDOW_HIDDEN = "hidden"
+WINDOW_RENAMED = "renamed"
+
+WindowCallback = Callable[[str, int], None]
+
+
+class WindowInfo(NamedTuple):
+    hwnd: int
+    title: str
+    pid: int
+
+
+class Win32WindowBackend:
+    """Enumerates windows through pywin32. Only usable on Windows."""
+
+    # WinEvent constants (winuser.h)
+    EVENT_OBJECT_CREATE = 0x8000
+    EVENT_OBJECT_DESTROY = 0x8001
+    EVENT_OBJECT_SHOW = 0x8002
+    EVENT_OBJECT_HIDE = 0x8003
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    OBJID_WINDOW = 0
+    CHILDID_SELF = 0
+    WM_QUIT = 0x0012
+    INPUT_KEYBOARD = 1
+
+    _EVENT_NAMES = {
+        EVENT_OBJECT_CREATE: WINDOW_CREATED,
+        EVENT_OBJECT_DESTROY: WINDOW_DESTROYED,
+        EVENT_OBJECT_SHOW: WINDOW_SHOWN,
+        EVENT_OBJECT_HIDE: WINDOW_HIDDEN,
+        EVENT_OBJECT_NAMECHANGE: WINDOW_RENAMED,
+    }
+
+    def __init__(self):
+        import win32api
+        import win32con
+        import win32gui
+        import win32process
+
+        self.win32api = win32api
+        self.win32con = win32con
+        self.win32gui = win32gui
+        self.win32process = win32process
+        self._send_input = None  # (SendInput, INPUT, KEYBDINPUT), built on first use
+
+    def list_windows(self) -> List[WindowInfo]:
+        """Return all visible top-level windows in Z order."""
+        windows = []
+
+        def callback(hwnd, _):
+            try:
+                if self.win32gui.IsWindowVisible(hwnd):
+                    _, pid = self.win32process.GetWindowThreadProcessId(hwnd)
+                    windows.append(WindowInfo(hwnd, self.win32gui.GetWindowText(hwnd), pid))
+            except Exception:
+                pass
+            return True
+
+        self.win32gui.EnumWindows(callback, None)
+        return windows
+
+    def process_image(self, pid: int) -> str:
+        """Return the lower-cased executable path for a process."""
+        handle = self.win32api.OpenProcess(
+            self.win32con.PROCESS_QUERY_INFORMATION | self.win32con.PROCESS_VM_READ, False, pid
+        )
+        try:
+            return self.win32process.GetModuleFileNameEx(handle, 0).lower()
+        finally:
+            self.win32api.CloseHandle(handle)
+
+    def is_window(self, hwnd: int) -> bool:
+        return bool(self.win32gui.IsWindow(hwnd))
+
+    def post_message(self, hwnd: int, msg: int, wparam: int, lparam: int):
+        self.win32api.PostMessage(hwnd, msg, wparam, lparam)
+
+    def set_foreground(self, hwnd: int):
+        self.win32gui.SetForegroundWindow(hwnd)
+
+    def foreground(self) -> Optional[int]:
+        return self.win32gui.GetForegroundWindow() or None
+
+    def key_event(self, vk: int, up: bool = False):
+        """Global keyboard input (keybd_event); lands in whichever window has focus."""
+        self.win32api.keybd_event(vk, 0, self.win32con.KEYEVENTF_KEYUP if up else 0, 0)
+
+    def send_input(self, edges: Sequence[Tuple[int, bool]]):
+        """Several (vk, down) key edges in one SendInput call; lands in whichever window has focus."""
+        if self._send_input is None:
+            self._send_input = _send_input_api()
+        send, input_type, keyboard_input = self._send_input
+        inputs = (input_type * len(edges))()
+        for item, (vk, down) in zip(inputs, edges):
+            item.type = self.INPUT_KEYBOARD
+            item.ki = keyboard_input(vk, 0, 0 if down else self.win32con.KEYEVENTF_KEYUP, 0, 0)
+        if send(len(edges), inputs, ctypes.sizeof(input_type)) != len(edges):
+            raise OSError(ctypes.get_last_error(), "SendInput was blocked")
+
+    def watch(self, callback: WindowCallback) -> Optional[Callable[[], None]]:
+        """Report top-level window changes to callback. Returns a stop function."""
+        ready = threading.Event()
+        state = {}
+        thread = threading.Thread(
+            target=self._hook_loop, args=(callback, ready, state), name="WinEventHook", daemon=True
+        )
+        thread.start()
+        ready.wait(2.0)
+        if not state.get("thread_id"):
+            logger.warning("WinEvent hook unavailable; window index will rebuild on every lookup")
+            return None
+
+        def stop():
+            import ctypes
+            ctypes.windll.user32.PostThreadMessageW(state["thread_id"], self.WM_QUIT, 0, 0)
+            thread.join(timeout=1.0)
+
+        return stop
+
+    def _hook_loop(self, callback: WindowCallback, ready: threading.Event, state: dict):
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+        proc_type = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD,
+        )
+
+        def on_event(_hook, event, hwnd, id_object, id_child, _thread, _time):
+            if id_object == self.OBJID_WINDOW and id_child == self.CHILDID_SELF and hwnd:
+                try:
+                    callback(self._EVENT_NAMES[event], hwnd)
+                except Exception:
+                    logger.exception("Window event callback failed")
+
+        proc = proc_type(on_event)
+        flags = self.WINEVENT_OUTOFCONTEXT | self.WINEVENT_SKIPOWNPROCESS
+        hooks = [
+            user32.SetWinEventHook(self.EVENT_OBJECT_CREATE, self.EVENT_OBJECT_HIDE, 0, proc, 0, 0, flags),
+            user32.SetWinEventHook(self.EVENT_OBJECT_NAMECHANGE, self.EVENT_OBJECT_NAMECHANGE, 0, proc, 0, 0, flags),
+        ]
+        if not all(hooks):
+            ready.set()
+            return
+
+        state["thread_id"] = kernel32.GetCurrentThreadId()
+        ready.set()
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        for hook in hooks:
+            user32.UnhookWinEvent(hook)
+
+
+class FakeWindowBackend:
+    """
+    In-memory desktop. Counts backend calls and can simulate OpenProcess cost,
+    the cost of each input call (PostMessage, keybd_event, SendInput), message
+    queue delay (each posted message is logged at the time the window would
+    process it) and PostMessage failures.
+    """
+
+    ELITE_IMAGE = "c:\\program files (x86)\\steam\\steamapps\\common\\elite dangerous\\products\\elite-dangerous-odyssey-64\\elitedangerous64.exe"
+
+    def __init__(self, query_cost: float = 0.0, clock: Callable[[], float] = time.perf_counter,
+                 post_delay: float = 0.0, post_jitter: float = 0.0, failure_rate: float = 0.0, seed: int = 0,
+                 input_cost: float = 0.0):
+        self.query_cost = query_cost
+        self.input_cost = input_cost  # seconds per PostMessage / keybd_event / SendInput call
+        self.input_calls = 0
+        self.clock = clock  # timestamps for messages; a virtual clock in replays
+        self.post_delay = post_delay    # seconds a posted message waits in the window's queue
+        self.post_jitter = post_jitter  # plus up to this much, uniformly
+        self.failure_rate = failure_rate  # fraction of post_message calls that raise
+        self.failed_posts = 0
+        self._rng = random.Random(seed)
+        self.enum_calls = 0
+        self.process_queries = 0
+        # (clock(), hwnd, msg, wparam, lparam) for every posted message,
+        # and for key_event() input delivered to the foreground window
+        self.messages: List[Tuple[float, int, int, int, int]] = []
+        self.focus_switches = 0
+        self._foreground: Optional[int] = None
+        self._windows: Dict[int, WindowInfo] = {}
+        self._visible: Dict[int, bool] = {}
+        self._images: Dict[int, str] = {}
+        self._watchers: List[WindowCallback] = []
+        self._next_hwnd = 0x10010
+        self._next_pid = 4000
+
+    def add_window(self, title: str, image: Optional[str] = None, pid: Optional[int] = None,
+                   visible: bool = True) -> int:
+        """Create a window (and its process, if pid is new). Returns the hwnd."""
+        hwnd = self._next_hwnd
+        self._next_hwnd += 0x10
+        if pid is None:
+            pid = self._next_pid
+            self._next_pid += 4
+        self._images.setdefault(pid, (image or "c:\\windows\\explorer.exe").lower())
+        self._windows[hwnd] = WindowInfo(hwnd, title, pid)
+        self._visible[hwnd] = visible
+        self._notify(WINDOW_CREATED, hwnd)
+        if visible:
+            self._notify(WINDOW_SHOWN, hwnd)
+        return hwnd
+
+    def add_elite_window(self, title: str) -> int:
+        return self.add_window(title, image=self.ELITE_IMAGE)
+
+    def remove_window(self, hwnd: int):
+        info = self._windows.pop(hwnd, None)
+        self._visible.pop(hwnd, None)
+        if info and not any(w.pid == info.pid for w in self._windows.values()):
+            self._images.pop(info.pid, None)
+        self._notify(WINDOW_DESTROYED, hwnd)
+
+    def set_title(self, hwnd: int, title: str):
+        info = self._windows[hwnd]
+        self._windows[hwnd] = info._replace(title=title)
+        self._notify(WINDOW_RENAMED, hwnd)
+
+    def list_windows(self) -> List[WindowInfo]:
+        self.enum_calls += 1
+        return [w for w in self._windows.values() if self._visible[w.hwnd]]
+
+    def process_image(self, pid: int) -> str:
+        self.process_queries += 1
+        if self.query_cost:
+            _busy_wait(self.query_cost)
+        if pid not in self._images:
+            raise OSError(f"no such process: {pid}")
+        return self._images[pid]
+
+    def is_window(self, hwnd: int) -> bool:
+        return hwnd in self._windows
+
+    def window_text(self, hwnd: int) -> str:
+        return self._windows[hwnd].title
+
+    def post_message(self, hwnd: int, msg: int, wparam: int, lparam: int):
+        self._input_call()
+        if hwnd not in self._windows:
+            raise OSError(f"invalid window handle: {hwnd:#x}")
+        if self.failure_rate and self._rng.random() < self.failure_rate:
+            self.failed_posts += 1
+            raise OSError(f"PostMessage to {hwnd:#x} failed")
+        delay = self.post_delay + (self._rng.uniform(0, self.post_jitter) if self.post_jitter else 0.0)
+        self.messages.append((self.clock() + delay, hwnd, msg, wparam, lparam))
+
+    def set_foreground(self, hwnd: int):
+        if hwnd not in self._windows:
+            raise OSError(f"invalid window handle: {hwnd:#x}")
+        if hwnd != self._foreground:
+            self.focus_switches += 1
+        self._foreground = hwnd
+
+    def foreground(self) -> Optional[int]:
+        return self._foreground
+
+    def key_event(self, vk: int, up: bool = False):
+        # WM_KEYUP / WM_KEYDOWN, to keep the message log uniform
+        self._input_call()
+        self.messages.append((self.clock(), self._foreground or 0, 0x0101 if up else 0x0100, vk, 0))
+
+    def send_input(self, edges: Sequence[Tuple[int, bool]]):
+        """Every edge lands in the foreground window at the same instant, for one call's cost."""
+        self._input_call()
+        now = self.clock()
+        target = self._foreground or 0
+        self.messages.extend((now, target, 0x0100 if down else 0x0101, vk, 0) for vk, down in edges)
+
+    def _input_call(self):
+        self.input_calls += 1
+        if self.input_cost:
+            _busy_wait(self.input_cost)
+
+    def watch(self, callback: WindowCallback) -> Callable[[], None]:
+        self._watchers.append(callback)
+        return lambda: self._watchers.remove(callback)
+
+    def _notify(self, kind: str, hwnd: int):
+        for callback in list(self._watchers):
+            callback(kind, hwnd)
+
+
+def _send_input_api():
+    """user32.SendInput with the INPUT structures it takes (sized for the mouse member, as Windows expects)."""
+    from ctypes import wintypes
+
+    ulong_ptr = ctypes.c_size_t
+
+    class MOUSEINPUT(ctypes.Structure):
+        _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                    ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ulong_ptr)]
+
+    class KEYBDINPUT(ctypes.Structure):
+        _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD), ("dwExtraInfo", ulong_ptr)]
+
+    class _INPUTUNION(ctypes.Union):
+        _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT)]
+
+    class INPUT(ctypes.Structure):
+        _anonymous_ = ("u",)
+        _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+    user32 = ctypes.WinDLL("user32", use_last_error=True)
+    user32.SendInput.argtypes = [wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int]
+    user32.SendInput.restype = wintypes.UINT
+    return user32.SendInput, INPUT, KEYBDINPUT
+
+
+def _busy_wait(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class WindowIndex:
+    """Persistent index of Elite client windows, rebuilt only when the desktop changes."""
+
+    def __init__(self, backend, title_contains: str, process_name: str,
+                 commanders: Iterable[str] = (), primary_commander: Optional[str] = None,
+                 groups: Optional[Mapping[str, Iterable[str]]] = None):
+        self.backend = backend
+        self.title_contains = title_contains.lower()
+        self.process_name = process_name.lower()
+        self.matcher = CommanderMatcher(commanders, primary_commander, groups)
+        self.commanders = self.matcher.commanders
+        self.primary_commander = primary_commander
+        self.rebuilds = 0
+
+        self._lock = threading.Lock()
+        self._stale = True
+        self._watching = False
+        self._unwatch: Optional[Callable[[], None]] = None
+        self._exe_cache: Dict[int, str] = {}
+        self._windows: List[WindowInfo] = []
+        self._by_commander: Dict[str, WindowInfo] = {}
+
+    def start_watching(self) -> bool:
+        """Subscribe to backend window events. Without them every lookup rebuilds."""
+        if self._watching:
+            return True
+        self._unwatch = self.backend.watch(self._on_window_event)
+        self._watching = self._unwatch is not None
+        return self._watching
+
+    def stop_watching(self):
+        if self._unwatch:
+            self._unwatch()
+        self._unwatch = None
+        self._watching = False
+
+    def invalidate(self):
+        self._stale = True
+
+    def _on_window_event(self, kind: str, hwnd: int):
+        if kind in (WINDOW_DESTROYED, WINDOW_HIDDEN):
+            # Only windows we index can disappear from the result
+            if any(w.hwnd == hwnd for w in self._windows):
+                self._stale = True
+        else:
+            self._stale = True
+
+    def _refresh(self):
+        if (self._stale or not self._watching
+                or not all(self.backend.is_window(w.hwnd) for w in self._windows)):
+            self._rebuild()
+
+    def _rebuild(self):
+        self._stale = False
+        self.rebuilds += 1
+        windows = []
+        live_pids = set()
+
+        for info in self.backend.list_windows():
+            if self.title_contains not in info.title.lower():
+                continue
+            live_pids.add(info.pid)
+            exe = self._exe_cache.get(info.pid)
+            if exe is None:
+                try:
+                    exe = self.backend.process_image(info.pid)
+                except Exception:
+                    exe = ""
+                self._exe_cache[info.pid] = exe
+            if self.process_name in exe:
+                windows.append(info)
+
+        # Drop exited processes so a recycled PID is looked up again
+        for pid in list(self._exe_cache):
+            if pid not in live_pids:
+                del self._exe_cache[pid]
+
+        by_commander: Dict[str, WindowInfo] = {}
+        match = self.matcher.match
+        for info in windows:
+            commander = match(info.title)
+            if commander:
+                by_commander.setdefault(commander, info)
+
+        self._windows = windows
+        self._by_commander = by_commander
+
+    def elite_windows(self) -> List[WindowInfo]:
+        """All Elite client windows, in enumeration order."""
+        with self._lock:
+            self._refresh()
+            return list(self._windows)
+
+    def commander_windows(self, group: Optional[str] = None) -> List[Tuple[int, str, str]]:
+        """(hwnd, title, commander) for each commander (of group) with a window, in config order."""
+        members = self.matcher.members(group)
+        with self._lock:
+            self._refresh()
+            by_commander = self._by_commander
+            return [(by_commander[c].hwnd, by_commander[c].title, c) for c in members if c in by_commander]
+
+    def find(self, commander: Optional[str] = None) -> Optional[int]:
+        """Window handle for a commander, or the first Elite window if none is given."""
+        with self._lock:
+            self._refresh()
+            if commander is None:
+                return self._windows[0].hwnd if self._windows else None
+            info = self._by_commander.get(commander)
+            return info.hwnd if info else None
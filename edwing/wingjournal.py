@@ -0,0 +1,262 @@
+"""
+One ordered journal stream for the whole wing.
+
+WingJournal tails the newest journal in every commander's folder and hands
+out their events as WingEvents (commander + JournalEvent), k-way merged by
+journal timestamp. Each pass reads the journals that changed since the last
+one, merges what it read and delivers it, in order, to every subscriber
+callback and stream() iterator.
+
+File watching stays outside: whoever watches the folders (AutoHonk uses one
+watchdog observer) calls notify(path) for each change, which only marks that
+commander's journal dirty and wakes the read loop. start() runs that loop on
+a single thread; poll() runs one pass on the caller's thread for replays and
+tests. Every poll_interval the loop also rereads every journal, in case a
+change notification was missed. New journal files are reported by notify()
+too, so folders are only listed for a newer one every rescan_interval.
+
+Events are merged within a pass, not across passes: an event that reaches
+disk after a later-stamped event from another commander has been delivered
+is still delivered, just not before it. Timestamps have one-second
+resolution, and ties keep each commander's own order.
+"""
+
+import heapq
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Set, Union
+
+from edwing.journal import JournalEvent, JournalTail, journal_sort_key, latest_journal
+from edwing.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+
+class WingEvent(NamedTuple):
+    commander: str
+    event: JournalEvent
+
+    @property
+    def timestamp(self) -> Optional[str]:
+        return self.event.timestamp
+
+    def get(self, key: str, default=None):
+        """Journal field of the wrapped event, so a WingEvent reads like the entry itself."""
+        return self.event.get(key, default)
+
+
+class _CommanderJournal:
+    """Tail of one commander's newest journal, following it to the next file."""
+
+    def __init__(self, commander: str, folder: Path, events: Optional[Iterable[str]]):
+        self.commander = commander
+        self.folder = Path(folder)
+        self.events = events
+        self.tail: Optional[JournalTail] = None
+        self.pending: Optional[Path] = None  # newer journal seen, switched to on the next read (under the dirty lock)
+        self.last_timestamp = ""  # sort key for events without a timestamp
+        latest = latest_journal(self.folder)
+        if latest is not None:
+            self._open(latest, from_start=False)
+
+    def _open(self, path: Path, from_start: bool):
+        try:
+            self.tail = JournalTail(path, self.events, from_start=from_start)
+        except OSError:
+            logger.exception("Could not open journal %s", path)
+            self.tail = None
+
+    def offer(self, name: str):
+        """Note the journal file name if it is newer than the one being tailed."""
+        current = self.pending.name if self.pending else (self.tail.path.name if self.tail else None)
+        if name == current:
+            return  # the usual case: the journal we tail grew
+        key = journal_sort_key(name)
+        if key is not None and (current is None or key > journal_sort_key(current)):
+            self.pending = self.folder / name
+
+    def read(self, switch_to: Optional[Path] = None) -> List[JournalEvent]:
+        """New events; with switch_to, the rest of the old journal and then the new one from the start."""
+        events: List[JournalEvent] = []
+        if switch_to is not None:
+            path = switch_to
+            if self.tail is not None:
+                events.extend(self.tail.read_new())
+                self.tail.close()
+            logger.info("%s: new journal %s", self.commander, path.name)
+            self._open(path, from_start=True)
+        if self.tail is not None:
+            events.extend(self.tail.read_new())
+        return events
+
+    def close(self):
+        if self.tail is not None:
+            self.tail.close()
+            self.tail = None
+
+
+class WingJournal:
+    """Merged, timestamp-ordered event stream over every commander's journal folder."""
+
+    def __init__(self, folders: Mapping[str, Path], events: Optional[Iterable[str]] = None,
+                 poll_interval: float = 1.0, rescan_interval: float = 60.0):
+        events = frozenset(events) if events is not None else None
+        self.journals: Dict[str, _CommanderJournal] = {
+            commander: _CommanderJournal(commander, folder, events) for commander, folder in folders.items()
+        }
+        self._by_folder = {os.path.normcase(str(journal.folder)): journal for journal in self.journals.values()}
+        self.poll_interval = poll_interval
+        self.rescan_interval = rescan_interval
+        self.delivered = 0
+        self._subscribers: List[Callable[[WingEvent], None]] = []
+        self._streams: "List[queue.SimpleQueue[Optional[WingEvent]]]" = []
+        self._dirty: Set[str] = set()
+        self._dirty_lock = threading.Lock()
+        self._subscribers_lock = threading.Lock()  # the lists are replaced, never changed, so a pass can iterate
+        self._read_lock = threading.Lock()  # one pass at a time, so delivery order holds
+        self._wake = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def tail(self, commander: str) -> Optional[JournalTail]:
+        """The journal tail currently open for a commander (for startup recovery)."""
+        return self.journals[commander].tail
+
+    def subscribe(self, callback: Callable[[WingEvent], None]):
+        """Call callback(event) for every merged event, on the read loop's thread."""
+        with self._subscribers_lock:
+            self._subscribers = self._subscribers + [callback]
+
+    def unsubscribe(self, callback: Callable[[WingEvent], None]):
+        """Stop calling callback; events already being delivered may still reach it."""
+        with self._subscribers_lock:
+            self._subscribers = [c for c in self._subscribers if c != callback]
+
+    def stream(self) -> Iterator[WingEvent]:
+        """Every merged event from this call on, in order; ends after stop(), unsubscribes when closed."""
+        events: "queue.SimpleQueue[Optional[WingEvent]]" = queue.SimpleQueue()
+        stream = self._stream(events)
+        next(stream)  # subscribe now, and make close() reach the finally even if never iterated
+        return stream
+
+    def _stream(self, events: "queue.SimpleQueue[Optional[WingEvent]]") -> Iterator[WingEvent]:
+        with self._subscribers_lock:
+            self._streams = self._streams + [events]
+        self.subscribe(events.put)
+        try:
+            yield None  # taken by stream()
+            while True:
+                event = events.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            self.unsubscribe(events.put)
+            with self._subscribers_lock:
+                self._streams = [q for q in self._streams if q is not events]
+
+    def notify(self, path: Union[str, Path]):
+        """A file changed or appeared; mark its commander's journal for the next pass."""
+        folder, name = os.path.split(path)
+        journal = self._by_folder.get(os.path.normcase(folder))
+        if journal is None or not (name.startswith("Journal.") and name.endswith(".log")):
+            return
+        with self._dirty_lock:
+            journal.offer(name)
+            self._dirty.add(journal.commander)
+        self._wake.set()
+
+    def rescan(self):
+        """List every folder and mark journals with a newer file for the next pass."""
+        latest = {c: latest_journal(j.folder) for c, j in self.journals.items()}
+        with self._dirty_lock:
+            for commander, path in latest.items():
+                journal = self.journals[commander]
+                if path is not None:
+                    journal.offer(path.name)
+                if journal.pending is not None:
+                    self._dirty.add(commander)
+
+    def poll(self, everything: bool = False) -> List[WingEvent]:
+        """Read the dirty journals (every journal with everything), merge and deliver. Returns the merged events."""
+        with self._read_lock:
+            with self._dirty_lock:
+                if everything:
+                    self._dirty.update(self.journals)
+                # Wing order, so equal timestamps come out the same way every time
+                dirty = [journal for commander, journal in self.journals.items() if commander in self._dirty]
+                switches = [journal.pending for journal in dirty]
+                self._dirty = set()
+                for journal in dirty:
+                    journal.pending = None
+            streams = []
+            for journal, switch_to in zip(dirty, switches):
+                commander = journal.commander
+                try:
+                    events = journal.read(switch_to)
+                except Exception:
+                    logger.exception("Error reading %s's journal", commander)
+                    continue
+                if events:
+                    streams.append(self._keyed(journal, events))
+            if not streams:
+                return []
+            if len(streams) == 1:
+                merged = [event for _, event in streams[0]]
+            else:
+                with REGISTRY.span("journal_merge"):
+                    merged = [event for _, event in heapq.merge(*streams, key=lambda item: item[0])]
+            subscribers = self._subscribers
+            for event in merged:
+                for callback in subscribers:
+                    try:
+                        callback(event)
+                    except Exception:
+                        logger.exception("Journal subscriber failed on %s", event.event.event)
+            self.delivered += len(merged)
+            return merged
+
+    @staticmethod
+    def _keyed(journal: _CommanderJournal, events: List[JournalEvent]):
+        """(sort key, WingEvent) pairs; an event without a timestamp sorts with the one before it."""
+        keyed = []
+        for event in events:
+            if event.timestamp:
+                journal.last_timestamp = event.timestamp
+            keyed.append((journal.last_timestamp, WingEvent(journal.commander, event)))
+        return keyed
+
+    def start(self):
+        """Run the read loop on its own thread."""
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="wing-journal", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        next_rescan = time.monotonic() + self.rescan_interval
+        while self._running:
+            woken = self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if not self._running:
+                break
+            if time.monotonic() >= next_rescan:
+                self.rescan()
+                next_rescan = time.monotonic() + self.rescan_interval
+            self.poll(everything=not woken)
+
+    def stop(self):
+        """Stop the read loop, end every stream() and close the journals."""
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._read_lock:
+            for events in self._streams:
+                events.put(None)
+            for journal in self.journals.values():
+                journal.close()
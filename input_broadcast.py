@@ -4,21 +4,41 @@ Uses PostMessage (WM_KEYDOWN/WM_KEYUP) - THE WORKING METHOD from your window lib
 
 Requirements:
 - pip install pywin32
+
+Win32-only modules (msvcrt, pywin32) are imported where they are used, so the
+relay can also be driven off Windows with a fake window backend and a
+scripted key source (see benchmarks/bench_relay.py).
+
+With --daemon it runs without console input and takes commands from
+scripts through the local API in edwing.relayd.
 """
 
+import argparse
+import os
 import time
 import threading
+import queue
 import logging
-from typing import List, Tuple, Optional
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple, Optional, Union
 import sys
-import msvcrt
 import ctypes
 
-# Windows API imports
-import win32api
-import win32con
-import win32gui
-import win32process
+from edwing.bindings import load_bindings, resolve_bindings_folder
+from edwing.broadcast import play_plan
+from edwing.delivery import PostMessageDelivery, make_delivery
+from edwing.dispatch import COMPLETE, CommandTrie
+from edwing.echo import EchoBroadcaster
+from edwing.keyplan import KeyPlan, char_key_code, compile_plan, plan_from_events
+from edwing.metrics import REGISTRY, start_exporters
+from edwing.output import configure as configure_output, echo, shutdown as shutdown_output
+from edwing.paths import data_dir
+from edwing.relayd import RelayServer
+from edwing.status import WingBoard, wing_arrived
+from edwing.stats import format_summary
+from edwing.timing import enable_high_resolution_timer, precise_sleep
+from edwing.windows import Win32WindowBackend, WindowIndex
 
 # Configuration
 CONFIG = {
@@ -29,50 +49,116 @@ CONFIG = {
     "typing_timeout": 2.0,      # 2 seconds as requested
     "key_press_duration": 0.1,  # Duration to hold key (like your library)
     "key_send_delay": 0.05,     # Delay between keys
-    "window_delay": 0.2,        # Delay between windows
+    "window_delay": 0.2,        # Delay between windows (sequential mode only)
+    "broadcast_mode": "concurrent",  # "concurrent": all windows share one key timeline; "sequential": one window at a time
+    "delivery": "post",         # "post": PostMessage, no focus; "sendinput" / "keybd": focus each window in turn
+    "focus_settle": 0.1,        # Seconds between focusing a window and typing into it (sendinput / keybd)
+    "known_commands": [],       # Sent the moment the buffer uniquely matches one of these (e.g. ["1qq", "swsw"])
+    "terminator_key": "`",      # Sends the buffer immediately; None to disable
+    "relay_mode": "buffered",   # "buffered": send whole commands; "echo": forward every key as it is typed
+    "mode_toggle_key": "\x05",  # Ctrl+E switches between buffered and echo mode
+    "commander_groups": {},     # Named subsets of the wing, e.g. {"scouts": ["Bistronaut", "Tristronaut"]}
+    "group_toggle_key": "\x07", # Ctrl+G cycles the broadcast target: all windows, then each group
+    "echo_queue_size": 8,       # Keys queued per window in echo mode before typing blocks
+    "bindings_dir": None,       # Elite Bindings folder for {@Action} keys; None = default location
+    "metrics_port": None,       # Serve stage timings as Prometheus text on 127.0.0.1:<port>; None to disable
+    "metrics_interval": 60.0,   # Seconds between writes of the metrics summary file; 0 to disable
+    "api_port": None,           # Serve the local relay API (edwing.relayd) on 127.0.0.1:<port>, 0 = any free port; None = only with --daemon
+    "wait_for_wing": 0.0,       # Seconds to wait for every AutoHonk commander to arrive in one system before sending; 0 = don't
+    "quiet": False,             # No status lines on the console, only warnings and errors
+    "log_file": "elite_command_relay.log",
+    "log_max_bytes": 1024 * 1024,  # Log file size before it rotates
+    "log_backups": 3,           # Rotated log files kept
 }
 
-# Logging setup
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(), logging.FileHandler("elite_command_relay.log")],
-)
 logger = logging.getLogger(__name__)
 
 
+Command = Union[str, KeyPlan]  # typed command string, or a keystroke plan from the API
+
+
 class CommandRelay:
-    def __init__(self):
+    def __init__(self, window_backend=None, key_source: Optional[Callable[[], str]] = None,
+                 daemon: bool = False):
         self.all_commanders = CONFIG["commanders"] + [CONFIG["primary_commander"]]
         self.command_buffer = ""
         self.last_keypress_time = 0
         self.running = True
         self.input_thread = None
         self.timer_thread = None
+        self.broadcast_thread = None
         self.buffer_lock = threading.Lock()
+        self.buffer_cond = threading.Condition(self.buffer_lock)
+        # (command, queued at, group, future for the API caller's reply)
+        self.command_queue: "queue.Queue[Optional[Tuple[Command, float, Optional[str], Optional[Future]]]]" = queue.Queue()
+        self.stopped = threading.Event()
+        self.known_commands = CommandTrie(CONFIG["known_commands"])
+        self.relay_mode = CONFIG["relay_mode"]
+        self.echo: Optional[EchoBroadcaster] = None
+        self.echo_text = ""
+        self.target_group: Optional[str] = None  # commander group broadcasts go to; None = every window
+        self.wing_board = WingBoard()  # AutoHonk state of every commander, read for wait_for_wing
         self.console_hwnd = None
+        self.daemon = daemon  # no console: commands arrive only through the API
+        self.api: Optional[RelayServer] = None
+        self.key_source = key_source or self.read_key  # blocking: returns the next console key
+        self.bindings_dir = Path(CONFIG["bindings_dir"]) if CONFIG["bindings_dir"] else resolve_bindings_folder()
         
-        # Get our console window handle
-        self.console_hwnd = self.get_console_window()
+        # Get our console window handle; a daemon has no console to give focus back to
+        if not daemon:
+            self.console_hwnd = self.get_console_window()
+
+        # 1 ms timer ticks so key holds are not rounded up to 15.6 ms
+        enable_high_resolution_timer()
+
+        # One enumeration pass per desktop change, shared by every broadcast
+        self.backend = window_backend or Win32WindowBackend()
+        self.delivery = make_delivery(CONFIG["delivery"], self.backend)
+        # Echo feeds every window at once, which only PostMessage can do
+        self.echo_delivery = self.delivery if not self.delivery.needs_focus else PostMessageDelivery(self.backend)
+        self.window_index = WindowIndex(
+            self.backend,
+            title_contains=CONFIG["window_title_contains"],
+            process_name=CONFIG["process_name"],
+            commanders=CONFIG["commanders"],
+            primary_commander=CONFIG["primary_commander"],
+            groups=CONFIG["commander_groups"],
+        )
+        self.window_index.start_watching()
+
+        if daemon:
+            echo("Elite Dangerous Command Relay - daemon")
+            echo(f"Named commanders: {', '.join(CONFIG['commanders'])}; primary: {CONFIG['primary_commander']}")
+            echo("Send commands with: python -m edwing.relayd send <command>")
+            return
         
-        print("=" * 70)
-        print("Elite Dangerous Command Relay - PostMessage Method")
-        print("Using WM_KEYDOWN/WM_KEYUP like your working window library!")
-        print("=" * 70)
-        print(f"Looking for process: '{CONFIG['process_name']}.exe'")
-        print(f"Window title must contain: '{CONFIG['window_title_contains']}'")
-        print(f"Named commanders: {', '.join(CONFIG['commanders'])}")
-        print(f"Primary commander: {CONFIG['primary_commander']}")
-        print("")
-        print("INSTRUCTIONS:")
-        print("1. Focus this console window")
-        print("2. Type your command (e.g., '1qq' or 'swsw')")
-        print(f"3. Wait {CONFIG['typing_timeout']} seconds - command broadcasts to ALL Elite windows")
-        print("4. Press Ctrl+C to exit")
-        print("-" * 70)
+        echo("=" * 70)
+        echo("Elite Dangerous Command Relay - PostMessage Method")
+        echo("Using WM_KEYDOWN/WM_KEYUP like your working window library!")
+        echo("=" * 70)
+        echo(f"Looking for process: '{CONFIG['process_name']}.exe'")
+        echo(f"Window title must contain: '{CONFIG['window_title_contains']}'")
+        echo(f"Named commanders: {', '.join(CONFIG['commanders'])}")
+        echo(f"Primary commander: {CONFIG['primary_commander']}")
+        echo("")
+        echo("INSTRUCTIONS:")
+        echo("1. Focus this console window")
+        echo("2. Type your command (e.g., '1qq' or 'swsw')")
+        echo(f"3. Wait {CONFIG['typing_timeout']} seconds - command broadcasts to ALL Elite windows")
+        if CONFIG["terminator_key"]:
+            echo(f"   (or press {CONFIG['terminator_key']!r} to send immediately)")
+        if len(self.known_commands):
+            echo(f"   Known commands send instantly: {', '.join(CONFIG['known_commands'])}")
+        echo("4. Press Ctrl+E to toggle echo mode (every key is sent as you type it)")
+        if CONFIG["commander_groups"]:
+            echo(f"   Press Ctrl+G to target a group: {', '.join(CONFIG['commander_groups'])}")
+        echo("5. Press Ctrl+C to exit")
+        echo("-" * 70)
 
     def get_console_window(self) -> Optional[int]:
         """Get the console window handle using kernel32."""
+        if sys.platform != "win32":
+            return None
         try:
             kernel32 = ctypes.windll.kernel32
             hwnd = kernel32.GetConsoleWindow()
@@ -83,89 +169,51 @@ class CommandRelay:
 
     def find_elite_window(self, target_commander: str = None) -> Optional[int]:
         """Find Elite Dangerous window handle."""
-        def enum_windows_callback(hwnd, windows):
-            try:
-                if win32gui.IsWindowVisible(hwnd):
-                    title = win32gui.GetWindowText(hwnd)
-                    _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                    process_handle = win32api.OpenProcess(
-                        win32con.PROCESS_QUERY_INFORMATION | win32con.PROCESS_VM_READ, 
-                        False, 
-                        pid
-                    )
-                    process_name = win32process.GetModuleFileNameEx(process_handle, 0).lower()
-                    win32api.CloseHandle(process_handle)
-                    
-                    if 'elitedangerous64' in process_name and CONFIG['window_title_contains'].lower() in title.lower():
-                        if target_commander:
-                            if target_commander in CONFIG["commanders"]:
-                                if target_commander.lower() in title.lower():
-                                    windows.append((hwnd, title, target_commander))
-                            elif target_commander == CONFIG["primary_commander"]:
-                                has_other_commander = any(
-                                    cmd.lower() in title.lower() 
-                                    for cmd in CONFIG["commanders"]
-                                )
-                                if not has_other_commander:
-                                    windows.append((hwnd, title, target_commander))
-                        else:
-                            windows.append((hwnd, title, "Unknown"))
-                        
-            except Exception:
-                pass
-            return True
-        
         try:
-            windows = []
-            win32gui.EnumWindows(enum_windows_callback, windows)
-            
-            if windows:
-                hwnd, title, commander = windows[0]
-                logger.info(f"Found Elite window for {target_commander or 'testing'}: '{title}'")
-                return hwnd
-            else:
-                return None
-                
+            hwnd = self.window_index.find(target_commander)
+            if hwnd:
+                logger.debug(f"Found Elite window for {target_commander or 'testing'}: {hwnd:#x}")
+            return hwnd
         except Exception as e:
             logger.error(f"Error finding Elite window: {e}")
             return None
 
-    def find_all_elite_windows(self) -> List[Tuple[int, str, str]]:
-        """Find all Elite Dangerous windows."""
-        all_windows = []
-        
-        for commander in CONFIG["commanders"]:
-            hwnd = self.find_elite_window(commander)
-            if hwnd:
-                title = win32gui.GetWindowText(hwnd)
-                all_windows.append((hwnd, title, commander))
-        
-        hwnd = self.find_elite_window(CONFIG["primary_commander"])
-        if hwnd:
-            title = win32gui.GetWindowText(hwnd)
-            all_windows.append((hwnd, title, CONFIG["primary_commander"]))
-        
-        return all_windows
+    def find_all_elite_windows(self, group: Optional[str] = None) -> List[Tuple[int, str, str]]:
+        """Find all Elite Dangerous windows, or those of one commander group."""
+        try:
+            with REGISTRY.span("window_discovery"):
+                return self.window_index.commander_windows(group)
+        except Exception as e:
+            logger.error(f"Error finding Elite windows: {e}")
+            return []
 
     def get_virtual_key_code(self, key: str) -> Optional[int]:
         """Get Windows virtual key code."""
-        special_keys = {
-            ' ': win32con.VK_SPACE,
-            '\n': win32con.VK_RETURN,
-            '\r': win32con.VK_RETURN,
-            '\t': win32con.VK_TAB,
-        }
-        
-        if key.lower() in special_keys:
-            return special_keys[key.lower()]
-        elif len(key) == 1:
-            return ord(key.upper())
-        else:
-            return None
+        return char_key_code(key)
+
+    def get_key_plan(self, command: Command) -> KeyPlan:
+        """Compiled (and cached) keystroke plan for a command, e.g. '1qq', '{Shift+F1}{Space*2}' or '{@LandingGearToggle}'."""
+        if isinstance(command, KeyPlan):
+            return command
+        with REGISTRY.span("key_plan"):
+            # Only action tokens need the bindings; the index is reused until the .binds file changes
+            bindings = load_bindings(self.bindings_dir) if "{@" in command else None
+            plan = compile_plan(command, CONFIG["key_press_duration"], CONFIG["key_send_delay"], bindings)
+        for token in plan.skipped:
+            echo(f"⚠️ Unknown key: {token}")
+        return plan
+
+    def focus_window(self, hwnd: int):
+        """Give hwnd focus and let it settle, for delivery strategies that type into the foreground window."""
+        if not self.delivery.needs_focus:
+            return
+        with REGISTRY.span("focus"):
+            self.backend.set_foreground(hwnd)
+        precise_sleep(CONFIG["focus_settle"])
 
     def press_key(self, hwnd: int, key_code: int, duration: float = None):
         """
-        Press a key using PostMessage - EXACT method from your working library!
+        Press a key through the configured delivery - like your working library:
         def press(self, key, duration=.1):
             self.key_down(key)
             time.sleep(duration)
@@ -174,174 +222,396 @@ class CommandRelay:
         if duration is None:
             duration = CONFIG["key_press_duration"]
         
-        # Key down - PostMessage with WM_KEYDOWN
-        win32api.PostMessage(hwnd, win32con.WM_KEYDOWN, key_code, 0)
-        time.sleep(duration)
-        # Key up - PostMessage with WM_KEYUP
-        win32api.PostMessage(hwnd, win32con.WM_KEYUP, key_code, 0)
-
-    def send_keys_to_window(self, hwnd: int, command: str, commander: str) -> bool:
-        """Send entire command to a window using PostMessage."""
+        self.focus_window(hwnd)
+        self.delivery.send(hwnd, ((key_code, True),))
+        precise_sleep(duration)
+        self.delivery.send(hwnd, ((key_code, False),))
+
+    def send_keys_to_window(self, hwnd: int, command: Command, commander: str) -> bool:
+        """Send entire command to one window."""
         try:
-            print(f"🎯 Sending '{command}' to {commander} using PostMessage...")
+            plan = self.get_key_plan(command)
+            echo(f"🎯 Sending '{plan.command}' to {commander} using {self.delivery.name}...")
             
-            # Send each character
-            for char in command:
-                vk_code = self.get_virtual_key_code(char)
-                if vk_code is None:
-                    print(f"⚠️ Unknown key: {char}")
-                    continue
-                
-                # Use PostMessage method - EXACT copy from your library
-                self.press_key(hwnd, vk_code)
-                
-                # Delay between keys
-                time.sleep(CONFIG["key_send_delay"])
+            self.focus_window(hwnd)
+            self.delivery.play(hwnd, plan)
             
-            print(f"✅ Sent {len(command)} keys to {commander}")
+            echo(f"✅ Sent {plan.keys} keys to {commander}")
             return True
             
         except Exception as e:
-            print(f"❌ Error sending to {commander}: {e}")
+            echo(f"❌ Error sending to {commander}: {e}")
             logger.error(f"Error sending keys to {commander}: {e}")
             return False
 
-    def send_command_to_all_windows(self, command: str):
-        """Send command sequence to all Elite Dangerous windows."""
-        if not command.strip():
-            return
+    def send_keys_to_all_windows(self, windows: List[Tuple[int, str, str]], command: Command) -> int:
+        """Send command to every window at once on a shared key timeline. Returns success count."""
+        plan = self.get_key_plan(command)
+
+        for _, _, commander in windows:
+            echo(f"🎯 Sending '{plan.command}' to {commander} using {self.delivery.name}...")
+
+        errors = play_plan([hwnd for hwnd, _, _ in windows], plan, self.delivery)
+
+        success_count = 0
+        for hwnd, _, commander in windows:
+            e = errors[hwnd]
+            if e is None:
+                echo(f"✅ Sent {plan.keys} keys to {commander}")
+                success_count += 1
+            else:
+                echo(f"❌ Error sending to {commander}: {e}")
+                logger.error(f"Error sending keys to {commander}: {e}")
+        return success_count
+
+    def send_command_to_all_windows(self, command: Command, group: Optional[str] = None) -> Tuple[int, int]:
+        """Send command sequence to all Elite Dangerous windows (or those of one commander group).
+
+        Returns (windows reached, windows found).
+        """
+        text = command.command if isinstance(command, KeyPlan) else command
+        if not text.strip():
+            return 0, 0
             
-        print(f"\n🚀 Broadcasting command: '{command}' (length: {len(command)})")
+        target = f" to group '{group}'" if group else ""
+        echo(f"\n🚀 Broadcasting command: '{text}' (length: {len(text)}){target}")
         
+        if CONFIG["wait_for_wing"] > 0 and not self.wing_board.wait(wing_arrived, CONFIG["wait_for_wing"]):
+            echo(f"⏳ Wing still jumping or split after {CONFIG['wait_for_wing']}s - sending anyway")
+
         # Find all Elite windows
-        windows = self.find_all_elite_windows()
+        windows = self.find_all_elite_windows(group)
         
         if not windows:
-            print("⚠️  No Elite Dangerous windows found!")
-            return
+            echo("⚠️  No Elite Dangerous windows found!")
+            return 0, 0
         
-        print(f"📡 Found {len(windows)} Elite window(s):")
+        echo(f"📡 Found {len(windows)} Elite window(s):")
         for _, title, commander in windows:
-            print(f"   • {commander}: {title}")
+            echo(f"   • {commander}: {title}")
         
-        print("\n🎮 Sending commands with PostMessage...")
+        echo(f"\n🎮 Sending commands with {self.delivery.name}...")
         
-        # Send to each window
-        success_count = 0
-        for hwnd, title, commander in windows:
-            if self.send_keys_to_window(hwnd, command, commander):
-                success_count += 1
-            time.sleep(CONFIG["window_delay"])
+        # Only focus-free delivery can share one timeline across windows
+        if CONFIG["broadcast_mode"] == "concurrent" and not self.delivery.needs_focus:
+            success_count = self.send_keys_to_all_windows(windows, command)
+        else:
+            # Send to each window
+            success_count = 0
+            for hwnd, title, commander in windows:
+                if self.send_keys_to_window(hwnd, command, commander):
+                    success_count += 1
+                precise_sleep(CONFIG["window_delay"])
         
-        print(f"\n🎉 Successfully sent to {success_count}/{len(windows)} windows")
+        echo(f"\n🎉 Successfully sent to {success_count}/{len(windows)} windows")
         
         # Focus back to console
         if self.console_hwnd:
             try:
-                win32gui.SetForegroundWindow(self.console_hwnd)
+                with REGISTRY.span("focus"):
+                    self.backend.set_foreground(self.console_hwnd)
                 time.sleep(0.1)
-                print("🔄 Console refocused - ready for next command")
+                echo("🔄 Console refocused - ready for next command")
             except:
                 pass
         
-        print("-" * 70)
+        echo("-" * 70)
+        return success_count, len(windows)
+
+    def read_key(self) -> str:
+        """Block until a console key is pressed. Extended keys (arrows, F-keys) return ''."""
+        import msvcrt
+        char = msvcrt.getwch()
+        if char in ('\x00', '\xe0'):
+            msvcrt.getwch()  # discard the scan code that follows
+            return ''
+        return char
+
+    def stop(self):
+        """Stop all relay threads."""
+        with self.buffer_cond:
+            self.running = False
+            self.buffer_cond.notify_all()
+        self.command_queue.put(None)
+        self.stopped.set()
 
     def input_monitor(self):
         """Monitor for keyboard input in the console."""
-        print("🎧 Input monitor started. Type your commands...")
+        echo("🎧 Input monitor started. Type your commands...")
         
         while self.running:
             try:
-                if msvcrt.kbhit():
-                    char = msvcrt.getch().decode('utf-8', errors='ignore')
-                    
-                    if ord(char) == 3:  # Ctrl+C
-                        print("\n🛑 Ctrl+C detected - shutting down...")
-                        self.running = False
-                        break
-                    elif ord(char) == 8:  # Backspace
-                        with self.buffer_lock:
-                            if self.command_buffer:
-                                self.command_buffer = self.command_buffer[:-1]
-                                print(f"\rCommand: '{self.command_buffer}'", end=" " * 10, flush=True)
-                                self.last_keypress_time = time.time()
-                        continue
-                    elif ord(char) == 13:  # Enter
-                        char = '\n'
-                    
-                    with self.buffer_lock:
-                        self.command_buffer += char
-                        self.last_keypress_time = time.time()
-                        print(f"\rCommand: '{self.command_buffer}'", end="", flush=True)
+                char = self.key_source()
+                captured_at = time.perf_counter()
+                if not char:
+                    continue
+
+                if ord(char) == 3:  # Ctrl+C
+                    echo("\n🛑 Ctrl+C detected - shutting down...")
+                    self.stop()
+                    break
+                elif char == CONFIG["mode_toggle_key"]:
+                    self.toggle_mode()
+                    continue
+                elif char == CONFIG["group_toggle_key"] and CONFIG["commander_groups"]:
+                    self.cycle_group()
+                    continue
+                elif self.relay_mode == "echo":
+                    self.echo_key(char, captured_at)
+                    continue
+                elif ord(char) == 8:  # Backspace
+                    with self.buffer_cond:
+                        if self.command_buffer:
+                            self.command_buffer = self.command_buffer[:-1]
+                            echo(f"\rCommand: '{self.command_buffer}'", end=" " * 10, flush=True)
+                            self.last_keypress_time = time.monotonic()
+                            self.buffer_cond.notify()
+                    continue
+                elif char == CONFIG["terminator_key"]:
+                    with self.buffer_cond:
+                        self.dispatch_buffer()
+                    continue
+                elif ord(char) == 13:  # Enter
+                    char = '\n'
                 
-                time.sleep(0.01)
+                with self.buffer_cond:
+                    self.command_buffer += char
+                    self.last_keypress_time = time.monotonic()
+                    echo(f"\rCommand: '{self.command_buffer}'", end="", flush=True)
+                    if self.known_commands.match(self.command_buffer) == COMPLETE:
+                        self.dispatch_buffer()
+                    else:
+                        self.buffer_cond.notify()
                 
             except Exception as e:
                 logger.error(f"Error in input monitor: {e}")
                 time.sleep(0.1)
 
+    def toggle_mode(self):
+        """Switch between buffered and echo mode. Pending buffered input is sent first."""
+        if self.relay_mode == "echo":
+            self.close_echo()
+            self.relay_mode = "buffered"
+            echo(f"\n⌨️  Buffered mode - commands send after {CONFIG['typing_timeout']}s")
+        else:
+            with self.buffer_cond:
+                self.dispatch_buffer()
+            self.relay_mode = "echo"
+            echo("\n📡 Echo mode - every key is sent as you type it")
+
+    def cycle_group(self):
+        """Target the next commander group; after the last one, every window again."""
+        targets = [None] + list(CONFIG["commander_groups"])
+        self.target_group = targets[(targets.index(self.target_group) + 1) % len(targets)]
+        if self.target_group is None:
+            echo("\n🎯 Target: all windows")
+        else:
+            members = self.window_index.matcher.members(self.target_group)
+            echo(f"\n🎯 Target: group '{self.target_group}' ({', '.join(members)})")
+
+    def echo_key(self, char: str, captured_at: float):
+        """
+        Forward one key to every window immediately.
+
+        Keys are already in the game once typed, so Backspace cannot un-send
+        anything: it is forwarded as VK_BACK, which deletes the last character
+        in an in-game text field and is otherwise just another key press.
+        """
+        if ord(char) == 13:  # Enter
+            char = '\n'
+        plan = compile_plan(char * 2 if char in "{}" else char,
+                            CONFIG["key_press_duration"], CONFIG["key_send_delay"])
+        if not plan.events:
+            echo(f"\n⚠️ Unknown key: {char}")
+            return
+
+        if self.echo is None:
+            self.echo = EchoBroadcaster(
+                self.echo_delivery,
+                queue_size=CONFIG["echo_queue_size"],
+                on_error=lambda commander, e: echo(f"\n❌ Error sending to {commander}: {e}"),
+            )
+        self.echo.set_targets(self.find_all_elite_windows(self.target_group))
+        self.echo.send(plan, captured_at)
+
+        self.echo_text = self.echo_text[:-1] if ord(char) == 8 else self.echo_text + char
+        echo(f"\rEcho: '{self.echo_text}'", end=" " * 10, flush=True)
+
+    def close_echo(self):
+        """Finish queued echo keys and report keystroke-to-PostMessage latency."""
+        if self.echo is None:
+            return
+        self.echo.close()
+        echo(f"\n⏱️  {format_summary('Echo keystroke->PostMessage', self.echo.latency.summary())}")
+        if self.echo.backpressure_wait:
+            echo(f"   Typing blocked {self.echo.backpressure_wait:.2f}s waiting for slow windows")
+        self.echo = None
+        self.echo_text = ""
+
+    def dispatch_buffer(self):
+        """Queue the current buffer for broadcast. Caller holds buffer_cond."""
+        if self.command_buffer:
+            self.command_queue.put((self.command_buffer, time.perf_counter(), self.target_group, None))
+        self.command_buffer = ""
+        self.last_keypress_time = 0
+
     def timer_monitor(self):
-        """Monitor for typing timeout and send commands when ready."""
-        while self.running:
+        """Queue the buffer for broadcast exactly typing_timeout after the last keypress."""
+        with self.buffer_cond:
+            while self.running:
+                if not self.command_buffer or self.last_keypress_time <= 0:
+                    self.buffer_cond.wait()
+                    continue
+
+                remaining = self.last_keypress_time + CONFIG["typing_timeout"] - time.monotonic()
+                if remaining > 0:
+                    self.buffer_cond.wait(remaining)
+                    continue
+
+                self.dispatch_buffer()
+
+    def broadcast_worker(self):
+        """Send queued commands in order, outside the buffer lock so typing continues."""
+        while True:
+            item = self.command_queue.get()
+            if item is None:
+                break
+            command, queued_at, group, done = item
+            REGISTRY.observe("dispatch", time.perf_counter() - queued_at)
             try:
-                with self.buffer_lock:
-                    if (self.command_buffer and 
-                        self.last_keypress_time > 0 and 
-                        time.time() - self.last_keypress_time >= CONFIG["typing_timeout"]):
-                        
-                        command_to_send = self.command_buffer
-                        self.command_buffer = ""
-                        self.last_keypress_time = 0
-                        
-                        print()  # New line
-                        self.send_command_to_all_windows(command_to_send)
-                
-                time.sleep(0.1)
-                
+                echo()  # New line
+                sent, found = self.send_command_to_all_windows(command, group)
             except Exception as e:
-                logger.error(f"Error in timer monitor: {e}")
-                time.sleep(0.1)
+                logger.error(f"Error broadcasting command: {e}")
+                if done is not None:
+                    done.set_exception(e)
+                continue
+            if done is not None:
+                done.set_result({"ok": True, "command": command.command if isinstance(command, KeyPlan) else command,
+                                 "sent": sent, "windows": found})
+
+    def handle_request(self, request: Dict[str, object]):
+        """Answer one edwing.relayd API request: a reply, or a Future of one for a command that waits its turn."""
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "daemon": self.daemon}
+        if op == "stats":
+            return {"ok": True, "queued": self.command_queue.qsize(), "delivery": self.delivery.stats(),
+                    "stages": REGISTRY.summary()}
+        if op == "shutdown":
+            echo("\n🛑 Shutdown requested through the API")
+            self.stop()
+            return {"ok": True}
+
+        group = request.get("group")
+        if group is not None and group not in CONFIG["commander_groups"]:
+            raise ValueError(f"Unknown commander group {group!r}")
+        if op == "windows":
+            windows = self.find_all_elite_windows(group)
+            return {"ok": True, "commanders": [{"hwnd": hwnd, "title": title, "commander": commander}
+                                               for hwnd, title, commander in windows]}
+        if op == "send":
+            command = request.get("command")
+            if not isinstance(command, str) or not command.strip():
+                raise ValueError("send needs a non-empty command string")
+        elif op == "plan":
+            command = plan_from_events(request.get("events") or (), str(request.get("label") or ""))
+            if not command.events:
+                raise ValueError("plan needs at least one key event")
+        else:
+            raise ValueError(f"Unknown op {op!r}")
+
+        if not self.running:
+            raise RuntimeError("Relay is shutting down")
+        done: "Future[Dict[str, object]]" = Future()
+        self.command_queue.put((command, time.perf_counter(), group, done))
+        if request.get("wait", True):
+            return done
+        return {"ok": True, "command": command.command if isinstance(command, KeyPlan) else command,
+                "queued": True}
 
     def run(self):
         """Main execution logic."""
+        exporters = start_exporters(CONFIG["metrics_port"], data_dir() / "relay-metrics.json",
+                                    CONFIG["metrics_interval"])
+        api_port = CONFIG["api_port"]
+        if api_port is None and self.daemon:
+            api_port = 0
+        if api_port is not None:
+            self.api = RelayServer(self.handle_request, api_port)
+            self.api.start()
+            echo(f"🔌 Relay API on 127.0.0.1:{self.api.port}")
         try:
             # Test window detection
-            print("🔍 Testing window detection...")
+            echo("🔍 Testing window detection...")
             windows = self.find_all_elite_windows()
             if windows:
-                print(f"✅ Found {len(windows)} Elite window(s):")
+                echo(f"✅ Found {len(windows)} Elite window(s):")
                 for _, title, commander in windows:
-                    print(f"   • {commander}: {title}")
+                    echo(f"   • {commander}: {title}")
             else:
-                print("⚠️  No Elite windows found - make sure Elite is running!")
+                echo("⚠️  No Elite windows found - make sure Elite is running!")
             
-            print("\n🎮 Ready for input! Type commands and wait 2 seconds...")
-            
-            # Start monitoring threads
-            self.input_thread = threading.Thread(target=self.input_monitor, daemon=True)
-            self.input_thread.start()
-            
-            self.timer_thread = threading.Thread(target=self.timer_monitor, daemon=True)
-            self.timer_thread.start()
+            # Start relay threads; all of them block until there is work
+            if not self.daemon:
+                echo(f"\n🎮 Ready for input! Type commands and wait {CONFIG['typing_timeout']} seconds...")
+
+                self.input_thread = threading.Thread(target=self.input_monitor, daemon=True)
+                self.input_thread.start()
+
+                self.timer_thread = threading.Thread(target=self.timer_monitor, daemon=True)
+                self.timer_thread.start()
+
+            self.broadcast_thread = threading.Thread(target=self.broadcast_worker, daemon=True)
+            self.broadcast_thread.start()
             
-            # Main loop
-            while self.running:
-                time.sleep(0.1)
+            # Wake only occasionally so Ctrl+C is still delivered to the main thread
+            while not self.stopped.wait(0.5):
+                pass
                 
         except KeyboardInterrupt:
-            print("\n🛑 Shutting down...")
-            self.running = False
-        
-        print("\n👋 Command Relay stopped!")
+            echo("\n🛑 Shutting down...")
+            self.stop()
+
+        if self.api is not None:
+            self.api.stop()
+        if self.broadcast_thread is not None:
+            self.broadcast_thread.join(timeout=5.0)  # let queued API commands finish and reply
+        self.close_echo()
+        self.window_index.stop_watching()
+        self.wing_board.close()
+        for exporter in exporters:
+            exporter.stop()
+        echo("\n👋 Command Relay stopped!")
 
 
 def main():
     """Main function."""
-    print("Starting Elite Dangerous Command Relay...")
-    print("Using PostMessage (WM_KEYDOWN/WM_KEYUP) method\n")
+    p = argparse.ArgumentParser(description="Elite Dangerous Command Relay")
+    p.add_argument("--daemon", action="store_true",
+                   help="No console input; take commands through the local API (python -m edwing.relayd)")
+    p.add_argument("--api-port", type=int, help="Port for the local API (default: CONFIG api_port, any free port with --daemon)")
+    args = p.parse_args()
+    if args.api_port is not None:
+        CONFIG["api_port"] = args.api_port
+
+    # Console and log file are written from a background thread, never from the send path
+    configure_output(
+        level=logging.INFO,
+        fmt="%(asctime)s - %(levelname)s - %(message)s",
+        log_file=CONFIG["log_file"],
+        quiet=CONFIG["quiet"],
+        max_bytes=CONFIG["log_max_bytes"],
+        backups=CONFIG["log_backups"],
+    )
+    echo("Starting Elite Dangerous Command Relay...")
+    echo("Using PostMessage (WM_KEYDOWN/WM_KEYUP) method\n")
     
-    relay = CommandRelay()
-    relay.run()
+    try:
+        relay = CommandRelay(daemon=args.daemon)
+        relay.run()
+    finally:
+        shutdown_output()
 
 
 if __name__ == "__main__":